@@ -0,0 +1,152 @@
+"""
+Benchmark: identifier resolution with a full collection load vs server-side
+candidate prefiltering (TaskDatabase.fetch_candidates).
+
+before: find({}).to_list(None), then TaskMatcher scans every task
+after:  bounded, projected candidate query, then TaskMatcher re-ranks it
+
+Needs a running MongoDB at MONGODB_URL. Tasks are seeded into a scratch
+database (MONGODB_DB, default "task_manager_bench") which is dropped afterwards.
+Reply bytes are measured from the server replies with a pymongo command listener.
+
+Usage: python benchmarks/candidate_prefilter.py [--sizes 1000 10000 100000]
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import threading
+from datetime import datetime, timedelta
+
+import bson
+from pymongo import monitoring
+
+# Add the app directory to Python path for imports
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ.setdefault("MONGODB_DB", "task_manager_bench")
+
+from utils.task_database import TaskDatabase, title_search_fields
+from utils.task_matcher import task_matcher
+
+
+WORDS = (
+    "buy call email write review plan fix deploy book pay clean prepare send "
+    "update schedule finish draft check order renew cancel organize submit "
+    "milk report dentist invoice budget meeting slides client project taxes "
+    "groceries car insurance flight hotel doctor gym birthday gift presentation "
+    "quarterly weekly monthly team manager mom dad landlord bank backup server"
+).split()
+
+
+class ReplyBytesListener(monitoring.CommandListener):
+    """Sums the BSON size of find/getMore/aggregate replies."""
+
+    COMMANDS = {"find", "getMore", "aggregate"}
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.bytes = 0
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        if event.command_name in self.COMMANDS:
+            with self._lock:
+                self.bytes += len(bson.encode(event.reply))
+
+    def failed(self, event):
+        pass
+
+    def take(self) -> int:
+        with self._lock:
+            value, self.bytes = self.bytes, 0
+        return value
+
+
+def synthetic_tasks(count: int):
+    rng = random.Random(count)
+    now = datetime.now()
+    for i in range(count):
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 5)))
+        yield {
+            "title": f"{title} {i}",
+            "date": now + timedelta(days=rng.randint(-30, 60)),
+            "priority": rng.choice(["high", "medium", "low"]),
+            "status": rng.choice(["pending", "completed"]),
+            "created_at": now,
+            "updated_at": now,
+            **title_search_fields(f"{title} {i}")
+        }
+
+
+async def seed(db: TaskDatabase, count: int):
+    await db.collection.delete_many({})
+    batch = []
+    for task in synthetic_tasks(count):
+        batch.append(task)
+        if len(batch) == 5000:
+            await db.collection.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        await db.collection.insert_many(batch, ordered=False)
+
+
+async def resolve_full_scan(db: TaskDatabase, identifier: str):
+    tasks = await db.collection.find({}).to_list(length=None)
+    for task in tasks:
+        task["_id"] = str(task["_id"])
+    return task_matcher.find_best_match(identifier, tasks)
+
+
+async def resolve_prefiltered(db: TaskDatabase, identifier: str):
+    candidates = await db.fetch_candidates(identifier)
+    return task_matcher.find_best_match(identifier, candidates)
+
+
+async def measure(db, listener, resolver, identifiers):
+    listener.take()
+    start = time.perf_counter()
+    for identifier in identifiers:
+        await resolver(db, identifier)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / len(identifiers)
+    return elapsed_ms, listener.take() / len(identifiers)
+
+
+async def run(sizes):
+    listener = ReplyBytesListener()
+    monitoring.register(listener)
+
+    # Keep the benchmark deterministic and offline
+    task_matcher._llm_assisted_match = lambda identifier, candidates: None
+
+    db = TaskDatabase()
+    await db.connect()
+    rng = random.Random(7)
+
+    print(f"{'tasks':>8} | {'before ms':>10} {'before KB':>10} | {'after ms':>9} {'after KB':>9}")
+    try:
+        for size in sizes:
+            await seed(db, size)
+            identifiers = [
+                " ".join(rng.choice(WORDS) for _ in range(2)) for _ in range(10)
+            ]
+            before_ms, before_bytes = await measure(db, listener, resolve_full_scan, identifiers)
+            after_ms, after_bytes = await measure(db, listener, resolve_prefiltered, identifiers)
+            print(
+                f"{size:>8} | {before_ms:>10.1f} {before_bytes / 1024:>10.1f} | "
+                f"{after_ms:>9.1f} {after_bytes / 1024:>9.1f}"
+            )
+    finally:
+        await db.client.drop_database(db.db.name)
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Candidate prefilter benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes))
@@ -0,0 +1,122 @@
+"""
+Soak test: process RSS over many turns with the bounded checkpointer.
+
+Runs a two-node graph shaped like the task workflow (messages with add_messages,
+a db_result with a task list, tool logs) for --turns turns spread over
+--threads conversation threads, sampling RSS every tenth of the run. Passes
+when RSS grows less than --max-growth-mb over the second half, after the LRU
+has filled; --compare runs the unbounded MemorySaver the same way.
+
+Message history inside one thread still grows with its turn count; keep
+turns/threads small here (history compaction bounds that separately).
+
+No database or API key needed. tests/test_checkpointer_soak.py is a bounded
+version under pytest, on the workflow's state and end node.
+
+Usage: python benchmarks/checkpointer_soak.py [--turns 100000] [--threads 10000]
+       [--max-threads 1000] [--keep 5] [--spill /tmp/checkpoints.sqlite] [--compare]
+"""
+
+import os
+import sys
+import random
+import argparse
+import operator
+import tempfile
+from typing import Annotated, List, Dict, Any, TypedDict
+
+# Add the app directory to Python path for imports
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ.setdefault("GOOGLE_API_KEY", "unused")
+
+from langchain_core.messages import AIMessage, HumanMessage, BaseMessage
+from langgraph.graph import StateGraph, START, END
+from langgraph.graph.message import add_messages
+from langgraph.checkpoint.memory import InMemorySaver
+
+from utils.checkpointer import BoundedMemorySaver, process_rss_mb
+
+
+class SoakState(TypedDict, total=False):
+    messages: Annotated[List[BaseMessage], add_messages]
+    tool_logs: List[Dict[str, Any]]
+    db_result: Dict[str, Any]
+    turns: Annotated[int, operator.add]
+
+
+def database(state: SoakState):
+    tasks = [{"_id": f"{i:024d}", "title": f"Task {i}", "priority": "medium", "status": "pending"} for i in range(20)]
+    return {"db_result": {"success": True, "message": "Retrieved all 20 tasks", "tasks": tasks},
+            "tool_logs": [{"id": "1", "message": "Operation completed successfully", "status": "completed"}],
+            "turns": 1}
+
+
+def respond(state: SoakState):
+    return {"messages": [AIMessage(content=f"Here are your {len(state['db_result']['tasks'])} tasks")],
+            "tool_logs": []}
+
+
+def build_graph(checkpointer):
+    graph = StateGraph(SoakState)
+    graph.add_node("database", database)
+    graph.add_node("respond", respond)
+    graph.add_edge(START, "database")
+    graph.add_edge("database", "respond")
+    graph.add_edge("respond", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def soak(label: str, checkpointer, turns: int, threads: int, seed: int) -> List[float]:
+    graph = build_graph(checkpointer)
+    rng = random.Random(seed)
+    samples = []
+    print(f"{label}")
+    print(f"  {'turns':>8s} {'rss MB':>8s} {'threads':>8s} {'checkpoints':>12s}")
+    for turn in range(1, turns + 1):
+        thread_id = f"thread-{rng.randrange(threads)}"
+        graph.invoke({"messages": [HumanMessage(content="show my tasks")]},
+                     {"configurable": {"thread_id": thread_id}})
+        if turn % max(1, turns // 10) == 0:
+            rss = process_rss_mb()
+            samples.append(rss)
+            stats = checkpointer.stats() if hasattr(checkpointer, "stats") else {
+                "threads": len(checkpointer.storage),
+                "checkpoints": sum(len(c) for ns in checkpointer.storage.values() for c in ns.values())
+            }
+            print(f"  {turn:8d} {rss:8.1f} {stats['threads']:8d} {stats['checkpoints']:12d}")
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=100000)
+    parser.add_argument("--threads", type=int, default=10000)
+    parser.add_argument("--max-threads", type=int, default=1000)
+    parser.add_argument("--keep", type=int, default=5)
+    parser.add_argument("--spill", default=None, help="SQLite spill file (default: no spill)")
+    parser.add_argument("--max-growth-mb", type=float, default=20.0)
+    parser.add_argument("--compare", action="store_true", help="also run the unbounded MemorySaver")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    spill = args.spill
+    if spill == "tmp":
+        spill = os.path.join(tempfile.mkdtemp(), "checkpoints.sqlite")
+    bounded = BoundedMemorySaver(max_threads=args.max_threads, keep_checkpoints=args.keep, spill_path=spill)
+    samples = soak(f"bounded (max_threads={args.max_threads}, keep={args.keep}, spill={spill})",
+                   bounded, args.turns, args.threads, args.seed)
+    growth = samples[-1] - samples[len(samples) // 2 - 1] if len(samples) >= 2 else 0.0
+    stats = bounded.stats()
+    print(f"  evictions={stats.get('evictions', 0)} spills={stats.get('spills', 0)} "
+          f"restores={stats.get('restores', 0)} pruned={stats.get('pruned_checkpoints', 0)} spill_store={stats['spill']}")
+
+    if args.compare:
+        soak("unbounded MemorySaver", InMemorySaver(), args.turns, args.threads, args.seed)
+
+    verdict = "PASS" if growth < args.max_growth_mb else "FAIL"
+    print(f"{verdict}: RSS grew {growth:.1f} MB over the second half (budget {args.max_growth_mb} MB)")
+    sys.exit(0 if verdict == "PASS" else 1)
+
+
+if __name__ == "__main__":
+    main()
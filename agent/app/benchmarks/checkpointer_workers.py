@@ -0,0 +1,173 @@
+"""
+Multi-process check: conversations continue when consecutive turns land on
+different worker processes sharing the SQLite checkpointer.
+
+Starts --workers processes, each compiling the soak graph (see
+checkpointer_soak.py) with its own SharedSqliteSaver on one database file.
+Every round sends one turn of each of --threads conversations, each turn to a
+different worker than the previous turn of that conversation, and all rounds
+run concurrently across workers. After each turn the worker reports the
+thread's message count and turn counter, which must be 2 * turns and turns.
+--compare runs the same schedule with per-process BoundedMemorySaver to show
+continuity breaking.
+
+--async serves turns the way the service does: each worker runs graph.ainvoke
+on an event loop, with all the turns it receives in a round in flight at once,
+and reports how late a 10 ms ticker on its loop ran (p99 and max, after the
+first round, which includes imports and graph setup).
+The checkpointer's SQLite work runs in threads, so the stall stays far below the
+time a turn spends waiting for another worker's write lock.
+
+No database or API key needed. tests/test_checkpointer_workers.py runs the
+continuity check under pytest, on the workflow's state and end node.
+
+Usage: python benchmarks/checkpointer_workers.py [--workers 4] [--threads 20] [--turns 10]
+       [--db /tmp/checkpoints.sqlite] [--compare] [--async]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import multiprocessing
+from typing import List
+
+# Add the app directory to Python path for imports
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ.setdefault("GOOGLE_API_KEY", "unused")
+
+
+def worker(worker_id: int, mode: str, path: str, inbox, outbox, use_async: bool = False):
+    from langchain_core.messages import HumanMessage
+    from utils.checkpointer import BoundedMemorySaver, SharedSqliteSaver
+    from checkpointer_soak import build_graph
+
+    checkpointer = SharedSqliteSaver(path) if mode == "sqlite" else BoundedMemorySaver()
+    graph = build_graph(checkpointer)
+
+    def report(thread_id, turn, state=None, error=None):
+        if error:
+            outbox.put((worker_id, thread_id, turn, None, None, f"{type(error).__name__}: {error}"))
+        else:
+            outbox.put((worker_id, thread_id, turn, len(state["messages"]), state.get("turns"), None))
+
+    if use_async:
+        # Last message: the worker's event loop stalls in ms
+        outbox.put((worker_id, asyncio.run(serve(graph, inbox, report))))
+        return
+
+    while True:
+        job = inbox.get()
+        if job is None:
+            break
+        thread_id, turn = job
+        try:
+            state = graph.invoke({"messages": [HumanMessage(content=f"turn {turn}")]},
+                                 {"configurable": {"thread_id": thread_id}})
+            report(thread_id, turn, state)
+        except Exception as e:
+            report(thread_id, turn, error=e)
+    outbox.put((worker_id, []))
+
+
+async def serve(graph, inbox, report) -> List[float]:
+    """Run every received turn as its own graph.ainvoke task; returns the loop stalls in ms."""
+    from langchain_core.messages import HumanMessage
+
+    stalls: List[float] = []
+    latest_turn = 0
+
+    async def ticker():
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            if latest_turn > 1:
+                stalls.append((time.perf_counter() - start - 0.01) * 1000)
+
+    async def turn(thread_id, number):
+        try:
+            state = await graph.ainvoke({"messages": [HumanMessage(content=f"turn {number}")]},
+                                        {"configurable": {"thread_id": thread_id}})
+            report(thread_id, number, state)
+        except Exception as e:
+            report(thread_id, number, error=e)
+
+    ticking = asyncio.create_task(ticker())
+    running = set()
+    while True:
+        job = await asyncio.to_thread(inbox.get)
+        if job is None:
+            break
+        # Rounds after the first one
+        latest_turn = max(latest_turn, job[1])
+        task = asyncio.create_task(turn(*job))
+        running.add(task)
+        task.add_done_callback(running.discard)
+    await asyncio.gather(*running)
+    ticking.cancel()
+    return stalls
+
+
+def run(mode: str, path: str, workers: int, threads: int, turns: int, use_async: bool = False) -> int:
+    outbox = multiprocessing.Queue()
+    inboxes = [multiprocessing.Queue() for _ in range(workers)]
+    processes = [
+        multiprocessing.Process(target=worker, args=(i, mode, path, inboxes[i], outbox, use_async), daemon=True)
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    failures = 0
+    start = time.perf_counter()
+    for turn in range(1, turns + 1):
+        # Thread t's turn n goes to worker (t + n) % workers: never the worker of its previous turn
+        for t in range(threads):
+            inboxes[(t + turn) % workers].put((f"thread-{t}", turn))
+        for _ in range(threads):
+            worker_id, thread_id, done_turn, messages, counted, error = outbox.get()
+            if error or messages != 2 * done_turn or counted != done_turn:
+                failures += 1
+                if failures <= 5:
+                    print(f"  {thread_id} turn {done_turn} on worker {worker_id}: "
+                          f"{error or f'{messages} messages, turn counter {counted}'}")
+    elapsed = time.perf_counter() - start
+
+    for inbox in inboxes:
+        inbox.put(None)
+    stalls = sorted(stall for _ in processes for stall in outbox.get()[1])
+    for process in processes:
+        process.join()
+    total = threads * turns
+    label = f"{mode} ({'ainvoke' if use_async else 'invoke'})"
+    print(f"{label}: {total} turns on {workers} workers in {elapsed:.1f}s "
+          f"({elapsed * 1000 / total:.1f} ms/turn), {failures} discontinuous turns")
+    if stalls:
+        print(f"  event loop stall: p99 {stalls[int(len(stalls) * 0.99)]:.1f} ms, max {stalls[-1]:.1f} ms")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--db", default=None, help="SQLite file (default: a temporary one)")
+    parser.add_argument("--compare", action="store_true", help="also run per-process in-memory checkpointers")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="serve concurrent turns per worker with graph.ainvoke")
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(), "checkpoints.sqlite")
+    failures = run("sqlite", path, args.workers, args.threads, args.turns, args.use_async)
+    if args.compare:
+        run("memory", path, args.workers, args.threads, args.turns, args.use_async)
+
+    print("PASS" if failures == 0 else "FAIL")
+    sys.exit(0 if failures == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
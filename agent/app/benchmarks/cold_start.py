@@ -0,0 +1,122 @@
+"""
+Benchmark: cold start of the agent service, with a budget for CI.
+
+import:  `python -X importtime -c "import main"` in a fresh process; the
+         cumulative import time of main and its heaviest direct imports
+healthz: time from spawning uvicorn with main:app to the first 200 from /healthz
+
+Each is the median of --runs fresh processes (after one unmeasured run that
+writes the bytecode caches). Exits 1 when either median is over its budget.
+
+No database or API key needed: the service warms up in the background and
+/healthz does not wait for it.
+
+Usage: python benchmarks/cold_start.py [--runs 5] [--import-budget-ms 2000]
+       [--healthz-budget-ms 3500] [--port 8765]
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import statistics
+import subprocess
+import urllib.request
+from typing import Dict, List, Tuple
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def service_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("GOOGLE_API_KEY", "unused")
+    env["PYTHONWARNINGS"] = "ignore"
+    return env
+
+
+def import_time() -> Tuple[float, List[Tuple[float, str]]]:
+    """Cumulative ms to import main, and (ms, module) of its direct imports."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=APP_DIR, env=service_env(), capture_output=True, text=True, check=True
+    )
+    total, children = 0.0, []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        ms = int(cumulative) / 1000
+        if name.strip() == "main" and not name.startswith("  "):
+            total = ms
+        elif name.startswith("   ") and not name.startswith("    "):
+            # One level under main
+            children.append((ms, name.strip()))
+    return total, sorted(children, reverse=True)
+
+
+def free_port(preferred: int) -> int:
+    with socket.socket() as sock:
+        try:
+            sock.bind(("127.0.0.1", preferred))
+        except OSError:
+            sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_healthz(port: int, timeout: float = 60.0) -> float:
+    """ms from spawning the server to the first successful /healthz."""
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-c",
+         f"import uvicorn; uvicorn.run('main:app', host='127.0.0.1', port={port}, log_level='warning')"],
+        cwd=APP_DIR, env=service_env(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"server exited with code {server.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/healthz", timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - start) * 1000
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError(f"/healthz did not answer within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=2000)
+    parser.add_argument("--healthz-budget-ms", type=float, default=3500)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--top", type=int, default=8, help="heaviest direct imports of main to list")
+    args = parser.parse_args()
+
+    # Unmeasured: compiles the bytecode caches
+    import_time()
+
+    imports = [import_time() for _ in range(args.runs)]
+    import_ms = statistics.median(total for total, _ in imports)
+    port = free_port(args.port)
+    healthz_ms = statistics.median(time_to_healthz(port) for _ in range(args.runs))
+
+    print(f"import main:        {import_ms:8.0f} ms (budget {args.import_budget_ms:.0f})")
+    for ms, name in imports[-1][1][:args.top]:
+        print(f"  {ms:8.0f} ms  {name}")
+    print(f"first /healthz 200: {healthz_ms:8.0f} ms (budget {args.healthz_budget_ms:.0f})")
+
+    over = [label for label, value, budget in (
+        ("import", import_ms, args.import_budget_ms),
+        ("healthz", healthz_ms, args.healthz_budget_ms)
+    ) if value > budget]
+    print(f"FAIL: over budget: {', '.join(over)}" if over else "PASS")
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark: fuzzy title scoring, per-title SequenceMatcher vs the NumPy batch scorer.
+
+Every path times TaskMatcher._find_fuzzy_matches(query, tasks) as shipped:
+
+before: batch scoring off, every title is scored with SequenceMatcher
+list:   the matcher index is empty, so the first call builds a scorer for the
+        list (its time is reported as "first") and later calls reuse it
+index:  the tasks are in the matcher index, whose scorer ranks them directly
+
+The batch paths only rescore the best MATCHER_BATCH_RESCORE trigram overlaps
+(plus substring hits) with SequenceMatcher. Those titles keep their exact
+scores, but the best one can be left out, so the table reports how often each
+batch path picks the same best score and the same decision tier (>0.7 match,
+>0.4 LLM tiebreak, below) as the full pass.
+
+No database or API key needed; needs numpy.
+
+Usage: python benchmarks/fuzzy_scorer.py [--sizes 1000 10000 50000] [--queries 200]
+"""
+
+import os
+import sys
+import time
+import importlib
+import random
+import argparse
+import statistics
+
+# Add the app directory to Python path for imports
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ.setdefault("GOOGLE_API_KEY", "unused")
+
+# The submodule: utils.task_matcher itself is the matcher instance
+matcher_module = importlib.import_module("utils.task_matcher")
+from utils.task_matcher import task_matcher
+from utils.ngram_scorer import HAS_NUMPY
+
+
+WORDS = (
+    "buy call email write review plan fix deploy book pay clean prepare send "
+    "update schedule finish draft check order renew cancel organize submit "
+    "milk report dentist invoice budget meeting slides client project taxes "
+    "groceries car insurance flight hotel doctor gym birthday gift presentation "
+    "quarterly weekly monthly team manager mom dad landlord bank backup server"
+).split()
+
+
+def make_tasks(count: int, rng: random.Random):
+    return [
+        {"_id": str(i), "title": " ".join(rng.sample(WORDS, rng.randint(2, 6)))}
+        for i in range(count)
+    ]
+
+
+def make_queries(tasks, count: int, rng: random.Random):
+    """Typo'd, truncated and reordered references to existing titles."""
+    queries = []
+    for _ in range(count):
+        words = rng.choice(tasks)["title"].split()
+        kind = rng.random()
+        if kind < 0.33:
+            word = rng.randrange(len(words))
+            chars = list(words[word])
+            del chars[rng.randrange(len(chars))]
+            words[word] = "".join(chars)
+        elif kind < 0.66:
+            words = words[:max(1, len(words) - 1)]
+        else:
+            rng.shuffle(words)
+        queries.append(" ".join(words))
+    return queries
+
+
+def tier(matches):
+    if not matches:
+        return "none"
+    score = matches[0][1]
+    return "match" if score > 0.7 else "llm" if score > 0.4 else "none"
+
+
+def timed(fn, queries):
+    results, samples = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(fn(query))
+        samples.append((time.perf_counter() - start) * 1000)
+    return results, samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    if not HAS_NUMPY:
+        sys.exit("numpy is not installed (pip install numpy)")
+
+    print(f"{'tasks':>7} {'path':<8} {'first ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'same best':>10} {'same tier':>10}")
+    for size in args.sizes:
+        rng = random.Random(args.seed)
+        tasks = make_tasks(size, rng)
+        queries = make_queries(tasks, args.queries, rng)
+
+        # before: disable the batch path so every title goes through SequenceMatcher
+        matcher_module.HAS_NUMPY = False
+        before, before_ms = timed(lambda q: task_matcher._find_fuzzy_matches(q, tasks), queries)
+        matcher_module.HAS_NUMPY = True
+
+        rows = [("before", before_ms, None, None)]
+        for label in ("list", "index"):
+            task_matcher.index.clear()
+            task_matcher._batch_scorer = None
+            if label == "index":
+                task_matcher.index.build(tasks)
+            after, after_ms = timed(lambda q: task_matcher._find_fuzzy_matches(q, tasks), queries)
+            same_best = sum(
+                1 for b, a in zip(before, after)
+                if (b[0][1] if b else None) == (a[0][1] if a else None)
+            )
+            same_tier = sum(1 for b, a in zip(before, after) if tier(b) == tier(a))
+            rows.append((label, after_ms, same_best / len(queries), same_tier / len(queries)))
+        task_matcher.index.clear()
+        task_matcher._batch_scorer = None
+
+        for label, samples, same_best, same_tier in rows:
+            first = samples[0]
+            samples = sorted(samples)
+            p50 = statistics.median(samples)
+            p95 = samples[int(len(samples) * 0.95) - 1]
+            agreement = f"{same_best:>10.1%} {same_tier:>10.1%}" if same_best is not None else f"{'':>10} {'':>10}"
+            print(f"{size:>7} {label:<8} {first:>9.2f} {p50:>9.2f} {p95:>9.2f} {agreement}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark and regression cases for the deterministic fast-path intent parser.
+
+Every case is a message with either the parse the fast path must return
+(operation plus a subset of its parameters) or None when the message must go
+to the LLM (no rule, or a confidence under FAST_PATH_MIN_CONFIDENCE). Prints
+the mismatches, the fast-path share and the per-message parse time.
+Exits 1 on any mismatch.
+
+No database or API key needed.
+
+Usage: python benchmarks/intent_fast_path.py [--repeat 200]
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add the app directory to Python path for imports
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from utils.intent_parser import parse_intent, FAST_PATH_MIN_CONFIDENCE
+
+CASES: List[Tuple[str, Optional[Dict[str, Any]]]] = [
+    # Answered by the fast path
+    ("mark buy milk as done", {"operation": "MARK_DONE", "parameters": {"task_identifier": "buy milk"}}),
+    ("Set the report to done", {"operation": "MARK_DONE", "parameters": {"task_identifier": "report"}}),
+    ("complete the quarterly report", {"operation": "MARK_DONE", "parameters": {"task_identifier": "quarterly report"}}),
+    ("the dentist task is done", {"operation": "MARK_DONE", "parameters": {"task_identifier": "dentist"}}),
+    ("delete call mom", {"operation": "DELETE_TASK", "parameters": {"task_identifier": "call mom"}}),
+    ("make taxes high priority", {"operation": "PRIORITIZE", "parameters": {"task_identifier": "taxes", "priority": "high"}}),
+    ("rename gym to evening run", {"operation": "UPDATE_TASK", "parameters": {
+        "task_identifier": "gym", "updates": {"title": "evening run"}}}),
+    ("move the report to next week", {"operation": "UPDATE_TASK", "parameters": {
+        "task_identifier": "report", "updates": {"date": "next week"}}}),
+    ("add task buy milk tomorrow", {"operation": "ADD_TASK", "parameters": {"title": "buy milk", "date": "tomorrow"}}),
+    ("remind me to call mom", {"operation": "ADD_TASK", "parameters": {"title": "call mom", "date": None}}),
+    ("show my high priority tasks", {"operation": "GET_TASKS", "parameters": {"priority_filter": "high"}}),
+    ("summarize my tasks", {"operation": "SUMMARIZE_TASKS", "parameters": {"filter_criteria": {}}}),
+    # Left to the LLM: pronouns only the conversation resolves
+    ("mark it as done", None),
+    ("complete it", None),
+    ("delete that one", None),
+    ("remove this", None),
+    ("set it to high priority", None),
+    # Left to the LLM: dates and deadlines the rules would keep in the reference or title
+    ("complete the report by friday", None),
+    ("remind me to call mom tomorrow at 5pm", None),
+    ("add task submit invoice by end of the month", None),
+    ("delete the meeting on monday", None),
+    # Left to the LLM: several requests or conditions
+    ("delete call mom and add buy milk", None),
+    ("mark the report done if it is finished", None),
+    ("delete all tasks", None),
+    # Left to the LLM: sets of tasks the matcher would narrow to one
+    ("delete completed tasks", None),
+    ("delete the high priority tasks", None),
+    ("drop the last two tasks", None),
+    ("complete both tasks", None),
+    ("delete both", None),
+    ("remove duplicates", None),
+    ("delete the oldest", None),
+    ("remove 3 tasks", None),
+    ("mark the pending ones as done", None),
+    ("make the overdue tasks high priority", None),
+    ("move the first one to tomorrow", None),
+]
+
+
+def check(message: str, expected: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Why the parse differs from the expectation, or None when it matches."""
+    parsed = parse_intent(message)
+    fast = parsed if parsed and parsed["confidence"] >= FAST_PATH_MIN_CONFIDENCE else None
+    if expected is None:
+        return None if fast is None else f"expected the LLM, got {fast}"
+    if fast is None:
+        return f"expected {expected}, got the LLM (parse {parsed})"
+    if fast["operation"] != expected["operation"]:
+        return f"expected {expected['operation']}, got {fast}"
+    for key, value in expected["parameters"].items():
+        if fast["parameters"].get(key) != value:
+            return f"expected {key}={value!r}, got {fast}"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    failures = [(message, reason) for message, expected in CASES if (reason := check(message, expected))]
+    for message, reason in failures:
+        print(f"MISMATCH {message!r}: {reason}")
+
+    samples = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        for message, _ in CASES:
+            parse_intent(message)
+        samples.append((time.perf_counter() - start) / len(CASES) * 1e6)
+
+    fast = sum(1 for _, expected in CASES if expected is not None)
+    print(f"cases: {len(CASES)} ({fast} fast path, {len(CASES) - fast} LLM), mismatches: {len(failures)}")
+    print(f"parse: median {statistics.median(samples):.1f} us per message")
+    print("FAIL" if failures else "PASS")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+How often TaskMatcher still hands an identifier to the LLM, compared with the baseline rules.
+
+baseline: exact -> fuzzy > 0.7 -> keyword > 0.6 -> LLM over the top 3 fuzzy titles when
+          the best fuzzy score is above 0.4
+current:  the same three deterministic tiers, then the embedding tier, then the LLM over
+          the medium fuzzy titles plus the semantic candidates (ties, hits whose title
+          misses a content word, and scores from SEMANTIC_LLM_MIN_SCORE up)
+
+Both columns use the same scorers on the same task list, so the only difference is the
+routing. Each LLM hand-off is attributed to the first reason that applies. No database,
+model or API key needed; nothing is sent to an LLM.
+
+Usage: python benchmarks/llm_tiebreak_rate.py [--verbose]
+"""
+
+import os
+import sys
+import argparse
+import importlib
+from collections import Counter
+
+# Add the app directory to Python path for imports
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ.setdefault("GOOGLE_API_KEY", "unused")
+
+# The submodule: utils.task_matcher itself is the matcher instance
+matcher_module = importlib.import_module("utils.task_matcher")
+from utils.task_matcher import task_matcher
+
+
+TITLES = [
+    "Prepare quarterly budget review", "Prepare quarterly sales review", "Book flight to Berlin",
+    "Team meeting", "Client meeting with Acme", "Dentist appointment", "File taxes",
+    "Renew car insurance", "Buy groceries", "Call mom", "Write blog post about caching",
+    "Fix login bug", "Update project roadmap", "Plan birthday party", "Pay electricity bill",
+    "Review pull request for search", "Clean the garage", "Schedule car service",
+    "Submit expense report", "Order new office chair", "Read design doc", "Water the plants",
+    "Prepare slides for conference talk", "Backup laptop", "Cancel gym membership",
+]
+TASKS = [
+    {"_id": str(i), "title": title, "priority": "medium", "status": "pending"}
+    for i, title in enumerate(TITLES)
+]
+
+# Identifiers as users type them: exact and near-exact titles, typos, partial titles,
+# paraphrases, same verb with another object, and references to no task at all
+IDENTIFIERS = [
+    "team meeting", "buy groceries", "call mom", "file taxes",
+    "dentist apointment", "renew car insurence", "fix the login bug", "water plants",
+    "budget review", "sales review", "the roadmap", "expense report", "garage",
+    "flight to berlin", "conference slides", "blog post", "gym membership", "laptop backup",
+    "taxes", "electricity bill", "office chair", "birthday party", "car service",
+    "quarterly review", "meeting", "review", "prepare the review", "car",
+    "tooth doctor visit", "grocery shopping", "phone my mother", "pay the power bill",
+    "client meeting", "team sync", "marketing meeting", "book hotel in Berlin",
+    "clean the kitchen", "review the design", "call dad", "buy milk",
+    "walk the dog", "learn spanish", "quarterly report",
+]
+
+
+def baseline_route(identifier: str):
+    """'match', 'llm' or 'none' under the pre-embedding rules."""
+    if task_matcher._find_exact_match(identifier, TASKS):
+        return "match", None
+    fuzzy = task_matcher._find_fuzzy_matches(identifier, TASKS)
+    if fuzzy and fuzzy[0][1] > 0.7:
+        return "match", None
+    keyword = task_matcher._find_keyword_matches(identifier, TASKS)
+    if keyword and keyword[0][1] > 0.6:
+        return "match", None
+    if fuzzy and fuzzy[0][1] > 0.4:
+        return "llm", "fuzzy 0.4-0.7"
+    return "none", None
+
+
+def current_route(identifier: str):
+    """'match', 'llm' or 'none' under TaskMatcher._rank_candidates, with the first LLM reason."""
+    match, candidates = task_matcher._rank_candidates(identifier, TASKS)
+    if match:
+        return "match", None
+    if not candidates:
+        return "none", None
+
+    fuzzy = task_matcher._find_fuzzy_matches(identifier, TASKS)
+    if fuzzy and fuzzy[0][1] > 0.4:
+        return "llm", "fuzzy 0.4-0.7"
+    semantic = task_matcher._find_semantic_matches(identifier, TASKS)
+    best_score = semantic[0][1]
+    if best_score < matcher_module.SEMANTIC_MIN_SCORE:
+        return "llm", "semantic below SEMANTIC_MIN_SCORE"
+    close = [score for _, score in semantic[:3]
+             if best_score - score <= matcher_module.SEMANTIC_TIE_MARGIN]
+    if len(close) > 1:
+        return "llm", "semantic tie"
+    return "llm", "semantic unconfirmed"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--verbose", action="store_true", help="print the routing of every identifier")
+    args = parser.parse_args()
+
+    before, after, reasons = Counter(), Counter(), Counter()
+    for identifier in IDENTIFIERS:
+        old, _ = baseline_route(identifier)
+        new, reason = current_route(identifier)
+        before[old] += 1
+        after[new] += 1
+        if reason:
+            reasons[reason] += 1
+        if args.verbose:
+            print(f"{identifier!r:28} baseline={old:5} current={new:5} {reason or ''}")
+
+    total = len(IDENTIFIERS)
+    print(f"{total} identifiers over {len(TASKS)} tasks")
+    print(f"{'':10}{'match':>8}{'llm':>8}{'none':>8}")
+    for label, counts in (("baseline", before), ("current", after)):
+        print(f"{label:10}" + "".join(f"{counts[key]:>8}" for key in ("match", "llm", "none")))
+    print(f"LLM share: baseline {before['llm'] / total:.0%}, current {after['llm'] / total:.0%}")
+    for reason, count in reasons.most_common():
+        print(f"  {reason}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Demo: the LLM tiebreak in TaskMatcher no longer blocks the event loop.
+
+A fake LLM sleeps LLM_DELAY seconds per call. Several ambiguous identifiers are
+resolved concurrently while a heartbeat coroutine ticks every 10 ms.
+
+before: find_best_match -> llm.invoke blocks the loop, the heartbeat stalls
+after:  afind_best_match -> llm.ainvoke under a timeout and concurrency limit,
+        the heartbeat keeps ticking and calls overlap up to the limit
+
+No database or API key needed. tests/test_matcher_llm.py asserts the same
+behaviour under pytest.
+
+Usage: python benchmarks/matcher_llm_concurrency.py [--calls 4] [--delay 0.5] [--timeout 2]
+"""
+
+import os
+import sys
+import time
+import importlib
+import asyncio
+import argparse
+from types import SimpleNamespace
+
+# Add the app directory to Python path for imports
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ.setdefault("GOOGLE_API_KEY", "unused")
+
+# The submodule: utils.task_matcher itself is the matcher instance
+matcher_module = importlib.import_module("utils.task_matcher")
+from utils.task_matcher import task_matcher
+
+
+TASKS = [
+    {"_id": "1", "title": "Prepare quarterly budget review", "priority": "high", "status": "pending"},
+    {"_id": "2", "title": "Prepare quarterly sales review", "priority": "medium", "status": "pending"},
+    {"_id": "3", "title": "Book flight to Berlin", "priority": "low", "status": "pending"},
+]
+
+# Between the 0.4 and 0.7 fuzzy thresholds, so only the LLM can pick
+AMBIGUOUS_IDENTIFIER = "quarterly review prep"
+
+
+class SlowFakeLLM:
+    """Answers "1" after `delay` seconds, through both the sync and async interfaces."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def invoke(self, prompt):
+        time.sleep(self.delay)
+        return SimpleNamespace(content="1")
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(content="1")
+
+
+async def heartbeat(stop: asyncio.Event, ticks: list):
+    ticks.append(time.perf_counter())
+    while not stop.is_set():
+        await asyncio.sleep(0.01)
+        ticks.append(time.perf_counter())
+
+
+def longest_gap_ms(ticks: list) -> float:
+    gaps = [b - a for a, b in zip(ticks, ticks[1:])]
+    return max(gaps, default=0.0) * 1000
+
+
+async def run(label: str, resolve, calls: int):
+    stop = asyncio.Event()
+    ticks: list = []
+    beat = asyncio.create_task(heartbeat(stop, ticks))
+    await asyncio.sleep(0.02)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(resolve() for _ in range(calls)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await beat
+    matched = sum(1 for result in results if result)
+    print(f"{label:<18} {calls} calls in {elapsed:6.2f}s  matched={matched}  "
+          f"heartbeat ticks={len(ticks):4d}  longest stall={longest_gap_ms(ticks):7.1f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=4)
+    parser.add_argument("--delay", type=float, default=0.5, help="fake LLM latency in seconds")
+    parser.add_argument("--timeout", type=float, default=2.0, help="per-call LLM timeout in seconds")
+    args = parser.parse_args()
+
+    llm = SlowFakeLLM(args.delay)
+    # TaskMatcher.llm comes from the client registry; swap the lookup for the fake
+    matcher_module.get_llm_model = lambda *args, **kwargs: llm
+    task_matcher.llm_timeout = args.timeout
+    limit = task_matcher._llm_semaphore._value
+    print(f"fake LLM delay {args.delay}s, timeout {args.timeout}s, concurrency limit {limit}\n")
+
+    async def blocking():
+        return task_matcher.find_best_match(AMBIGUOUS_IDENTIFIER, TASKS)
+
+    async def non_blocking():
+        return await task_matcher.afind_best_match(AMBIGUOUS_IDENTIFIER, TASKS)
+
+    await run("sync (before)", blocking, args.calls)
+    await run("async (after)", non_blocking, args.calls)
+
+    llm = SlowFakeLLM(args.timeout * 2)
+    await run("async, timed out", non_blocking, 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,362 @@
+"""
+Microbenchmarks of the agent's hot paths, written to a JSON file for
+comparison across commits.
+
+matcher: TaskMatcher.find_best_match (task list and matcher index) and
+         find_multiple_matches over --sizes synthetic tasks
+dates:   parse_date and build_date_filter over the phrasings the analysis emits
+json:    parse_json_response on analysis replies, and the
+         json.dumps(result, default=str, indent=2) prompt serialization of
+         task listings and summaries
+db:      every public TaskDatabase method against mongomock_motor (an
+         in-process MongoDB stand-in, pip install mongomock-motor), seeded
+         with --db-sizes tasks; methods the stand-in cannot run are recorded
+         with their error
+
+Each result is the per-call time (min / median / mean over --repeat passes)
+of one benchmark at one size; a benchmark stops early after --max-seconds,
+so the largest sizes run fewer calls. LLM tiebreaks use the fake backend (reply
+"none"), so matcher timings exclude model latency. The functions' own print
+output goes to /dev/null while they are timed.
+
+No database or API key needed.
+
+Usage: python benchmarks/microbench.py [--groups matcher dates json db]
+       [--sizes 100 1000 10000 100000] [--db-sizes 100 1000] [--repeat 5]
+       [--max-seconds 10] [--output microbench.json] [--compare previous.json]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import platform
+import statistics
+import subprocess
+import contextlib
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Add the app directory to Python path for imports
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ.setdefault("GOOGLE_API_KEY", "unused")
+# Tiebreaks answer "no match" without a model call
+os.environ["LLM_BACKEND"] = "fake"
+os.environ["LLM_FAKE_RESPONSES"] = '["none"]'
+
+from utils.task_matcher import task_matcher
+from utils.ngram_scorer import HAS_NUMPY
+from utils.date_utils import parse_date, build_date_filter
+from utils.json_parser import parse_json_response
+
+WORDS = (
+    "buy call email write review plan fix deploy book pay clean prepare send "
+    "update schedule finish draft check order renew cancel organize submit "
+    "milk report dentist invoice budget meeting slides client project taxes "
+    "groceries car insurance flight hotel doctor gym birthday gift presentation "
+    "quarterly weekly monthly team manager mom dad landlord bank backup server"
+).split()
+
+DATE_INPUTS = ["today", "tomorrow", "yesterday", "next week", "this week", "2025-03-14",
+               "03/14/2025", "14/03/2025", "2025-03-14 09:30", "someday"]
+DATE_RANGES = ["today", "tomorrow", "this week", "next week", "2025-03-14", "03/14/2025"]
+ANALYSIS_REPLIES = [
+    '{"operation": "GET_TASKS", "parameters": {"date_range": "today"}}',
+    '```json\n{"operation": "ADD_TASK", "parameters": {"title": "Call the dentist", "date": "tomorrow", '
+    '"priority": "high"}}\n```',
+    '```\n{"operations": [{"operation": "MARK_DONE", "parameters": {"task_identifier": "report"}}, '
+    '{"operation": "DELETE_TASK", "parameters": {"task_identifier": "milk"}}]}\n```',
+]
+
+results: List[Dict[str, Any]] = []
+out = sys.stdout
+# Time budget of one benchmark (--max-seconds)
+MAX_SECONDS = 10.0
+
+
+@contextlib.contextmanager
+def quiet():
+    """Send the benchmarked code's prints to /dev/null."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def record(group: str, name: str, size: Optional[int], samples: List[Tuple[float, int]]):
+    """samples: (seconds, calls) of each pass over the inputs."""
+    per_call = [seconds / calls * 1e6 for seconds, calls in samples]
+    entry = {
+        "group": group, "name": name, "size": size, "calls": sum(calls for _, calls in samples),
+        "repeat": len(samples),
+        "min_us": round(min(per_call), 3),
+        "median_us": round(statistics.median(per_call), 3),
+        "mean_us": round(statistics.mean(per_call), 3),
+    }
+    results.append(entry)
+    print(f"  {name:42s} {size if size is not None else '':>7} {entry['median_us']:14.1f} {entry['min_us']:14.1f}",
+          file=out)
+
+
+def bench(group: str, name: str, size: Optional[int], fn: Callable[[Any], Any], inputs: List[Any], repeat: int):
+    """Time repeat passes of fn over the inputs, cut short after MAX_SECONDS (at least one call)."""
+    samples = []
+    deadline = time.perf_counter() + MAX_SECONDS
+    with quiet():
+        for _ in range(repeat):
+            calls, start = 0, time.perf_counter()
+            for value in inputs:
+                fn(value)
+                calls += 1
+                if time.perf_counter() > deadline:
+                    break
+            samples.append((time.perf_counter() - start, calls))
+            if time.perf_counter() > deadline:
+                break
+    record(group, name, size, samples)
+
+
+async def abench(group: str, name: str, size: Optional[int], fn: Callable[[Any], Any], inputs: List[Any],
+                 repeat: int, reset: Optional[Callable[[], Any]] = None):
+    """Async bench; `reset` runs untimed before each pass. Failures are recorded instead of timings."""
+    samples = []
+    deadline = time.perf_counter() + MAX_SECONDS
+    try:
+        with quiet():
+            for _ in range(repeat):
+                if reset:
+                    await reset()
+                calls, start = 0, time.perf_counter()
+                for value in inputs:
+                    result = await fn(value)
+                    if isinstance(result, dict) and result.get("success") is False:
+                        # A failed write is not a timing of the write
+                        raise RuntimeError(f"success=False: {result.get('message')}")
+                    calls += 1
+                    if time.perf_counter() > deadline:
+                        break
+                samples.append((time.perf_counter() - start, calls))
+                if time.perf_counter() > deadline:
+                    break
+    except Exception as e:
+        results.append({"group": group, "name": name, "size": size, "error": f"{type(e).__name__}: {e}"})
+        print(f"  {name:42s} {size if size is not None else '':>7}   error: {type(e).__name__}: {str(e)[:60]}", file=out)
+        return
+    record(group, name, size, samples)
+
+
+def make_tasks(count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    now = datetime.now()
+    return [
+        {"_id": f"{i:024x}", "title": " ".join(rng.sample(WORDS, rng.randint(2, 6))),
+         "date": now + timedelta(days=rng.randint(-10, 30)), "priority": rng.choice(["low", "medium", "high"]),
+         "status": rng.choice(["pending", "completed"]), "created_at": now, "updated_at": now}
+        for i in range(count)
+    ]
+
+
+def make_queries(tasks: List[Dict[str, Any]], count: int, rng: random.Random) -> List[str]:
+    """Typo'd, truncated and reordered references to existing titles."""
+    queries = []
+    for _ in range(count):
+        words = rng.choice(tasks)["title"].split()
+        kind = rng.random()
+        if kind < 0.33:
+            word = rng.randrange(len(words))
+            chars = list(words[word])
+            del chars[rng.randrange(len(chars))]
+            words[word] = "".join(chars)
+        elif kind < 0.66:
+            words = words[:max(1, len(words) - 1)]
+        else:
+            rng.shuffle(words)
+        queries.append(" ".join(words))
+    return queries
+
+
+def matcher_group(sizes: List[int], queries: int, repeat: int, rng: random.Random):
+    for size in sizes:
+        tasks = make_tasks(size, rng)
+        sample = make_queries(tasks, queries, rng)
+        bench("matcher", "find_best_match (task list)", size,
+              lambda query: task_matcher.find_best_match(query, tasks), sample, repeat)
+        bench("matcher", "find_multiple_matches (task list)", size,
+              lambda query: task_matcher.find_multiple_matches(query, tasks), sample, repeat)
+        with quiet():
+            task_matcher.index.build(tasks, 0)
+        bench("matcher", "find_best_match (matcher index)", size,
+              lambda query: task_matcher.find_best_match(query), sample, repeat)
+        task_matcher.index.clear()
+
+
+def dates_group(repeat: int):
+    bench("dates", "parse_date", None, parse_date, DATE_INPUTS * 100, repeat)
+    bench("dates", "build_date_filter", None, build_date_filter, DATE_RANGES * 100, repeat)
+
+
+def json_group(sizes: List[int], repeat: int, rng: random.Random):
+    bench("json", "parse_json_response", None, parse_json_response, ANALYSIS_REPLIES * 100, repeat)
+    for size in sizes:
+        listing = {"success": True, "message": f"Retrieved all {size} tasks", "tasks": make_tasks(size, rng),
+                   "count": size}
+        calls = max(1, 10000 // size)
+        bench("json", "json.dumps task listing (prompt)", size,
+              lambda result: json.dumps(result, default=str, indent=2), [listing] * calls, repeat)
+    summary = {
+        "total_tasks": 1000, "by_priority": {"high": 300, "medium": 400, "low": 300},
+        "by_status": {"pending": 600, "completed": 400}, "overdue": 42,
+        "upcoming": [{"title": " ".join(rng.sample(WORDS, 4)), "date": datetime.now()} for _ in range(5)],
+        "sample_tasks": make_tasks(20, rng)
+    }
+    bench("json", "json.dumps task summary (prompt)", None,
+          lambda result: json.dumps(result, default=str, indent=2), [summary] * 200, repeat)
+
+
+async def db_group(sizes: List[int], repeat: int, rng: random.Random):
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        print("  db: skipped (pip install mongomock-motor)", file=out)
+        return
+    import utils.task_database as task_database
+    from utils.task_database import TaskDatabase
+
+    task_database.AsyncIOMotorClient = lambda url, **kwargs: AsyncMongoMockClient()
+    for size in sizes:
+        db = TaskDatabase()
+        with quiet():
+            await db.connect()
+            seed = make_tasks(size, rng)
+            for task in seed:
+                task.pop("_id")
+            items = [{"title": task["title"], "priority": task["priority"]} for task in seed]
+            for start in range(0, len(items), db.bulk_max_items):
+                seeded = await db.bulk_add(items[start:start + db.bulk_max_items])
+                if not seeded["success"]:
+                    raise RuntimeError(f"seeding failed: {seeded['message']}")
+        titles = [task["title"] for task in seed]
+        picks = lambda count: [rng.choice(titles) for _ in range(count)]
+        counter = iter(range(10 ** 9))
+
+        async def clear_index():
+            task_matcher.index.clear()
+
+        await abench("db", "get_version", size, lambda _: db.get_version(), range(50), repeat)
+        await abench("db", "ping", size, lambda _: db.ping(), range(50), repeat)
+        await abench("db", "ensure_indexes", size, lambda _: db.ensure_indexes(), range(5), repeat)
+        await abench("db", "ensure_match_index (rebuild)", size, lambda _: db.ensure_match_index(), range(1), repeat,
+                     reset=clear_index)
+        await abench("db", "fetch_candidates", size, db.fetch_candidates, picks(10), repeat)
+        await abench("db", "get_tasks", size, lambda _: db.get_tasks(), range(3), repeat)
+        await abench("db", "get_tasks (priority filter)", size, lambda _: db.get_tasks(priority_filter="high"), range(3),
+                     repeat)
+
+        async def iterate(_):
+            async for _task in db.iter_tasks():
+                pass
+
+        await abench("db", "iter_tasks", size, iterate, range(3), repeat)
+        await abench("db", "add_task", size,
+                     lambda _: db.add_task(f"bench task {next(counter)}", "tomorrow", "medium"), range(10), repeat)
+        await abench("db", "update_task", size,
+                     lambda title: db.update_task(title, {"priority": rng.choice(["low", "high"])}), picks(10), repeat)
+        await abench("db", "mark_done", size, db.mark_done, picks(10), repeat)
+        await abench("db", "set_priority", size, lambda title: db.set_priority(title, "high"), picks(10), repeat)
+
+        async def add_then_delete(_):
+            title = f"bench delete {next(counter)}"
+            await db.add_task(title)
+            return await db.delete_task(title)
+
+        await abench("db", "add_task + delete_task", size, add_then_delete, range(10), repeat)
+        await abench("db", "bulk_add (20 items)", size,
+                     lambda _: db.bulk_add([{"title": f"bench bulk {next(counter)}"} for _ in range(20)]),
+                     range(3), repeat)
+        await abench("db", "bulk_update (20 items)", size,
+                     lambda _: db.bulk_update([{"task_identifier": title, "updates": {"status": "pending"}}
+                                               for title in picks(20)]), range(3), repeat)
+
+        async def bulk_add_then_delete(_):
+            batch = [f"bench bulk delete {next(counter)}" for _ in range(20)]
+            await db.bulk_add([{"title": title} for title in batch])
+            return await db.bulk_delete(batch)
+
+        await abench("db", "bulk_add + bulk_delete (20 items)", size, bulk_add_then_delete, range(3), repeat)
+        await abench("db", "get_task_summary", size, lambda _: db.get_task_summary(), range(3), repeat)
+        await abench("db", "verify_stats", size, lambda _: db.verify_stats(), range(3), repeat)
+        await abench("db", "rebuild_stats", size, lambda _: db.rebuild_stats(), range(3), repeat)
+        with quiet():
+            await db.disconnect()
+        task_matcher.index.clear()
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous_path: str):
+    """Median ratios against an earlier results file (>1 is slower now)."""
+    with open(previous_path) as previous_file:
+        previous = {(entry["group"], entry["name"], entry["size"]): entry
+                    for entry in json.load(previous_file)["results"] if "median_us" in entry}
+    print(f"\ncompared with {previous_path}", file=out)
+    for entry in results:
+        before = previous.get((entry["group"], entry["name"], entry["size"]))
+        if before and "median_us" in entry and before["median_us"]:
+            ratio = entry["median_us"] / before["median_us"]
+            print(f"  {entry['name']:42s} {entry['size'] if entry['size'] is not None else '':>7} "
+                  f"{before['median_us']:12.1f} -> {entry['median_us']:12.1f} us  x{ratio:.2f}", file=out)
+
+
+def main():
+    global MAX_SECONDS
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--groups", nargs="+", default=["matcher", "dates", "json", "db"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--db-sizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--queries", type=int, default=20, help="matcher queries per size")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=MAX_SECONDS,
+                        help="time budget per benchmark; slow ones stop early with fewer calls")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default="microbench.json")
+    parser.add_argument("--compare", default=None, help="earlier results file to compare medians with")
+    args = parser.parse_args()
+
+    MAX_SECONDS = args.max_seconds
+    rng = random.Random(args.seed)
+    print(f"  {'benchmark':42s} {'size':>7} {'median us/call':>14} {'min us/call':>14}", file=out)
+    if "matcher" in args.groups:
+        matcher_group(args.sizes, args.queries, args.repeat, rng)
+    if "dates" in args.groups:
+        dates_group(args.repeat)
+    if "json" in args.groups:
+        json_group([size for size in args.sizes if size <= 10000], args.repeat, rng)
+    if "db" in args.groups:
+        asyncio.run(db_group(args.db_sizes, args.repeat, rng))
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": HAS_NUMPY,
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2)
+    print(f"\n{len(results)} results written to {args.output}", file=out)
+    if args.compare:
+        compare(args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark: bytes and JSON encoding time of the progress emits in one turn.
+
+before: every copilotkit_emit_state call sends the whole state (messages aside,
+        which CopilotKit drops) including db_result with its task list
+after:  StateEmitter sends only the fields changed within the node, without
+        db_result.tasks; "throttled" also coalesces emits closer than
+        STATE_EMIT_INTERVAL (the emits of this simulated turn are back to back)
+
+The node-exit syncs CopilotKit sends itself are the same in both cases and not counted.
+
+No database or API key needed.
+
+Usage: python benchmarks/state_emit.py [--tasks 10 100 1000] [--turns 50]
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import asyncio
+import argparse
+from datetime import datetime
+
+# Add the app directory to Python path for imports
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ.setdefault("GOOGLE_API_KEY", "unused")
+
+from utils import state_emitter as emitter_module
+from utils.state_emitter import StateEmitter
+
+sent = []
+
+
+async def record(config, state):
+    start = time.perf_counter()
+    payload = json.dumps(state, default=str)
+    sent.append((len(payload), time.perf_counter() - start))
+
+
+def make_tasks(count: int):
+    now = datetime.now()
+    return [
+        {"_id": uuid.uuid4().hex[:24], "title": f"Task number {i}", "date": now, "priority": "medium",
+         "status": "pending", "created_at": now, "updated_at": now}
+        for i in range(count)
+    ]
+
+
+async def run_turn(emit, tasks, forget=None):
+    """The emit sequence of the analysis, database, response and end nodes for a GET_TASKS turn."""
+    state = {"messages": [], "tool_logs": [], "operation": None, "parameters": None, "db_result": None,
+             "final_response": None, "partial_response": None, "retry_count": 0}
+    steps = iter(range(1, 100))
+
+    def config():
+        return {"configurable": {"thread_id": "bench"}, "metadata": {"langgraph_step": step}}
+
+    step = next(steps)
+    state["tool_logs"].append({"id": "1", "message": "Analyzing your request...", "status": "processing"})
+    await emit(config(), state)
+    state["operation"], state["parameters"] = "GET_TASKS", {"date_range": None}
+    state["tool_logs"][-1].update(status="completed", message="Request analyzed")
+    await emit(config(), state)
+
+    step = next(steps)
+    state["tool_logs"].append({"id": "2", "message": "Executing operation", "status": "processing"})
+    await emit(config(), state)
+    state["db_result"] = {"success": True, "message": f"Retrieved all {len(tasks)} tasks", "tasks": tasks,
+                          "count": len(tasks), "version": 7}
+    state["tool_logs"][-1].update(status="completed", message="Operation completed successfully")
+    await emit(config(), state)
+
+    step = next(steps)
+    state["tool_logs"].append({"id": "3", "message": "Generating response...", "status": "processing"})
+    await emit(config(), state)
+    state["final_response"] = "Here are your tasks"
+    state["tool_logs"][-1].update(status="completed", message="Response generated")
+    await emit(config(), state)
+
+    step = next(steps)
+    state["tool_logs"] = []
+    await emit(config(), state, True)
+    if forget:
+        forget(config())
+
+
+async def measure(label: str, emit, tasks, turns: int, forget=None):
+    sent.clear()
+    for _ in range(turns):
+        await run_turn(emit, tasks, forget)
+    size = sum(item[0] for item in sent) / turns
+    encode_ms = sum(item[1] for item in sent) * 1000 / turns
+    print(f"  {len(tasks):5d} {label:10s} {len(sent) / turns:5.1f} {size:12.0f} {encode_ms:10.3f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--turns", type=int, default=50)
+    args = parser.parse_args()
+
+    emitter_module.copilotkit_emit_state = record
+
+    async def full(config, state, force=False):
+        await record(config, {key: value for key, value in state.items() if key != "messages"})
+
+    print(f"  {'tasks':>5s} {'path':10s} {'emits':>5s} {'bytes/turn':>12s} {'encode ms':>10s}")
+    for count in args.tasks:
+        tasks = make_tasks(count)
+        await measure("before", full, tasks, args.turns)
+        for label, emitter in (("diff", StateEmitter(interval=0)), ("throttled", StateEmitter())):
+            await measure(label, emitter.emit, tasks, args.turns, emitter.forget)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,37 +1,176 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 import uvicorn
 from copilotkit.integrations.fastapi import add_fastapi_endpoint
 from copilotkit import CopilotKitSDK, LangGraphAgent
-from workflow import task_manager_graph
+from utils.metrics import snapshot_all
+from utils.intent_parser import fast_path_stats
+from utils.analysis_cache import analysis_cache
+from utils.checkpointer import process_rss_mb
+from utils.message_history import merge_copilotkit_state
+from utils.llm_model import llm_registry
+from typing import Optional
+import threading
+import asyncio
+import json
 import os
 
-app = FastAPI()
+# The workflow, the database driver and the LLM SDK load on first use or in
+# the background after startup, not at import: /healthz answers as soon as
+# the server is up and /readyz once the warm-up is done.
 
-sdk = CopilotKitSDK(
-    agents=[
-        LangGraphAgent(
-            name="task_manager_agent",
-            description="An agent that can help with task management.",
-            graph=task_manager_graph,
-        ),
-    ]
-)
+
+def get_task_db():
+    """The task database singleton (importing it loads the MongoDB driver)."""
+    from utils.task_database import task_db
+    return task_db
+
+
+# Global CopilotKit agents, built on first use
+_agents = None
+_agents_lock = threading.Lock()
+# The build running in a thread, shared by the warm-up and early requests
+_agents_loading: Optional[asyncio.Future] = None
+
+
+def task_manager_agents(context=None):
+    """The CopilotKit agents; the first call imports and compiles the workflow."""
+    global _agents
+    # One graph (and checkpointer) even when a request races the background warm-up
+    with _agents_lock:
+        if _agents is not None:
+            return _agents
+        from workflow import task_manager_graph
+        _agents = [
+            LangGraphAgent(
+                name="task_manager_agent",
+                description="An agent that can help with task management.",
+                graph=task_manager_graph,
+                copilotkit_config={"merge_state": merge_copilotkit_state},
+            ),
+        ]
+        return _agents
+
+
+async def load_agents():
+    """Build the agents off the event loop; concurrent callers wait for the same build."""
+    global _agents_loading
+    if _agents is not None:
+        return _agents
+    loading = _agents_loading
+    if loading is None or (loading.done() and (loading.cancelled() or loading.exception() is not None)):
+        # First call, or the last build failed: start one
+        loading = _agents_loading = asyncio.ensure_future(asyncio.to_thread(task_manager_agents))
+    # Shielded: a cancelled request must not cancel the build others wait for
+    return await asyncio.shield(loading)
+
+
+async def warm_up():
+    """Load the workflow, open the pooled database client and build the LLM clients."""
+    try:
+        # Imports run off the event loop so /healthz keeps answering
+        await load_agents()
+        await get_task_db().connect()
+        await llm_registry.warm_up()
+    except Exception as e:
+        # Requests connect on their own; /readyz reports the database state
+        print(f"Startup warm-up failed: {str(e)}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up in the background once the server is up, and close the database at shutdown."""
+    app.state.warm_up = asyncio.create_task(warm_up())
+    yield
+    app.state.warm_up.cancel()
+    await get_task_db().disconnect()
+
+
+app = FastAPI(lifespan=lifespan)
+
+sdk = CopilotKitSDK(agents=task_manager_agents)
 
 add_fastapi_endpoint(app, sdk, "/copilotkit")
 
+
+# CopilotKit calls task_manager_agents synchronously on the event loop; while the
+# warm-up is still importing the workflow, wait for it here instead of on its lock
+@app.middleware("http")
+async def agents_ready(request, call_next):
+    if _agents is None and request.url.path.startswith("/copilotkit"):
+        await load_agents()
+    return await call_next(request)
+
 # just a simple health check endpoint
 @app.get("/healthz")
 def health():
     return {"status": "ok"}
 
+# readiness: the database answers a ping through the pool
+@app.get("/readyz")
+async def ready():
+    warm_up_task = getattr(app.state, "warm_up", None)
+    if warm_up_task is not None and not warm_up_task.done():
+        return JSONResponse({"ready": False, "message": "Warming up"}, status_code=503)
+    probe = await get_task_db().ping()
+    return JSONResponse(probe, status_code=200 if probe["ready"] else 503)
+
+# task list snapshot (paged) for clients whose delta version went stale
+@app.get("/tasks")
+async def tasks(page_size: Optional[int] = None, page_token: Optional[str] = None,
+                date_range: Optional[str] = None, priority: Optional[str] = None,
+                status: Optional[str] = None):
+    task_db = get_task_db()
+    await task_db.connect()
+    result = await task_db.get_tasks(date_range, priority, status, page_size=page_size, page_token=page_token)
+    return JSONResponse(jsonable_encoder(result), status_code=200 if result["success"] else 400)
+
+# every task as newline-delimited JSON, streamed straight from the cursor
+@app.get("/tasks/stream")
+async def stream_tasks(date_range: Optional[str] = None, priority: Optional[str] = None,
+                       status: Optional[str] = None):
+    task_db = get_task_db()
+    await task_db.connect()
+    
+    async def lines():
+        async for task in task_db.iter_tasks(date_range, priority, status):
+            yield json.dumps(task, default=str) + "\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+def checkpointer_stats():
+    checkpointer = task_manager_agents()[0].graph.checkpointer
+    if hasattr(checkpointer, "stats"):
+        return checkpointer.stats()
+    return {"type": type(checkpointer).__name__, "rss_mb": process_rss_mb()}
+
+@app.get("/metrics")
+def metrics():
+    return {
+        "mongo_pool": get_task_db().pool_stats(),
+        **snapshot_all(),
+        "fast_path": fast_path_stats(),
+        "analysis_cache": analysis_cache.stats(),
+        "checkpointer": checkpointer_stats(),
+        "llm_clients": llm_registry.stats()
+    }
+
 def main():
-    """Run the uvicorn server."""
+    """Run the uvicorn server: one reloading process in development, SERVER_WORKERS processes in production."""
     port = int(os.getenv("PORT", "8000"))
-    uvicorn.run(
-        "main:app",
-        port=port,
-        reload=True,
-    )
+    host = os.getenv("HOST", "127.0.0.1")
+    if os.getenv("APP_ENV", "development").lower() != "production":
+        uvicorn.run("main:app", host=host, port=port, reload=True)
+        return
+
+    workers = max(1, int(os.getenv("SERVER_WORKERS", "1")))
+    if workers > 1 and os.getenv("CHECKPOINTER", "bounded").lower() != "sqlite":
+        # Consecutive turns of a conversation may land on different workers
+        print(f"SERVER_WORKERS={workers}: using the shared SQLite checkpointer (CHECKPOINTER=sqlite)")
+        os.environ["CHECKPOINTER"] = "sqlite"
+    uvicorn.run("main:app", host=host, port=port, workers=workers)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,121 @@
+"""
+Maintenance commands for the task database.
+
+Usage:
+    python manage.py stats verify    # compare materialized task stats with a recount
+    python manage.py stats rebuild   # recount and store them (repairs drift)
+    python manage.py indexes         # create the declared task indexes and list them
+    python manage.py plans           # explain() every query shape, fail on COLLSCAN or unexplained
+
+`plans` seeds a scratch database (--db, default "task_manager_plans") and drops
+it afterwards unless --keep is given.
+"""
+
+import os
+import sys
+import json
+import random
+import asyncio
+import argparse
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from utils.task_database import task_db, title_search_fields
+from utils.query_plans import check_query_plans
+
+
+async def stats_command(action: str) -> int:
+    await task_db.connect()
+    try:
+        if action == "rebuild":
+            result = await task_db.rebuild_stats()
+        else:
+            result = await task_db.verify_stats()
+        print(result["message"])
+        for drift in result.get("drift", []):
+            print(json.dumps(drift))
+        return 0 if result["success"] else 1
+    finally:
+        await task_db.disconnect()
+
+
+async def indexes_command() -> int:
+    await task_db.connect()
+    try:
+        await task_db.ensure_indexes()
+        async for index in task_db.collection.list_indexes():
+            print(f"{index['name']}: {dict(index['key'])}")
+        return 0
+    finally:
+        await task_db.disconnect()
+
+
+async def seed_tasks(count: int):
+    words = "buy call email write review plan pay milk report dentist invoice budget meeting client taxes".split()
+    now = datetime.now()
+    tasks = []
+    for _ in range(count):
+        title = " ".join(random.sample(words, random.randint(2, 4)))
+        tasks.append({
+            "title": title,
+            "date": now + timedelta(days=random.randint(-30, 30)),
+            "priority": random.choice(["high", "medium", "low"]),
+            "status": random.choice(["pending", "completed"]),
+            "created_at": now,
+            "updated_at": now,
+            **title_search_fields(title)
+        })
+    await task_db.collection.insert_many(tasks)
+
+
+async def scratch_query_plans(database: str, keep: bool, seed: int) -> List[Dict[str, Any]]:
+    """Seed a scratch database and explain every query shape against it (also run by tests/test_query_plans.py)"""
+    # connect() reads the database name, point it at the scratch one first
+    os.environ["MONGODB_DB"] = database
+    await task_db.connect()
+    try:
+        await seed_tasks(seed)
+        return await check_query_plans(task_db)
+    finally:
+        if not keep:
+            await task_db.client.drop_database(database)
+        await task_db.disconnect()
+
+
+async def plans_command(database: str, keep: bool, seed: int) -> int:
+    results = await scratch_query_plans(database, keep, seed)
+    for result in results:
+        status = "ok  " if result["ok"] else "FAIL"
+        note = " (full scan by design)" if result["collscan"] and result["ok"] else ""
+        print(f"{status} {result['name']}: {result['error'] or ', '.join(result['stages'])}{note}")
+    failures = [result for result in results if not result["ok"]]
+    print(f"{len(results) - len(failures)}/{len(results)} query shapes pass")
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Task database maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+    stats = commands.add_parser("stats", help="materialized task statistics")
+    stats.add_argument("action", choices=["verify", "rebuild"])
+    commands.add_parser("indexes", help="create the declared task indexes")
+    plans = commands.add_parser("plans", help="check query plans for collection scans")
+    plans.add_argument("--db", default="task_manager_plans", help="scratch database to seed and explain against")
+    plans.add_argument("--keep", action="store_true", help="keep the scratch database afterwards")
+    plans.add_argument("--seed", type=int, default=500, help="tasks to seed")
+    args = parser.parse_args()
+
+    if args.command == "stats":
+        sys.exit(asyncio.run(stats_command(args.action)))
+    if args.command == "indexes":
+        sys.exit(asyncio.run(indexes_command()))
+    if args.command == "plans":
+        sys.exit(asyncio.run(plans_command(args.db, args.keep, args.seed)))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,40 @@
 
 import sys
 import os
+import time
 import uuid
+from typing import Dict, Any, Optional, Tuple
 from langchain_core.runnables import RunnableConfig
 from langchain_core.messages import HumanMessage
 from langgraph.types import Command
-from copilotkit.langgraph import copilotkit_emit_state
+from copilotkit.langgraph import copilotkit_customize_config
 
 # Add the app directory to Python path for imports
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from nodes.state import TaskManagerState
+from utils.state_emitter import emit_state
 from utils.llm_model import get_llm_model
 from utils.prompts import TASK_ANALYSIS_PROMPT
 from utils.json_parser import parse_json_response
+from utils.intent_parser import try_fast_path
+from utils.analysis_cache import analysis_cache
+from utils.metrics import get_metrics
+from utils.prefetch import prefetcher, needs_working_set, thread_key
+
+metrics = get_metrics("analysis")
+
+
+def unpack_analysis(analysis: Dict[str, Any]) -> Tuple[Optional[str], Dict[str, Any]]:
+    """(operation, parameters) from the analysis JSON; several operations become one MULTI_OPERATION"""
+    operations = [op for op in analysis.get("operations") or [] if isinstance(op, dict) and op.get("operation")]
+    if len(operations) > 1:
+        return "MULTI_OPERATION", {"operations": [
+            {"operation": op["operation"], "parameters": op.get("parameters") or {}} for op in operations
+        ]}
+    if operations:
+        analysis = operations[0]
+    return analysis.get("operation"), analysis.get("parameters", {})
 
 
 async def task_analysis_node(state: TaskManagerState, config: RunnableConfig) -> Command:
@@ -37,44 +58,69 @@ async def task_analysis_node(state: TaskManagerState, config: RunnableConfig) ->
         "status": "processing"
     })
     print("analyzing user request...")
-    await copilotkit_emit_state(config, state)
+    # Warm the task working set while the analysis runs; cancelled below if not needed
+    prefetch_key = thread_key(config)
+    prefetcher.start(prefetch_key)
+    await emit_state(config, state)
     
     try:
         # Get the user message
         user_message = state["messages"][-1].content if state["messages"] else ""
         print("user message:", user_message)
         
-        print("initiating LLM analysis...")
-        
-        # Use LLM to analyze the request
-        model = get_llm_model(temperature=0.1)
-        print("llm model initialized")
-        
-        analysis_prompt = f"{TASK_ANALYSIS_PROMPT}\n\nUser message: {user_message}"
-        print("analysis prompt prepared")
-        
-        response = await model.ainvoke([HumanMessage(content=analysis_prompt)], config)
-        print("LLM analysis response:", response.content)
-        
-        # Parse the JSON response
-        analysis = parse_json_response(response.content)
-        operation = analysis.get("operation")
-        parameters = analysis.get("parameters", {})
+        # Deterministic fast path for common commands, then cached LLM results, then the LLM
+        fast_path = try_fast_path(user_message)
+        cached = None if fast_path else analysis_cache.get(user_message)
+        if fast_path:
+            operation = fast_path["operation"]
+            parameters = fast_path["parameters"]
+            metrics.incr("fast_path")
+            print(f"fast path matched {operation} (confidence {fast_path['confidence']:.2f})")
+        elif cached:
+            operation = cached.get("operation")
+            parameters = cached.get("parameters", {})
+            metrics.incr("cache")
+            print(f"analysis cache hit: {operation}")
+        else:
+            print("initiating LLM analysis...")
+            
+            # Use LLM to analyze the request
+            model = get_llm_model(temperature=0.1)
+            print("llm model initialized")
+            
+            analysis_prompt = f"{TASK_ANALYSIS_PROMPT}\n\nUser message: {user_message}"
+            print("analysis prompt prepared")
+            
+            start = time.perf_counter()
+            # The analysis JSON is internal: don't stream it into the chat
+            analysis_config = copilotkit_customize_config(config, emit_messages=False)
+            response = await model.ainvoke([HumanMessage(content=analysis_prompt)], analysis_config)
+            metrics.observe("llm_ms", (time.perf_counter() - start) * 1000)
+            metrics.incr("llm")
+            print("LLM analysis response:", response.content)
+            
+            # Parse the JSON response
+            analysis = parse_json_response(response.content)
+            operation, parameters = unpack_analysis(analysis)
+            analysis_cache.put(user_message, {"operation": operation, "parameters": parameters})
         
         # Update state
         state["operation"] = operation
         state["parameters"] = parameters
+        if not needs_working_set(operation, parameters):
+            prefetcher.cancel(prefetch_key)
         
         # Update log
         state["tool_logs"][-1]["status"] = "completed"
         state["tool_logs"][-1]["message"] = "Request analyzed"
         print("completed analysis")
-        await copilotkit_emit_state(config, state)
+        await emit_state(config, state)
         
         return Command(goto="database_operation_node", update=state)
         
     except Exception as e:
         print(f"Task analysis failed: {str(e)}")
+        prefetcher.cancel(prefetch_key)
         
         # Set default values to allow workflow to continue
         state["operation"] = "UNKNOWN"
@@ -83,7 +129,7 @@ async def task_analysis_node(state: TaskManagerState, config: RunnableConfig) ->
         # Update log
         state["tool_logs"][-1]["status"] = "failed"
         state["tool_logs"][-1]["message"] = f"Analysis failed: {str(e)}"
-        await copilotkit_emit_state(config, state)
+        await emit_state(config, state)
         
         # Continue to next node instead of raising error
         print("Continuing workflow with default values after analysis failure")
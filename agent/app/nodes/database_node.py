@@ -1,12 +1,16 @@
 """Database operation node for the workflow."""
 
 import uuid
+import asyncio
+from typing import Dict, Any, List, Optional
 from langchain_core.runnables import RunnableConfig
 from langgraph.types import Command
-from copilotkit.langgraph import copilotkit_emit_state
 
 from nodes.state import TaskManagerState
+from utils.state_emitter import emit_state
 from utils.task_database import task_db
+from utils.operation_plan import plan_stages
+from utils.prefetch import prefetcher, thread_key
 
 
 async def database_operation_node(state: TaskManagerState, config: RunnableConfig) -> Command:
@@ -22,61 +26,21 @@ async def database_operation_node(state: TaskManagerState, config: RunnableConfi
         "status": "processing"
     })
     print(f"executing operation: {operation}")
-    await copilotkit_emit_state(config, state)
+    await emit_state(config, state)
     
     try:
-        # Connect to database
+        # Reuse the shared pooled client opened at startup (no-op when already connected)
         await task_db.connect()
         
-        # Execute operation based on type
-        if operation == "ADD_TASK":
-            result = await task_db.add_task(
-                title=parameters.get("title", "Untitled Task"),
-                date=parameters.get("date"),
-                priority=parameters.get("priority", "medium"),
-                status=parameters.get("status", "pending")
-            )
-        elif operation == "GET_TASKS":
-            result = await task_db.get_tasks(
-                date_range=parameters.get("date_range"),
-                priority_filter=parameters.get("priority_filter"),
-                status_filter=parameters.get("status_filter")
-            )
-        elif operation == "UPDATE_TASK":
-            result = await task_db.update_task(
-                task_identifier=parameters.get("task_identifier", ""),
-                updates=parameters.get("updates", {})
-            )
-        elif operation == "DELETE_TASK":
-            result = await task_db.delete_task(
-                task_identifier=parameters.get("task_identifier", "")
-            )
-        elif operation == "MARK_DONE":
-            result = await task_db.mark_done(
-                task_identifier=parameters.get("task_identifier", "")
-            )
-        elif operation == "PRIORITIZE":
-            result = await task_db.set_priority(
-                task_identifier=parameters.get("task_identifier", ""),
-                priority=parameters.get("priority", "medium")
-            )
-        elif operation == "SUMMARIZE_TASKS":
-            result = await task_db.get_task_summary(
-                filter_criteria=parameters.get("filter_criteria", {})
-            )
-        elif operation == "UNKNOWN":
-            # Handle analysis failures gracefully
-            error_msg = parameters.get("error_message", "Request could not be analyzed")
-            result = {
-                "success": False,
-                "message": f"Unable to process request: {error_msg}",
-                "error_type": "analysis_failure"
-            }
+        # Pick up the working set prefetched during analysis
+        saved_ms = await prefetcher.claim(thread_key(config))
+        if saved_ms is not None:
+            print(f"prefetch saved {saved_ms:.1f} ms")
+        
+        if operation == "MULTI_OPERATION":
+            result = await execute_operations(parameters.get("operations", []))
         else:
-            result = {
-                "success": False,
-                "message": f"Unknown operation: {operation}"
-            }
+            result = await execute_operation(operation, parameters)
         
         state["db_result"] = result
         
@@ -92,10 +56,7 @@ async def database_operation_node(state: TaskManagerState, config: RunnableConfi
             print("message:", result.get("message", "Operation failed"))
             print("operation failed")
         
-        await copilotkit_emit_state(config, state)
-        
-        # Disconnect from database
-        await task_db.disconnect()
+        await emit_state(config, state)
         
         return Command(goto="response_generation_node", update=state)
         
@@ -112,14 +73,127 @@ async def database_operation_node(state: TaskManagerState, config: RunnableConfi
         # Update log
         state["tool_logs"][-1]["status"] = "failed"
         state["tool_logs"][-1]["message"] = f"Database operation failed: {str(e)}"
-        await copilotkit_emit_state(config, state)
-        
-        # Ensure database is disconnected
-        try:
-            await task_db.disconnect()
-        except Exception as disconnect_error:
-            print(f"Failed to disconnect database: {str(disconnect_error)}")
+        await emit_state(config, state)
         
         # Continue to next node instead of raising error
         print("Continuing workflow with error result after database failure")
-        return Command(goto="response_generation_node", update=state)
\ No newline at end of file
+        return Command(goto="response_generation_node", update=state)
+
+
+async def execute_operation(operation: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a single analyzed operation against the task database"""
+    parameters = parameters or {}
+    if operation == "ADD_TASK":
+        result = await task_db.add_task(
+            title=parameters.get("title", "Untitled Task"),
+            date=parameters.get("date"),
+            priority=parameters.get("priority", "medium"),
+            status=parameters.get("status", "pending")
+        )
+    elif operation == "GET_TASKS":
+        result = await task_db.get_tasks(
+            date_range=parameters.get("date_range"),
+            priority_filter=parameters.get("priority_filter"),
+            status_filter=parameters.get("status_filter")
+        )
+    elif operation == "UPDATE_TASK":
+        result = await task_db.update_task(
+            task_identifier=parameters.get("task_identifier", ""),
+            updates=parameters.get("updates", {})
+        )
+    elif operation == "DELETE_TASK":
+        result = await task_db.delete_task(
+            task_identifier=parameters.get("task_identifier", "")
+        )
+    elif operation == "MARK_DONE":
+        result = await task_db.mark_done(
+            task_identifier=parameters.get("task_identifier", "")
+        )
+    elif operation == "PRIORITIZE":
+        result = await task_db.set_priority(
+            task_identifier=parameters.get("task_identifier", ""),
+            priority=parameters.get("priority", "medium")
+        )
+    elif operation == "BULK_ADD":
+        result = await task_db.bulk_add(parameters.get("items", []))
+    elif operation == "BULK_UPDATE":
+        result = await task_db.bulk_update(parameters.get("items", []))
+    elif operation == "BULK_DELETE":
+        result = await task_db.bulk_delete(parameters.get("items", []))
+    elif operation == "SUMMARIZE_TASKS":
+        result = await task_db.get_task_summary(
+            filter_criteria=parameters.get("filter_criteria", {})
+        )
+    elif operation == "UNKNOWN":
+        # Handle analysis failures gracefully
+        error_msg = parameters.get("error_message", "Request could not be analyzed")
+        result = {
+            "success": False,
+            "message": f"Unable to process request: {error_msg}",
+            "error_type": "analysis_failure"
+        }
+    else:
+        result = {
+            "success": False,
+            "message": f"Unknown operation: {operation}"
+        }
+    return result
+
+
+async def execute_operations(operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Run the operations of a multi-intent turn: each stage of plan_stages
+    concurrently with asyncio.gather, stages in order. Returns one combined result.
+    """
+    if not operations:
+        return {
+            "success": False,
+            "message": "No operations to run"
+        }
+    
+    results: List[Optional[Dict[str, Any]]] = [None] * len(operations)
+    for stage in plan_stages(operations):
+        outcomes = await asyncio.gather(
+            *(execute_operation(operations[i].get("operation", "UNKNOWN"), operations[i].get("parameters"))
+              for i in stage),
+            return_exceptions=True
+        )
+        for i, outcome in zip(stage, outcomes):
+            if isinstance(outcome, BaseException):
+                print(f"Operation {operations[i].get('operation')} failed: {str(outcome)}")
+                outcome = {
+                    "success": False,
+                    "message": f"Database error: {str(outcome)}",
+                    "error_type": "database_failure"
+                }
+            results[i] = outcome
+    
+    combined: Dict[str, Any] = {
+        "success": any(result.get("success") for result in results),
+        "message": "; ".join(result.get("message", "") for result in results),
+        "operations": [
+            {"operation": op.get("operation"), "parameters": op.get("parameters"), "result": result}
+            for op, result in zip(operations, results)
+        ]
+    }
+    if all(result.get("error_type") == "database_failure" for result in results):
+        combined["error_type"] = "database_failure"
+    
+    # A listing that ran after every write already shows them; otherwise pass the versioned deltas on
+    changes = []
+    listing = None
+    for op, result in zip(operations, results):
+        if not result.get("success"):
+            continue
+        if op.get("operation") == "GET_TASKS":
+            listing = result
+        elif result.get("changes") or result.get("change"):
+            changes += result.get("changes") or [result["change"]]
+            listing = None
+    if listing:
+        combined["tasks"] = listing["tasks"]
+        combined["version"] = listing.get("version")
+        combined["filter"] = listing.get("filter")
+    elif changes:
+        combined["changes"] = sorted(changes, key=lambda change: change["version"])
+    return combined
@@ -3,9 +3,10 @@
 from langchain_core.runnables import RunnableConfig
 from langgraph.types import Command
 from langgraph.graph import END
-from copilotkit.langgraph import copilotkit_emit_state
 
 from nodes.state import TaskManagerState
+from utils.state_emitter import emit_state, state_emitter
+from utils.message_history import compact_history
 
 
 async def end_node(state: TaskManagerState, config: RunnableConfig) -> Command:
@@ -14,7 +15,13 @@ async def end_node(state: TaskManagerState, config: RunnableConfig) -> Command:
     try:
         # Clear tool logs
         state["tool_logs"] = []
-        await copilotkit_emit_state(config, state)
+        await emit_state(config, state, force=True)
+        state_emitter.forget(config)
+        
+        # Keep the checkpointed history at a constant size
+        compacted = compact_history(state["messages"])
+        if compacted is not None:
+            state["messages"] = compacted
         
         return Command(goto=END, update=state)
     
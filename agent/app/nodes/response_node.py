@@ -1,14 +1,24 @@
 """Response generation node for the workflow."""
 
+import os
+import time
 import uuid
 from typing import Dict, Any
 from langchain_core.runnables import RunnableConfig
 from langchain_core.messages import AIMessage
 from langgraph.types import Command
-from copilotkit.langgraph import copilotkit_emit_state
 
 from nodes.state import TaskManagerState
-from utils.response_helpers import generate_task_summary_response, generate_standard_response
+from utils.state_emitter import emit_state
+from utils.response_helpers import (
+    generate_task_summary_response,
+    generate_standard_response,
+    render_template_response,
+    resolve_response_mode
+)
+
+# Minimum seconds between partial-response state emits while streaming
+STREAM_EMIT_INTERVAL = float(os.getenv("RESPONSE_STREAM_EMIT_INTERVAL", "0.1"))
 
 
 async def response_generation_node(state: TaskManagerState, config: RunnableConfig) -> Command:
@@ -20,31 +30,47 @@ async def response_generation_node(state: TaskManagerState, config: RunnableConf
         "message": "Generating response...",
         "status": "processing"
     })
-    await copilotkit_emit_state(config, state)
+    await emit_state(config, state)
     
     try:
         result = state["db_result"]
         operation = state["operation"]
         
+        response_mode = resolve_response_mode(state, config)
+        last_emit = 0.0
+        
+        async def emit_partial(text: str):
+            # Push streamed text to the frontend, throttled to one emit per interval
+            nonlocal last_emit
+            now = time.monotonic()
+            if now - last_emit >= STREAM_EMIT_INTERVAL:
+                last_emit = now
+                state["partial_response"] = text
+                await emit_state(config, state)
+        
         if operation == "SUMMARIZE_TASKS" and result.get("success"):
             # Use special summarization prompt for task summaries
             summary_data = result.get("summary", {})
-            response = await generate_task_summary_response(summary_data, config)
-        else:
+            response = await generate_task_summary_response(summary_data, config, emit_partial)
+        elif response_mode == "llm":
             # Generate standard response
-            response = await generate_standard_response(operation, result, config)
+            response = await generate_standard_response(operation, result, config, emit_partial)
+        else:
+            # Deterministic template, no LLM round trip
+            response = render_template_response(operation, result)
         
         state["final_response"] = response
+        state["partial_response"] = None
         
         # Update log
         state["tool_logs"][-1]["status"] = "completed"
         state["tool_logs"][-1]["message"] = "Response generated"
         print("completed")
         print("response generated")
-        await copilotkit_emit_state(config, state)
+        await emit_state(config, state)
         
         # Add AI message to conversation
-        ai_message = AIMessage(content=response)
+        ai_message = AIMessage(content=response, id=str(uuid.uuid4()))
         state["messages"].append(ai_message)
         return Command(goto="end_node", update=state)
         
@@ -62,14 +88,15 @@ async def response_generation_node(state: TaskManagerState, config: RunnableConf
             fallback_response = f"I processed your {operation.lower().replace('_', ' ')} request, but had trouble generating a detailed response. The operation may have completed successfully."
         
         state["final_response"] = fallback_response
+        state["partial_response"] = None
         
         # Update log
         state["tool_logs"][-1]["status"] = "failed"
         state["tool_logs"][-1]["message"] = f"Response generation failed, using fallback: {str(e)}"
-        await copilotkit_emit_state(config, state)
+        await emit_state(config, state)
         
         # Add AI message to conversation with fallback response
-        ai_message = AIMessage(content=fallback_response)
+        ai_message = AIMessage(content=fallback_response, id=str(uuid.uuid4()))
         state["messages"].append(ai_message)
         
         # Continue to end node instead of raising error
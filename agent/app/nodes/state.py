@@ -1,16 +1,20 @@
 """State definition for the task manager agent."""
 
-from typing import Dict, List, Any, Optional
+from typing import Annotated, Dict, List, Any, Optional
 from langchain_core.messages import BaseMessage
+from langgraph.graph.message import add_messages
 from copilotkit import CopilotKitState
 
 
 class TaskManagerState(CopilotKitState):
     """State for the task manager agent"""
-    messages: List[BaseMessage] = []
+    # Merged by message id, so nodes can hand back the whole list (see utils/message_history.py)
+    messages: Annotated[List[BaseMessage], add_messages] = []
     tool_logs: List[Dict[str, Any]] = []
     operation: Optional[str] = None
     parameters: Optional[Dict[str, Any]] = None
     db_result: Optional[Dict[str, Any]] = None
     final_response: Optional[str] = None
+    partial_response: Optional[str] = None
+    response_mode: Optional[str] = None
     retry_count: int = 0
\ No newline at end of file
@@ -1,19 +1,60 @@
-"""Utils module for task manager agent."""
-
-from .json_parser import parse_json_response
-from .response_helpers import generate_task_summary_response, generate_standard_response
-from .workflow_builder import create_task_manager_workflow
-from .date_utils import parse_date, build_date_filter
-from .task_matcher import task_matcher
-from .task_database import task_db
-
-__all__ = [
-    "parse_json_response",
-    "generate_task_summary_response", 
-    "generate_standard_response",
-    "create_task_manager_workflow",
-    "parse_date",
-    "build_date_filter", 
-    "task_matcher",
-    "task_db"
-]
\ No newline at end of file
+"""Utils module for task manager agent.
+
+The exports are imported on first access (PEP 562), so importing one
+submodule (utils.metrics, utils.task_database, ...) does not load the
+workflow, the database driver and the LLM SDK along with it.
+
+`utils.task_matcher` is the matcher instance, as it always was, not the
+submodule of the same name: `import utils.task_matcher as m` also gets the
+instance. Code that needs the module (to patch names in it) takes it with
+importlib.import_module("utils.task_matcher"); mock.patch("utils.task_matcher.x")
+resolves the module the same way.
+"""
+
+import sys
+import types
+import importlib
+
+# Export name -> submodule it lives in
+_EXPORTS = {
+    "parse_json_response": "json_parser",
+    "generate_task_summary_response": "response_helpers",
+    "generate_standard_response": "response_helpers",
+    "render_template_response": "response_helpers",
+    "create_task_manager_workflow": "workflow_builder",
+    "parse_date": "date_utils",
+    "build_date_filter": "date_utils",
+    "task_db": "task_database",
+}
+
+__all__ = [*_EXPORTS, "task_matcher"]
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    # Later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+class _UtilsModule(types.ModuleType):
+    @property
+    def task_matcher(self):
+        # The matcher instance, not the utils.task_matcher submodule of the same name
+        return importlib.import_module(".task_matcher", __name__).task_matcher
+
+    @task_matcher.setter
+    def task_matcher(self, value):
+        # The import system sets the submodule here when it is first imported;
+        # it stays reachable through sys.modules
+        pass
+
+
+sys.modules[__name__].__class__ = _UtilsModule
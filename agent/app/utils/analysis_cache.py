@@ -0,0 +1,113 @@
+"""LRU + TTL cache for task-analysis LLM results keyed on normalized messages."""
+
+import os
+import re
+import copy
+import time
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, Any, Optional
+
+from .metrics import get_metrics
+
+
+# Words that carry no intent; folded away so near-identical requests share an entry
+STOPWORDS = {
+    "a", "an", "the", "my", "me", "please", "can", "could", "would", "will", "you",
+    "i", "hey", "ok", "okay", "just", "is", "are", "pls", "plz", "thanks", "thank"
+}
+
+# Messages or analyses mentioning relative dates are only valid on the day they were cached
+DATE_SENSITIVE = re.compile(
+    r"\b(?:today|tonight|tomorrow|yesterday|now|week|weekend|month|next|this|last|"
+    r"monday|tuesday|wednesday|thursday|friday|saturday|sunday|\d+)\b",
+    re.I
+)
+
+
+def normalize_message(message: str) -> str:
+    """Fold case, punctuation, whitespace and stopwords."""
+    words = re.findall(r"[a-z0-9]+", (message or "").lower())
+    return " ".join(word for word in words if word not in STOPWORDS)
+
+
+class AnalysisCache:
+    """Bounded cache of {operation, parameters} results with TTL and day-based invalidation."""
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 3600):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.metrics = get_metrics("analysis_cache")
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, message: str) -> Optional[Dict[str, Any]]:
+        """Cached analysis for the message, or None on a miss."""
+        if not self.enabled:
+            return None
+        key = normalize_message(message)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.metrics.incr("misses")
+                return None
+            if time.monotonic() - entry["stored_at"] > self.ttl_seconds:
+                del self._entries[key]
+                self.metrics.incr("evictions_ttl")
+                self.metrics.incr("misses")
+                return None
+            if entry["day"] is not None and entry["day"] != date.today():
+                del self._entries[key]
+                self.metrics.incr("evictions_date")
+                self.metrics.incr("misses")
+                return None
+            self._entries.move_to_end(key)
+            self.metrics.incr("hits")
+            # Callers mutate parameters downstream, never hand out the cached object
+            return copy.deepcopy(entry["analysis"])
+
+    def put(self, message: str, analysis: Dict[str, Any]):
+        """Store a successful analysis."""
+        if not self.enabled or not analysis.get("operation") or analysis.get("operation") == "UNKNOWN":
+            return
+        key = normalize_message(message)
+        if not key:
+            return
+        date_sensitive = bool(DATE_SENSITIVE.search(message or "")) or \
+            bool(DATE_SENSITIVE.search(str(analysis.get("parameters", ""))))
+        with self._lock:
+            self._entries[key] = {
+                "analysis": copy.deepcopy(analysis),
+                "stored_at": time.monotonic(),
+                "day": date.today() if date_sensitive else None
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.metrics.incr("evictions_lru")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.metrics.snapshot()
+        lookups = stats.get("hits", 0) + stats.get("misses", 0)
+        stats["hit_rate"] = round(stats.get("hits", 0) / lookups, 3) if lookups else 0.0
+        with self._lock:
+            stats["size"] = len(self._entries)
+        stats["max_size"] = self.max_size
+        stats["ttl_seconds"] = self.ttl_seconds
+        return stats
+
+
+# Global analysis cache instance
+analysis_cache = AnalysisCache(
+    max_size=int(os.getenv("ANALYSIS_CACHE_SIZE", "1024")),
+    ttl_seconds=float(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", "3600"))
+)
@@ -0,0 +1,486 @@
+"""Bounded conversation checkpointer for the compiled workflow.
+
+MemorySaver keeps every checkpoint of every thread for the life of the process.
+BoundedMemorySaver keeps the same in-memory layout with three limits:
+
+- only the latest `keep_checkpoints` checkpoints per thread (and their writes
+  and channel blobs) survive a put,
+- at most `max_threads` threads stay in memory; the least recently used one
+  is evicted,
+- with a `spill_path`, evicted threads are written to a local SQLite file and
+  restored on their next access; rows idle longer than `spill_ttl_hours` are
+  dropped and the file is vacuumed every `compact_every` spills.
+
+Without a spill path an evicted thread starts over on its next turn. With one,
+the async methods run in a thread, since any call can spill, restore or vacuum.
+
+SharedSqliteSaver keeps no thread in memory between calls: every read loads
+the thread from a SQLite file in WAL mode and every write runs as one
+BEGIN IMMEDIATE transaction, so several worker processes can serve turns of
+the same conversation. Its async methods always run in a thread, so a worker
+waiting on another worker's write lock keeps serving other requests.
+"""
+
+import os
+import asyncio
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Any, Optional, Set, Tuple, Iterator, List
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from .metrics import get_metrics
+
+metrics = get_metrics("checkpointer")
+
+
+def process_rss_mb() -> Optional[float]:
+    """Current resident set size of this process (Linux), None elsewhere."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return round(int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20, 1)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class SpillStore:
+    """thread_id -> pickled thread checkpoints, in one SQLite table."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS threads (thread_id TEXT PRIMARY KEY, data BLOB, spilled_at REAL)"
+        )
+        self._conn.commit()
+
+    def save(self, thread_id: str, data: Dict[str, Any]):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO threads VALUES (?, ?, ?)",
+            (thread_id, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL), time.time())
+        )
+        self._conn.commit()
+
+    def pop(self, thread_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute("SELECT data FROM threads WHERE thread_id = ?", (thread_id,)).fetchone()
+        if row is None:
+            return None
+        self._conn.execute("DELETE FROM threads WHERE thread_id = ?", (thread_id,))
+        self._conn.commit()
+        return pickle.loads(row[0])
+
+    def delete(self, thread_id: str):
+        self._conn.execute("DELETE FROM threads WHERE thread_id = ?", (thread_id,))
+        self._conn.commit()
+
+    def compact(self, ttl_seconds: Optional[float]) -> int:
+        """Drop rows idle longer than the TTL and give the space back; returns rows dropped."""
+        dropped = 0
+        if ttl_seconds:
+            dropped = self._conn.execute(
+                "DELETE FROM threads WHERE spilled_at < ?", (time.time() - ttl_seconds,)
+            ).rowcount
+            self._conn.commit()
+        self._conn.execute("VACUUM")
+        return dropped
+
+    def stats(self) -> Dict[str, Any]:
+        count, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM threads").fetchone()
+        return {"threads": count, "bytes": size}
+
+    def close(self):
+        self._conn.close()
+
+
+class BoundedMemorySaver(InMemorySaver):
+    """InMemorySaver with per-thread checkpoint pruning, LRU thread eviction and optional SQLite spill."""
+
+    def __init__(self, max_threads: int = 1000, keep_checkpoints: int = 5,
+                 spill_path: Optional[str] = None, spill_ttl_hours: Optional[float] = None,
+                 compact_every: int = 1000, **kwargs):
+        super().__init__(**kwargs)
+        self.max_threads = max(1, max_threads)
+        self.keep_checkpoints = max(1, keep_checkpoints)
+        self.spill = SpillStore(spill_path) if spill_path else None
+        self.spill_ttl_seconds = spill_ttl_hours * 3600 if spill_ttl_hours else None
+        self.compact_every = compact_every
+        self._lock = threading.RLock()
+        # Least recently used thread first
+        self._threads: "OrderedDict[str, None]" = OrderedDict()
+        # (thread, ns) -> checkpoint id -> channel versions, to know which blobs a checkpoint uses
+        self._versions: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {}
+        # (thread, ns) -> (channel, version) of every stored blob
+        self._blob_keys: Dict[Tuple[str, str], Set[Tuple[str, Any]]] = {}
+        self._spills_since_compact = 0
+
+    def get_tuple(self, config):
+        with self._lock:
+            self._touch(config["configurable"]["thread_id"])
+            return super().get_tuple(config)
+
+    def list(self, config, *, filter=None, before=None, limit=None) -> Iterator:
+        """Checkpoints of one thread (restored from the spill store if needed) or of every in-memory thread."""
+        with self._lock:
+            if config:
+                self._touch(config["configurable"]["thread_id"])
+            items = list(super().list(config, filter=filter, before=before, limit=limit))
+        yield from items
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        with self._lock:
+            thread_id = config["configurable"]["thread_id"]
+            checkpoint_ns = config["configurable"]["checkpoint_ns"]
+            self._touch(thread_id)
+            saved = super().put(config, checkpoint, metadata, new_versions)
+            self._versions.setdefault((thread_id, checkpoint_ns), {})[checkpoint["id"]] = dict(
+                checkpoint["channel_versions"]
+            )
+            self._blob_keys.setdefault((thread_id, checkpoint_ns), set()).update(new_versions.items())
+            self._prune(thread_id, checkpoint_ns)
+            return saved
+
+    def put_writes(self, config, writes, task_id, task_path: str = ""):
+        with self._lock:
+            self._touch(config["configurable"]["thread_id"])
+            return super().put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id: str):
+        with self._lock:
+            self._drop_from_memory(thread_id)
+            if self.spill:
+                self.spill.delete(thread_id)
+
+    def _blocking_io(self) -> bool:
+        """Whether calls can do SQLite I/O (spill, restore, vacuum) under the lock."""
+        return self.spill is not None
+
+    # InMemorySaver's async methods call the sync ones on the event loop; when a call
+    # can touch SQLite these run it in a thread instead, so the lock wait, the spill
+    # I/O and a compaction's VACUUM do not block the loop
+
+    async def _call(self, method, *args):
+        if not self._blocking_io():
+            return method(*args)
+        return await asyncio.to_thread(method, *args)
+
+    async def aget_tuple(self, config):
+        return await self._call(self.get_tuple, config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        items = await self._call(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await self._call(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path: str = ""):
+        return await self._call(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str):
+        return await self._call(self.delete_thread, thread_id)
+
+    def _touch(self, thread_id: str):
+        """Mark a thread as just used, bringing it back from the spill store first."""
+        if thread_id in self._threads:
+            self._threads.move_to_end(thread_id)
+            return
+        if self.spill:
+            data = self.spill.pop(thread_id)
+            if data:
+                self._restore(thread_id, data)
+                metrics.incr("restores")
+        self._threads[thread_id] = None
+        self._evict_idle(thread_id)
+
+    def _prune(self, thread_id: str, checkpoint_ns: str):
+        """Keep the latest keep_checkpoints checkpoints of a thread namespace, with their writes and blobs."""
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        if len(checkpoints) <= self.keep_checkpoints:
+            return
+        versions = self._versions.get((thread_id, checkpoint_ns), {})
+        # Checkpoint ids sort by creation time
+        for checkpoint_id in sorted(checkpoints)[:-self.keep_checkpoints]:
+            del checkpoints[checkpoint_id]
+            versions.pop(checkpoint_id, None)
+            self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+            metrics.incr("pruned_checkpoints")
+
+        if len(versions) != len(checkpoints):
+            return
+        used = {item for channels in versions.values() for item in channels.items()}
+        blob_keys = self._blob_keys.get((thread_id, checkpoint_ns), set())
+        for channel, version in blob_keys - used:
+            self.blobs.pop((thread_id, checkpoint_ns, channel, version), None)
+        blob_keys &= used
+
+    def _evict_idle(self, current: str):
+        while len(self._threads) > self.max_threads:
+            thread_id = next(iter(self._threads))
+            if thread_id == current:
+                self._threads.move_to_end(thread_id)
+                continue
+            if self.spill and self.storage.get(thread_id):
+                self.spill.save(thread_id, self._snapshot(thread_id))
+                metrics.incr("spills")
+                self._spills_since_compact += 1
+                if self._spills_since_compact >= self.compact_every:
+                    self.compact()
+            self._drop_from_memory(thread_id)
+            metrics.incr("evictions")
+
+    def compact(self) -> int:
+        """Compact the spill store now; returns the number of expired threads dropped."""
+        with self._lock:
+            self._spills_since_compact = 0
+            if not self.spill:
+                return 0
+            dropped = self.spill.compact(self.spill_ttl_seconds)
+            metrics.incr("compactions")
+            metrics.incr("expired_threads", dropped)
+            return dropped
+
+    def _thread_keys(self, thread_id: str):
+        """(write keys, blob keys) of a thread, from the per-thread indexes instead of a scan"""
+        namespaces = self.storage.get(thread_id, {})
+        write_keys = [(thread_id, ns, checkpoint_id) for ns, checkpoints in namespaces.items() for checkpoint_id in checkpoints]
+        blob_keys = [
+            (thread_id, ns, channel, version)
+            for ns in namespaces for channel, version in self._blob_keys.get((thread_id, ns), ())
+        ]
+        return write_keys, blob_keys
+
+    def _snapshot(self, thread_id: str) -> Dict[str, Any]:
+        write_keys, blob_keys = self._thread_keys(thread_id)
+        namespaces = self.storage.get(thread_id, {})
+        return {
+            "storage": {ns: dict(checkpoints) for ns, checkpoints in namespaces.items()},
+            "writes": {key: dict(self.writes[key]) for key in write_keys if key in self.writes},
+            "blobs": {key: self.blobs[key] for key in blob_keys if key in self.blobs},
+            "versions": {ns: self._versions.get((thread_id, ns), {}) for ns in namespaces}
+        }
+
+    def _restore(self, thread_id: str, data: Dict[str, Any]):
+        for ns, checkpoints in data["storage"].items():
+            self.storage[thread_id][ns].update(checkpoints)
+        for key, value in data["writes"].items():
+            self.writes[key].update(value)
+        self.blobs.update(data["blobs"])
+        for key in data["blobs"]:
+            self._blob_keys.setdefault((thread_id, key[1]), set()).add((key[2], key[3]))
+        for ns, versions in data["versions"].items():
+            self._versions[(thread_id, ns)] = versions
+
+    def _drop_from_memory(self, thread_id: str):
+        write_keys, blob_keys = self._thread_keys(thread_id)
+        for key in write_keys:
+            self.writes.pop(key, None)
+        for key in blob_keys:
+            self.blobs.pop(key, None)
+        for ns in self.storage.pop(thread_id, {}):
+            self._versions.pop((thread_id, ns), None)
+            self._blob_keys.pop((thread_id, ns), None)
+        self._threads.pop(thread_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """In-memory footprint, spill store size and process RSS."""
+        with self._lock:
+            checkpoints = sum(len(cps) for namespaces in self.storage.values() for cps in namespaces.values())
+            checkpoint_bytes = sum(
+                len(saved[0][1]) + len(saved[1][1])
+                for namespaces in self.storage.values() for cps in namespaces.values() for saved in cps.values()
+            )
+            blob_bytes = sum(len(value[1]) for value in self.blobs.values())
+            return {
+                "threads": len(self._threads),
+                "max_threads": self.max_threads,
+                "checkpoints": checkpoints,
+                "keep_checkpoints": self.keep_checkpoints,
+                "blobs": len(self.blobs),
+                "writes": sum(len(value) for value in self.writes.values()),
+                "bytes": checkpoint_bytes + blob_bytes,
+                "spill": self.spill.stats() if self.spill else None,
+                "rss_mb": process_rss_mb(),
+                **metrics.snapshot()
+            }
+
+
+class SharedStore:
+    """thread_id -> pickled thread checkpoints in a SQLite file shared by every worker process."""
+
+    def __init__(self, path: str, busy_timeout_seconds: float = 2.0):
+        self.path = path
+        # Autocommit; writes open their own BEGIN IMMEDIATE transaction
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None,
+                                     timeout=busy_timeout_seconds)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints (thread_id TEXT PRIMARY KEY, data BLOB, updated_at REAL)"
+        )
+
+    @contextmanager
+    def transaction(self):
+        """Write transaction; other processes wait at their own BEGIN IMMEDIATE until it ends."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def load(self, thread_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute("SELECT data FROM checkpoints WHERE thread_id = ?", (thread_id,)).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def save(self, thread_id: str, data: Dict[str, Any]):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?)",
+            (thread_id, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL), time.time())
+        )
+
+    def delete(self, thread_id: str):
+        self._conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+
+    def thread_ids(self) -> List[str]:
+        return [row[0] for row in self._conn.execute("SELECT thread_id FROM checkpoints ORDER BY updated_at DESC")]
+
+    def compact(self, ttl_seconds: Optional[float]) -> int:
+        """Drop threads idle longer than the TTL; returns threads dropped."""
+        if not ttl_seconds:
+            return 0
+        dropped = self._conn.execute(
+            "DELETE FROM checkpoints WHERE updated_at < ?", (time.time() - ttl_seconds,)
+        ).rowcount
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return dropped
+
+    def stats(self) -> Dict[str, Any]:
+        count, size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM checkpoints"
+        ).fetchone()
+        return {"path": self.path, "threads": count, "bytes": size}
+
+    def close(self):
+        self._conn.close()
+
+
+class SharedSqliteSaver(BoundedMemorySaver):
+    """Checkpointer shared by worker processes: each call works on one thread loaded from SQLite.
+
+    Reads see the last committed turn of any worker; a put or put_writes loads,
+    updates (pruning to keep_checkpoints) and stores the thread in a single
+    write transaction, so concurrent workers never overwrite each other.
+    """
+
+    def __init__(self, path: str, keep_checkpoints: int = 5, ttl_hours: Optional[float] = None,
+                 busy_timeout_seconds: float = 2.0, **kwargs):
+        super().__init__(max_threads=1, keep_checkpoints=keep_checkpoints, **kwargs)
+        self.store = SharedStore(path, busy_timeout_seconds)
+        self.ttl_seconds = ttl_hours * 3600 if ttl_hours else None
+
+    def get_tuple(self, config):
+        with self._loaded(config["configurable"]["thread_id"]):
+            return super().get_tuple(config)
+
+    def list(self, config, *, filter=None, before=None, limit=None) -> Iterator:
+        """Checkpoints of one thread, or of every stored thread when config is None."""
+        thread_ids = [config["configurable"]["thread_id"]] if config else self.store.thread_ids()
+        items = []
+        for thread_id in thread_ids:
+            with self._loaded(thread_id):
+                items.extend(super().list(config, filter=filter, before=before, limit=limit))
+            if limit and len(items) >= limit:
+                break
+        yield from items[:limit] if limit else items
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        with self._loaded(config["configurable"]["thread_id"], write=True):
+            return super().put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(self, config, writes, task_id, task_path: str = ""):
+        with self._loaded(config["configurable"]["thread_id"], write=True):
+            return super().put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id: str):
+        with self._lock:
+            self._drop_from_memory(thread_id)
+            self.store.delete(thread_id)
+
+    def _blocking_io(self) -> bool:
+        # Every call loads or stores the thread in the shared file
+        return True
+
+    def _touch(self, thread_id: str):
+        # Nothing stays in memory between calls, so there is nothing to evict
+        pass
+
+    @contextmanager
+    def _loaded(self, thread_id: str, write: bool = False):
+        """Hold one thread in memory for the duration of a call, storing it back after a write."""
+        with self._lock, (self.store.transaction() if write else nullcontext()):
+            data = self.store.load(thread_id)
+            if data:
+                self._restore(thread_id, data)
+                metrics.incr("loads")
+            try:
+                yield
+                if write:
+                    self.store.save(thread_id, self._snapshot(thread_id))
+                    metrics.incr("saves")
+            finally:
+                self._drop_from_memory(thread_id)
+        if write and self.ttl_seconds:
+            # Counts writes here; expired threads are dropped every compact_every of them
+            self._spills_since_compact += 1
+            if self._spills_since_compact >= self.compact_every:
+                self.compact()
+
+    def compact(self) -> int:
+        """Drop threads idle longer than the TTL from the shared store."""
+        with self._lock:
+            self._spills_since_compact = 0
+            dropped = self.store.compact(self.ttl_seconds)
+            metrics.incr("compactions")
+            metrics.incr("expired_threads", dropped)
+            return dropped
+
+    def stats(self) -> Dict[str, Any]:
+        """Shared store size and this process's RSS."""
+        return {
+            "type": "sqlite",
+            "keep_checkpoints": self.keep_checkpoints,
+            "store": self.store.stats(),
+            "rss_mb": process_rss_mb(),
+            **metrics.snapshot()
+        }
+
+
+def create_checkpointer():
+    """Checkpointer for the compiled workflow, configured from the environment."""
+    mode = os.getenv("CHECKPOINTER", "bounded").lower()
+    if mode == "memory":
+        return InMemorySaver()
+    if mode == "sqlite":
+        ttl = os.getenv("CHECKPOINT_DB_TTL_HOURS")
+        return SharedSqliteSaver(
+            path=os.getenv("CHECKPOINT_DB_PATH", "checkpoints.sqlite"),
+            keep_checkpoints=int(os.getenv("CHECKPOINT_KEEP", "5")),
+            ttl_hours=float(ttl) if ttl else None,
+            busy_timeout_seconds=float(os.getenv("CHECKPOINT_DB_BUSY_TIMEOUT_SECONDS", "2"))
+        )
+    ttl = os.getenv("CHECKPOINT_SPILL_TTL_HOURS")
+    return BoundedMemorySaver(
+        max_threads=int(os.getenv("CHECKPOINT_MAX_THREADS", "1000")),
+        keep_checkpoints=int(os.getenv("CHECKPOINT_KEEP", "5")),
+        spill_path=os.getenv("CHECKPOINT_SPILL_PATH") or None,
+        spill_ttl_hours=float(ttl) if ttl else None
+    )
@@ -0,0 +1,81 @@
+"""MongoDB connection pool configuration and statistics."""
+
+import os
+import threading
+from typing import Dict, Any
+from pymongo import monitoring
+
+
+def get_pool_options() -> Dict[str, Any]:
+    """
+    Build the client pool options from environment variables.
+    """
+    return {
+        "maxPoolSize": int(os.getenv("MONGODB_MAX_POOL_SIZE", "50")),
+        "minPoolSize": int(os.getenv("MONGODB_MIN_POOL_SIZE", "5")),
+        "maxIdleTimeMS": int(os.getenv("MONGODB_MAX_IDLE_MS", "300000")),
+        "waitQueueTimeoutMS": int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "5000")),
+        "serverSelectionTimeoutMS": int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000")),
+        "connectTimeoutMS": int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "5000")),
+    }
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Collects connection pool counters. Callbacks arrive from driver threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {
+            "pools_created": 0,
+            "pools_cleared": 0,
+            "connections_created": 0,
+            "connections_closed": 0,
+            "checkouts": 0,
+            "checkout_failures": 0,
+            "checkins": 0,
+        }
+
+    def _incr(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
+
+    def pool_created(self, event):
+        self._incr("pools_created")
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._incr("pools_cleared")
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._incr("connections_created")
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._incr("connections_closed")
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._incr("checkout_failures")
+
+    def connection_checked_out(self, event):
+        self._incr("checkouts")
+
+    def connection_checked_in(self, event):
+        self._incr("checkins")
+
+    def snapshot(self) -> Dict[str, int]:
+        """Return a copy of the counters plus derived gauges."""
+        with self._lock:
+            stats = dict(self._counters)
+        stats["open_connections"] = stats["connections_created"] - stats["connections_closed"]
+        stats["in_use"] = stats["checkouts"] - stats["checkins"]
+        return stats
@@ -0,0 +1,202 @@
+"""Title embeddings and an in-memory nearest-neighbour index for semantic task matching.
+
+The default embedder is a signed, hashed bag of word and character n-grams:
+local, deterministic and offline. TASK_EMBEDDER="package.module:factory" plugs in
+any other embedder exposing `name`, `dim` and `embed(texts)`.
+"""
+
+import os
+import re
+import math
+import zlib
+import importlib
+from array import array
+from functools import lru_cache
+from typing import List, Dict, Tuple, Optional, Protocol
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+    HAS_NUMPY = False
+
+WORD_PATTERN = re.compile(r'\w+')
+
+# Function words say nothing about which task is meant; left out unless nothing else remains
+STOPWORDS = {
+    "a", "an", "the", "my", "to", "for", "of", "on", "in", "at", "and", "or", "with",
+    "about", "that", "this", "task", "todo"
+}
+
+
+def _normalize(text: str) -> str:
+    # Same folding as matcher_index.normalize_title (kept local, that module imports this one)
+    return " ".join((text or "").lower().split())
+
+
+class Embedder(Protocol):
+    """Anything that turns titles into fixed-size vectors."""
+
+    name: str
+    dim: int
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        ...
+
+
+class HashedNgramEmbedder:
+    """
+    Feature hashing of content-word unigrams and their character trigrams into
+    `dim` buckets, with a hash-derived sign so collisions cancel out on average.
+    L2-normalized.
+    """
+
+    WORD_WEIGHT = 2.0
+    CHAR_WEIGHT = 1.0
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+        self.name = f"hashed-ngram-{dim}"
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed_one(text) for text in texts]
+
+    def _embed_one(self, text: str) -> List[float]:
+        words = WORD_PATTERN.findall(_normalize(text))
+        words = [word for word in words if word not in STOPWORDS] or words
+        vector = [0.0] * self.dim
+        features = [(f"w:{word}", self.WORD_WEIGHT) for word in words]
+        padded = f" {' '.join(words)} "
+        features += [(f"c:{padded[i:i + 3]}", self.CHAR_WEIGHT) for i in range(len(padded) - 2)]
+        for feature, weight in features:
+            hashed = zlib.crc32(feature.encode())
+            sign = 1.0 if (hashed // self.dim) & 1 else -1.0
+            vector[hashed % self.dim] += sign * weight
+        norm = math.sqrt(sum(value * value for value in vector))
+        return [value / norm for value in vector] if norm else vector
+
+
+def _load_embedder() -> Embedder:
+    spec = os.getenv("TASK_EMBEDDER", "hashed")
+    if spec == "hashed":
+        return HashedNgramEmbedder(int(os.getenv("TASK_EMBEDDING_DIM", "256")))
+    module_name, _, factory = spec.partition(":")
+    return getattr(importlib.import_module(module_name), factory or "get_embedder")()
+
+
+_embedder: Optional[Embedder] = None
+
+
+def get_embedder() -> Embedder:
+    """The configured embedder, created on first use."""
+    global _embedder
+    if _embedder is None:
+        _embedder = _load_embedder()
+    return _embedder
+
+
+@lru_cache(maxsize=4096)
+def _cached_embedding(title: str) -> Tuple[float, ...]:
+    return tuple(get_embedder().embed([title])[0])
+
+
+def embed_title(title: str) -> List[float]:
+    """Embedding of a single normalized title (recent titles are cached, so a write
+    and the matcher index update that follows embed once)."""
+    return list(_cached_embedding(_normalize(title)))
+
+
+def pack_vector(vector: List[float]) -> bytes:
+    """float32 bytes for storage next to the task (BSON binary)."""
+    return array("f", vector).tobytes()
+
+
+def unpack_vector(data: bytes) -> List[float]:
+    vector = array("f")
+    vector.frombytes(bytes(data))
+    return vector.tolist()
+
+
+class EmbeddingIndex:
+    """Exact cosine nearest neighbours over unit vectors, kept current with add/remove."""
+
+    def __init__(self, initial_capacity: int = 1024):
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._capacity = max(1, initial_capacity)
+        self._matrix = None
+        self._vectors: List[List[float]] = []
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def clear(self):
+        self._ids.clear()
+        self._rows.clear()
+        self._matrix = None
+        self._vectors.clear()
+
+    def add(self, task_id: str, vector: List[float]):
+        """Insert or replace the vector for a task."""
+        task_id = str(task_id)
+        if task_id in self._rows:
+            self.remove(task_id)
+        row = len(self._ids)
+        if HAS_NUMPY:
+            if self._matrix is None or self._matrix.shape[1] != len(vector):
+                self._matrix = np.zeros((self._capacity, len(vector)), dtype=np.float32)
+            elif row == self._matrix.shape[0]:
+                grown = np.zeros((row * 2, self._matrix.shape[1]), dtype=np.float32)
+                grown[:row] = self._matrix
+                self._matrix = grown
+            self._matrix[row] = vector
+        else:
+            self._vectors.append(list(vector))
+        self._ids.append(task_id)
+        self._rows[task_id] = row
+
+    def remove(self, task_id: str):
+        """Drop a task's vector, moving the last row into the gap."""
+        row = self._rows.pop(str(task_id), None)
+        if row is None:
+            return
+        last = len(self._ids) - 1
+        if row != last:
+            self._ids[row] = self._ids[last]
+            self._rows[self._ids[row]] = row
+            if HAS_NUMPY:
+                self._matrix[row] = self._matrix[last]
+            else:
+                self._vectors[row] = self._vectors[last]
+        self._ids.pop()
+        if not HAS_NUMPY:
+            self._vectors.pop()
+
+    def scores(self, vector: List[float], task_ids: List[str]) -> List[float]:
+        """Cosine with the stored vector of each listed task (all must be in the index)."""
+        rows = [self._rows[str(task_id)] for task_id in task_ids]
+        if not rows:
+            return []
+        if HAS_NUMPY:
+            return (self._matrix[rows] @ np.asarray(vector, dtype=np.float32)).tolist()
+        return [sum(a * b for a, b in zip(self._vectors[row], vector)) for row in rows]
+
+    def search(self, vector: List[float], limit: int = 5) -> List[Tuple[str, float]]:
+        """Top (task_id, cosine) pairs, best first."""
+        count = len(self._ids)
+        if not count:
+            return []
+        if HAS_NUMPY:
+            scores = self._matrix[:count] @ np.asarray(vector, dtype=np.float32)
+            if count > limit:
+                order = np.argpartition(-scores, limit - 1)[:limit]
+            else:
+                order = np.arange(count)
+            order = order[np.argsort(-scores[order], kind="stable")]
+            return [(self._ids[row], float(scores[row])) for row in order.tolist()]
+        scored = [
+            (self._ids[row], sum(a * b for a, b in zip(stored, vector)))
+            for row, stored in enumerate(self._vectors)
+        ]
+        return sorted(scored, key=lambda item: item[1], reverse=True)[:limit]
@@ -0,0 +1,323 @@
+"""Deterministic fast-path parser for common task commands.
+
+Produces the same {operation, parameters} shape as TASK_ANALYSIS_PROMPT plus a
+confidence score. The analysis node only calls the LLM when no rule matches
+with at least FAST_PATH_MIN_CONFIDENCE.
+"""
+
+import os
+import re
+import time
+from typing import Dict, Any, Optional, Callable, List, Tuple
+
+from .metrics import get_metrics
+
+
+FAST_PATH_MIN_CONFIDENCE = float(os.getenv("FAST_PATH_MIN_CONFIDENCE", "0.85"))
+
+metrics = get_metrics("fast_path")
+
+# Only date phrases that parse_date / build_date_filter understand
+DATE = r"today|tomorrow|yesterday|this week|next week|\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{4}"
+PRIORITY = r"high|medium|low"
+
+# Dates and times the rules do not extract. Left inside a reference or title they mean
+# the message says more than the rules understood ("complete the report by friday",
+# "remind me to call mom tomorrow at 5pm"), so the parse falls back to the LLM
+WEEKDAY = r"(?:mon|tues|wednes|thurs|fri|satur|sun)days?"
+MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*"
+TIME_PHRASE = re.compile(
+    rf"\b(?:{DATE}|{WEEKDAY}|weekend|next month|this month|{MONTH}\s+\d{{1,2}}(?:st|nd|rd|th)?"
+    r"|\d{1,2}(?::\d{2})?\s*(?:am|pm)|\d{1,2}:\d{2}|noon|midnight|tonight"
+    r"|this (?:morning|afternoon|evening)|end of (?:the )?(?:day|week|month)|eod|eow)\b",
+    re.I
+)
+
+# References that only make sense with the conversation, which the LLM sees and the rules do not
+ANAPHORA = re.compile(
+    r"^(?:it|that|this|them|those|these|one|(?:that|this|last|other|same|previous|first)\s+one)$", re.I
+)
+
+POLITE_PREFIX = re.compile(
+    r"^(?:(?:please|hey|ok|okay|can you|could you|would you|i want to|i need to|i'd like to|let's)[\s,]+)+",
+    re.I
+)
+TRAILING_NOISE = re.compile(r"[\s.!?]*(?:,?\s*please)?[\s.!?]*$", re.I)
+
+# Words that suggest more than one intent or a conditional request: leave those to the LLM
+AMBIGUOUS = re.compile(r"\b(?:and|also|then|but|instead|not|don't|dont|unless|except|if|or)\b", re.I)
+BULK = re.compile(r"^(?:all|every|everything|each|tasks?|them)\b", re.I)
+# References to a set of tasks rather than one: plural task nouns, quantifiers, counts and
+# status/priority filters ("delete completed tasks", "drop the last two", "complete both").
+# The matcher would resolve them to a single task, so they go to the LLM as bulk requests
+SET_REFERENCE = re.compile(
+    r"\b(?:tasks|todos|to-dos|items|ones|entries|reminders|duplicates?|both|all|every|each|several|"
+    r"few|some|many|rest|others|oldest|newest|latest|earliest|\d+|two|three|four|five|six|seven|eight|"
+    r"nine|ten|(?:last|first|next|previous)\s+(?:one|\d+)|completed|finished|done|pending|overdue|"
+    r"outstanding|unfinished|incomplete|(?:high|medium|low)[\s-]+priority|priority\s+(?:high|medium|low))\b",
+    re.I
+)
+
+STATUS_WORDS = {
+    "pending": "pending",
+    "open": "pending",
+    "incomplete": "pending",
+    "outstanding": "pending",
+    "unfinished": "pending",
+    "completed": "completed",
+    "done": "completed",
+    "finished": "completed",
+}
+
+LISTING_FILLER = {
+    "show", "list", "get", "view", "display", "see", "what", "whats", "what's", "are", "is",
+    "do", "i", "have", "got", "me", "my", "all", "the", "of", "any", "there", "with", "status",
+    "priority", "due", "for", "on", "from", "tasks", "task", "todos", "todo", "to-dos", "give",
+    "a", "an", "quick", "brief", "summarize", "summarise", "summary", "overview", "recap"
+}
+SUMMARY_WORDS = {"summarize", "summarise", "summary", "overview", "recap"}
+LISTING_VERBS = {"show", "list", "get", "view", "display", "see", "what", "whats", "what's"}
+TASK_NOUNS = {"tasks", "task", "todos", "todo", "to-dos"}
+
+
+def _clean_identifier(text: str) -> Optional[str]:
+    """Strip quotes and filler around a task reference."""
+    text = text.strip().strip("'\"“”‘’").strip()
+    previous = None
+    while previous != text:
+        previous = text
+        text = re.sub(r"^(?:the|my|a|an)\s+", "", text, flags=re.I)
+        text = re.sub(r"^(?:task|todo)\s+", "", text, flags=re.I)
+        text = re.sub(r"^(?:about|called|named|titled|for)\s+", "", text, flags=re.I)
+        text = re.sub(r"\s+task$", "", text, flags=re.I)
+        text = text.strip().strip("'\"“”‘’").strip()
+    return text or None
+
+
+def _reference(text: str) -> Optional[str]:
+    """Cleaned task reference, or None when it is a pronoun ("it", "that one")."""
+    identifier = _clean_identifier(text)
+    if not identifier or ANAPHORA.match(identifier):
+        return None
+    return identifier
+
+
+def _target(text: str) -> Optional[str]:
+    """Task reference of a single-task command, or None for pronouns and sets of tasks."""
+    identifier = _reference(text)
+    if not identifier or BULK.match(identifier) or SET_REFERENCE.search(identifier):
+        return None
+    return identifier
+
+
+def _split_title(title: str) -> Tuple[str, Optional[str], Optional[str]]:
+    """Peel trailing date and priority phrases off a new task title."""
+    date = None
+    priority = None
+    date_suffix = re.compile(rf"[\s,]+(?:due\s+|on\s+|for\s+|by\s+)?(?P<date>{DATE})$", re.I)
+    priority_suffix = re.compile(rf"[\s,]+(?:with\s+)?(?:a\s+)?(?P<priority>{PRIORITY})[\s-]+priority$", re.I)
+    previous = None
+    while previous != title:
+        previous = title
+        match = date_suffix.search(title)
+        if match and date is None:
+            date = match.group("date").lower()
+            title = title[:match.start()]
+        match = priority_suffix.search(title)
+        if match and priority is None:
+            priority = match.group("priority").lower()
+            title = title[:match.start()]
+    return title.strip(), date, priority
+
+
+def _confidence(base: float, *texts: Optional[str]) -> float:
+    """Lower the score when the extracted text looks like it carries more than one request
+    or a date/time the rules did not extract."""
+    for text in texts:
+        if not text:
+            continue
+        if AMBIGUOUS.search(text):
+            return min(base, 0.5)
+        if TIME_PHRASE.search(text):
+            return min(base, 0.6)
+        if len(text.split()) > 10:
+            return min(base, 0.6)
+    return base
+
+
+def _mark_done(match: re.Match) -> Optional[Tuple[Dict[str, Any], float]]:
+    identifier = _target(match.group("id"))
+    if not identifier:
+        return None
+    return {"task_identifier": identifier}, _confidence(0.95, identifier)
+
+
+def _prioritize(match: re.Match) -> Optional[Tuple[Dict[str, Any], float]]:
+    identifier = _target(match.group("id"))
+    if not identifier:
+        return None
+    priority = (match.groupdict().get("priority") or "high").lower()
+    return {"task_identifier": identifier, "priority": priority}, _confidence(0.95, identifier)
+
+
+def _delete(match: re.Match) -> Optional[Tuple[Dict[str, Any], float]]:
+    identifier = _target(match.group("id"))
+    if not identifier:
+        return None
+    return {"task_identifier": identifier}, _confidence(0.95, identifier)
+
+
+def _rename(match: re.Match) -> Optional[Tuple[Dict[str, Any], float]]:
+    identifier = _target(match.group("id"))
+    title = _clean_identifier(match.group("title"))
+    if not identifier or not title:
+        return None
+    return {"task_identifier": identifier, "updates": {"title": title}}, _confidence(0.9, identifier, title)
+
+
+def _reschedule(match: re.Match) -> Optional[Tuple[Dict[str, Any], float]]:
+    identifier = _target(match.group("id"))
+    if not identifier:
+        return None
+    return {
+        "task_identifier": identifier,
+        "updates": {"date": match.group("date").lower()}
+    }, _confidence(0.92, identifier)
+
+
+def _add(match: re.Match) -> Optional[Tuple[Dict[str, Any], float]]:
+    title, date, priority = _split_title(match.group("title"))
+    title = _clean_identifier(title)
+    if not title:
+        return None
+    leading_priority = match.groupdict().get("priority")
+    return {
+        "title": title,
+        "date": date,
+        "priority": (priority or leading_priority or "medium").lower(),
+        "status": "pending"
+    }, _confidence(0.93, title)
+
+
+RULES: List[Tuple[str, re.Pattern, Callable]] = [
+    ("MARK_DONE", re.compile(r"^(?:mark|set|flag)\s+(?P<id>.+?)\s+(?:as\s+|to\s+)?(?:done|completed|complete|finished)$", re.I), _mark_done),
+    ("MARK_DONE", re.compile(r"^(?:complete|finish|check off|tick off)\s+(?P<id>.+)$", re.I), _mark_done),
+    ("MARK_DONE", re.compile(r"^(?P<id>.+?)\s+is\s+(?:done|completed|finished)$", re.I), _mark_done),
+    ("PRIORITIZE", re.compile(
+        rf"^(?:set|make|change|mark)\s+(?:the\s+)?(?:priority\s+(?:of|for)\s+)?(?P<id>.+?)\s+"
+        rf"(?:to\s+|as\s+)?(?:a\s+)?(?:priority\s+)?(?P<priority>{PRIORITY})(?:\s+priority)?$", re.I), _prioritize),
+    ("PRIORITIZE", re.compile(r"^(?:prioritize|prioritise)\s+(?P<id>.+)$", re.I), _prioritize),
+    ("DELETE_TASK", re.compile(r"^(?:delete|remove|cancel|drop|erase|get rid of)\s+(?P<id>.+)$", re.I), _delete),
+    ("UPDATE_TASK", re.compile(r"^rename\s+(?P<id>.+?)\s+to\s+(?P<title>.+)$", re.I), _rename),
+    ("UPDATE_TASK", re.compile(
+        rf"^(?:move|reschedule|postpone|push)\s+(?P<id>.+?)\s+to\s+(?P<date>{DATE})$", re.I), _reschedule),
+    ("ADD_TASK", re.compile(
+        rf"^(?:add|create|make)\s+(?:a\s+|an\s+)?(?:new\s+)?(?:(?P<priority>{PRIORITY})[\s-]+priority\s+)?"
+        rf"(?:task|todo|to-do)(?:\s*:\s*|\s+(?:called|named|titled|to)\s+|\s+)(?P<title>.+)$", re.I), _add),
+    ("ADD_TASK", re.compile(r"^remind me to\s+(?P<title>.+)$", re.I), _add),
+    ("ADD_TASK", re.compile(r"^add\s+(?P<title>.+?)\s+to\s+my\s+(?:tasks|task list|list|to-?do list)$", re.I), _add),
+]
+
+
+def _parse_listing(text: str) -> Optional[Dict[str, Any]]:
+    """GET_TASKS / SUMMARIZE_TASKS: recognised filters plus listing filler and nothing else."""
+    lowered = text.lower()
+    priority = None
+    status = None
+    date_range = None
+
+    match = re.search(rf"\b(?P<priority>{PRIORITY})[\s-]+priority\b|\bpriority\s+(?P<priority2>{PRIORITY})\b", lowered)
+    if match:
+        priority = match.group("priority") or match.group("priority2")
+        lowered = lowered[:match.start()] + " " + lowered[match.end():]
+
+    match = re.search(rf"\b(?P<date>{DATE})\b", lowered)
+    if match:
+        date_range = match.group("date")
+        lowered = lowered[:match.start()] + " " + lowered[match.end():]
+
+    words = re.findall(r"[a-z'\-]+", lowered)
+    remaining = []
+    for word in words:
+        if word in STATUS_WORDS and status is None:
+            status = STATUS_WORDS[word]
+        elif word not in LISTING_FILLER:
+            remaining.append(word)
+
+    word_set = set(words)
+    is_summary = bool(word_set & SUMMARY_WORDS)
+    is_listing = bool(word_set & LISTING_VERBS) and bool(word_set & (TASK_NOUNS | {"have"}))
+    if not (is_summary or is_listing):
+        return None
+
+    confidence = 0.95 if not remaining else 0.6
+    if is_summary:
+        filter_criteria: Dict[str, Any] = {}
+        if date_range:
+            filter_criteria["date_range"] = date_range
+        if priority:
+            filter_criteria["priority"] = priority
+        if status:
+            filter_criteria["status"] = status
+        return {
+            "operation": "SUMMARIZE_TASKS",
+            "parameters": {"filter_criteria": filter_criteria},
+            "confidence": confidence
+        }
+
+    return {
+        "operation": "GET_TASKS",
+        "parameters": {
+            "date_range": date_range,
+            "priority_filter": priority,
+            "status_filter": status
+        },
+        "confidence": confidence
+    }
+
+
+def parse_intent(message: str) -> Optional[Dict[str, Any]]:
+    """
+    Best deterministic parse of a user message.
+    Returns {"operation", "parameters", "confidence"} or None when no rule applies.
+    """
+    text = POLITE_PREFIX.sub("", (message or "").strip())
+    text = TRAILING_NOISE.sub("", text).strip()
+    if not text:
+        return None
+
+    for operation, pattern, build in RULES:
+        match = pattern.match(text)
+        if not match:
+            continue
+        built = build(match)
+        if built:
+            parameters, confidence = built
+            return {"operation": operation, "parameters": parameters, "confidence": confidence}
+
+    return _parse_listing(text)
+
+
+def try_fast_path(message: str) -> Optional[Dict[str, Any]]:
+    """Parse a message and return the result only when it clears the confidence threshold."""
+    start = time.perf_counter()
+    parsed = parse_intent(message)
+    metrics.observe("parse_ms", (time.perf_counter() - start) * 1000)
+    metrics.incr("attempts")
+
+    if parsed and parsed["confidence"] >= FAST_PATH_MIN_CONFIDENCE:
+        metrics.incr("hits")
+        metrics.incr(f"hits_{parsed['operation'].lower()}")
+        return parsed
+
+    metrics.incr("low_confidence" if parsed else "no_match")
+    return None
+
+
+def fast_path_stats() -> Dict[str, Any]:
+    """Counters plus the share of messages the fast path answered."""
+    stats = metrics.snapshot()
+    attempts = stats.get("attempts", 0)
+    stats["hit_rate"] = round(stats.get("hits", 0) / attempts, 3) if attempts else 0.0
+    stats["min_confidence"] = FAST_PATH_MIN_CONFIDENCE
+    return stats
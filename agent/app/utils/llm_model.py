@@ -1,19 +1,160 @@
-"""LLM model initialization and configuration."""
+"""LLM model initialization and configuration.
+
+get_llm_model returns one cached chat model per (model, temperature) from the
+client registry instead of building a new client per call. Every Gemini model
+in the registry uses the gRPC clients (sync and async) of the first one, so
+calls at different temperatures share connections and keep-alive.
+
+LLM_BACKEND=fake serves canned replies (LLM_FAKE_RESPONSES, a JSON list used
+in call order across all temperatures) without network access or API key,
+for tests and benchmarks.
+"""
 
 import os
-from langchain_google_genai import ChatGoogleGenerativeAI
+import json
+import time
+import asyncio
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
 from dotenv import load_dotenv
 
+from .metrics import get_metrics
+
 # Load environment variables
 load_dotenv()
 
+LLM_BACKEND = os.getenv("LLM_BACKEND", "google").lower()
+LLM_MODEL = os.getenv("LLM_MODEL", "gemini-2.5-flash")
+# Startup warm-up: "build" creates the clients, "ping" also sends one tiny request, "off" skips it
+LLM_WARMUP = os.getenv("LLM_WARMUP", "build").lower()
+# Temperatures the workflow uses: analysis, responses and matching
+WARMUP_TEMPERATURES = (0.1, 0.3)
+
+DEFAULT_FAKE_RESPONSES = ['{"operation": "UNKNOWN", "parameters": {}}']
+
+metrics = get_metrics("llm")
+
+
+def _fake_responses() -> List[str]:
+    raw = os.getenv("LLM_FAKE_RESPONSES")
+    if not raw:
+        return list(DEFAULT_FAKE_RESPONSES)
+    responses = json.loads(raw)
+    return [responses] if isinstance(responses, str) else [str(response) for response in responses]
+
+
+class LLMRegistry:
+    """One chat model per (model, temperature), sharing a single transport."""
+
+    def __init__(self, backend: str = LLM_BACKEND, model: str = LLM_MODEL):
+        self.backend = backend
+        self.model = model
+        self._lock = threading.Lock()
+        self._models: Dict[Tuple[str, float], BaseChatModel] = {}
+        # The model whose gRPC clients the others reuse
+        self._transport_owner: Optional[BaseChatModel] = None
+        self._fake: Optional[FakeListChatModel] = None
+
+    def get(self, temperature: float = 0.3, model: Optional[str] = None) -> BaseChatModel:
+        key = (model or self.model, round(float(temperature), 3))
+        with self._lock:
+            llm = self._models.get(key)
+            if llm is None:
+                start = time.perf_counter()
+                llm = self._models[key] = self._build(*key)
+                metrics.incr("clients_built")
+                metrics.observe("build_ms", (time.perf_counter() - start) * 1000)
+            else:
+                metrics.incr("cache_hits")
+            self._share_transport(llm)
+        return llm
+
+    def _build(self, model: str, temperature: float) -> BaseChatModel:
+        if self.backend == "fake":
+            # One reply list for every temperature, so replies follow call order
+            if self._fake is None:
+                self._fake = FakeListChatModel(responses=_fake_responses())
+            return self._fake
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        return ChatGoogleGenerativeAI(
+            model=model,
+            temperature=temperature,
+            google_api_key=os.getenv("GOOGLE_API_KEY"),
+        )
+
+    def _share_transport(self, llm: BaseChatModel):
+        """Point a Gemini model at the owner's gRPC clients (the async one exists once created in a loop)."""
+        if not hasattr(llm, "async_client_running"):
+            return
+        owner = self._transport_owner
+        if owner is None:
+            self._transport_owner = llm
+            return
+        if llm is owner:
+            return
+        if llm.client is not owner.client:
+            llm.client = owner.client
+            metrics.incr("transport_shared")
+        if owner.async_client_running is not None and llm.async_client_running is not owner.async_client_running:
+            llm.async_client_running = owner.async_client_running
+            metrics.incr("async_transport_shared")
+
+    async def warm_up(self, mode: str = LLM_WARMUP):
+        """Build the workflow's models and open the shared async transport before the first request."""
+        if mode == "off":
+            return
+        start = time.perf_counter()
+        # Building a client (and the first SDK import) is slow and synchronous: keep it off the loop
+        models = [await asyncio.to_thread(self.get, temperature) for temperature in WARMUP_TEMPERATURES]
+        owner = self._transport_owner
+        if owner is not None:
+            # Creates the async client inside the running loop, then hands it to the other models
+            owner.async_client
+            with self._lock:
+                for llm in models:
+                    self._share_transport(llm)
+        if mode == "ping":
+            try:
+                await asyncio.wait_for(models[0].ainvoke("ping"), timeout=10)
+            except Exception as e:
+                # Startup goes on; the first request will connect instead
+                metrics.incr("warmup_errors")
+                print(f"LLM warm-up ping failed: {str(e)}")
+        metrics.observe("warmup_ms", (time.perf_counter() - start) * 1000)
+        print(f"LLM clients warmed up ({mode}, {len(self._models)} models, backend {self.backend})")
+
+    def stats(self) -> Dict[str, Any]:
+        """Cached models and how many distinct transports they use."""
+        with self._lock:
+            models = list(self._models.values())
+            return {
+                "backend": self.backend,
+                "models": [f"{name}@{temperature}" for name, temperature in self._models],
+                "transports": len({id(llm.client) for llm in models if hasattr(llm, "client")}),
+                "async_transports": len({
+                    id(llm.async_client_running) for llm in models
+                    if getattr(llm, "async_client_running", None) is not None
+                }),
+                **metrics.snapshot()
+            }
+
+    def clear(self):
+        """Drop the cached models (the next get builds new clients)."""
+        with self._lock:
+            self._models.clear()
+            self._transport_owner = None
+            self._fake = None
+
+
+# Global LLM registry instance
+llm_registry = LLMRegistry()
+
 
-def get_llm_model(temperature: float = 0.3) -> ChatGoogleGenerativeAI:
+def get_llm_model(temperature: float = 0.3) -> BaseChatModel:
     """
-    Create and return a configured LLM model.
+    Return the configured LLM model for a temperature, cached in the registry.
     """
-    return ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash",
-        temperature=temperature,
-        google_api_key=os.getenv("GOOGLE_API_KEY"),
-    )
\ No newline at end of file
+    return llm_registry.get(temperature)
@@ -0,0 +1,269 @@
+"""Inverted token and trigram indexes used to narrow task matching candidates."""
+
+import os
+import re
+from collections import Counter, defaultdict
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+from .ngram_scorer import HAS_NUMPY, NgramScorer
+from .embeddings import EmbeddingIndex, embed_title, get_embedder, unpack_vector
+
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def normalize_title(text: str) -> str:
+    """Lowercase and collapse whitespace."""
+    return " ".join((text or "").lower().split())
+
+
+def tokenize(text: str) -> Set[str]:
+    """Word tokens, matching the keyword strategy of TaskMatcher."""
+    return set(WORD_PATTERN.findall((text or "").lower()))
+
+
+def trigrams(text: str) -> Set[str]:
+    """Character trigrams of the padded, normalized text."""
+    padded = f" {normalize_title(text)} "
+    if len(padded) < 3:
+        return set()
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class MatcherIndex:
+    """
+    Token -> task ids and trigram -> task ids inverted indexes.
+    Built once from the collection and kept current with add/update/remove,
+    so a lookup only touches tasks that share tokens or trigrams with the identifier.
+    """
+
+    # Postings shared by more than this fraction of tasks are skipped when counting
+    # (like stopwords) as long as the identifier has rarer grams to go on.
+    COMMON_FRACTION = 0.1
+    COMMON_MIN_TASKS = 1000
+
+    def __init__(self, max_candidates: int = 25, use_numpy: Optional[bool] = None):
+        self.max_candidates = max_candidates
+        # Trigram scoring runs on the NumPy matrix when available, else on the postings below
+        if use_numpy is None:
+            use_numpy = HAS_NUMPY and os.getenv("MATCHER_NUMPY", "true").lower() == "true"
+        self.scorer = NgramScorer() if use_numpy else None
+        # Title embeddings for the semantic tier of TaskMatcher
+        self.embeddings = EmbeddingIndex()
+        self.ready = False
+        # Collection version the index reflects (see TaskDatabase.get_version)
+        self.version: Optional[int] = None
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._titles: Dict[str, str] = {}
+        self._tokens: Dict[str, Set[str]] = {}
+        self._trigrams: Dict[str, Set[str]] = {}
+        self._by_title: Dict[str, List[str]] = defaultdict(list)
+        self._token_postings: Dict[str, Set[str]] = defaultdict(set)
+        self._trigram_postings: Dict[str, Set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def build(self, tasks: List[Dict[str, Any]], version: Optional[int] = None):
+        """Rebuild the index from a full list of tasks."""
+        self.clear()
+        for task in tasks:
+            self._insert(task)
+        self.version = version
+        self.ready = True
+
+    def clear(self):
+        self.ready = False
+        self.version = None
+        self._tasks.clear()
+        self._titles.clear()
+        self._tokens.clear()
+        self._trigrams.clear()
+        self._by_title.clear()
+        self._token_postings.clear()
+        self._trigram_postings.clear()
+        if self.scorer is not None:
+            self.scorer.clear()
+        self.embeddings.clear()
+
+    def add(self, task: Dict[str, Any]):
+        """Index a newly written task (no-op until the index has been built)."""
+        if self.ready:
+            self._insert(task)
+
+    def update(self, task: Dict[str, Any]):
+        """Re-index a task after its fields changed."""
+        if self.ready:
+            self._delete(str(task["_id"]))
+            self._insert(task)
+
+    def remove(self, task_id: str):
+        """Drop a deleted task from the index."""
+        if self.ready:
+            self._delete(str(task_id))
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        return self._tasks.get(str(task_id))
+
+    def tasks(self) -> List[Dict[str, Any]]:
+        return list(self._tasks.values())
+
+    def indexed_ids(self, tasks: List[Dict[str, Any]]) -> Optional[List[str]]:
+        """Ids of the given tasks when every one is indexed under the same title, else None."""
+        if not self.ready:
+            return None
+        ids = []
+        for task in tasks:
+            task_id = str(task.get("_id"))
+            indexed = self._tasks.get(task_id)
+            if indexed is None or indexed.get("title") != task.get("title"):
+                return None
+            ids.append(task_id)
+        return ids
+
+    def exact_match(self, identifier: str) -> Optional[Dict[str, Any]]:
+        """Task whose normalized title equals the identifier."""
+        ids = self._by_title.get(normalize_title(identifier))
+        return self._tasks[ids[0]] if ids else None
+
+    def candidates(self, identifier: str) -> List[Dict[str, Any]]:
+        """
+        Tasks worth scoring for the identifier: the best trigram (Dice) and
+        token (Jaccard) overlaps, plus any title that contains the identifier.
+        """
+        normalized = normalize_title(identifier)
+        if not normalized:
+            return []
+
+        selected: Dict[str, None] = {}
+
+        if self.scorer is not None:
+            # Dice ranking and substring hits over every title in one vectorized pass
+            for task_id, _ in self.scorer.top(normalized, self.max_candidates):
+                selected[task_id] = None
+        else:
+            self._trigram_candidates(normalized, selected)
+
+        query_tokens = tokenize(normalized)
+        token_counts = self._count(query_tokens, self._token_postings)
+        if token_counts:
+            jaccard = {}
+            for task_id in self._top(token_counts, self.max_candidates * 2):
+                title_tokens = self._tokens[task_id]
+                shared = len(query_tokens & title_tokens)
+                jaccard[task_id] = shared / len(query_tokens | title_tokens)
+            for task_id in self._top(jaccard):
+                selected[task_id] = None
+
+        return [self._tasks[task_id] for task_id in selected]
+
+    def semantic_search(self, vector: List[float], limit: int = 5) -> List[Tuple[Dict[str, Any], float]]:
+        """Nearest tasks to an embedding, as (task, cosine) pairs."""
+        return [(self._tasks[task_id], score) for task_id, score in self.embeddings.search(vector, limit)]
+
+    def semantic_scores(self, vector: List[float], tasks: List[Dict[str, Any]]) -> List[float]:
+        """
+        Cosine of an embedding with each task's title. Tasks indexed under the same
+        title reuse the stored vector; the rest are embedded (and cached) on the spot.
+        """
+        indexed = [
+            str(task.get("_id")) if self._titles.get(str(task.get("_id"))) == normalize_title(task.get("title", "")) else None
+            for task in tasks
+        ]
+        stored = iter(self.embeddings.scores(vector, [task_id for task_id in indexed if task_id is not None]))
+        return [
+            next(stored) if task_id is not None
+            else sum(a * b for a, b in zip(embed_title(task.get("title", "")), vector))
+            for task, task_id in zip(tasks, indexed)
+        ]
+
+    def _trigram_candidates(self, normalized: str, selected: Dict[str, None]):
+        """Pure-Python Dice ranking over the trigram postings."""
+        query_grams = trigrams(normalized)
+        gram_counts = self._count(query_grams, self._trigram_postings)
+        if gram_counts:
+            # Titles sharing under a quarter of the identifier's trigrams cannot reach
+            # the fuzzy thresholds, skip them before scoring
+            min_shared = max(1, len(query_grams) // 4)
+            query_size = len(query_grams)
+            trigram_sets = self._trigrams
+            dice = {
+                task_id: 2 * shared / (query_size + len(trigram_sets[task_id]))
+                for task_id, shared in gram_counts.items()
+                if shared >= min_shared
+            }
+            for task_id in self._top(dice):
+                selected[task_id] = None
+            # Substring hits get the 0.8 boost in fuzzy matching, keep them all
+            needed = len(query_grams) - 2
+            for task_id, shared in gram_counts.items():
+                if shared >= needed and normalized in self._titles[task_id]:
+                    selected[task_id] = None
+
+    def _count(self, keys: Set[str], postings: Dict[str, Set[str]]) -> Counter:
+        lists = [postings[key] for key in keys if key in postings]
+        if not lists:
+            return Counter()
+        if len(self._tasks) >= self.COMMON_MIN_TASKS:
+            limit = len(self._tasks) * self.COMMON_FRACTION
+            rare = [ids for ids in lists if len(ids) <= limit]
+            if rare:
+                lists = rare
+        counts = Counter()
+        for ids in lists:
+            counts.update(ids)
+        return counts
+
+    def _top(self, scores: Dict[str, float], limit: Optional[int] = None) -> List[str]:
+        limit = limit or self.max_candidates
+        if len(scores) <= limit:
+            return list(scores)
+        return sorted(scores, key=scores.get, reverse=True)[:limit]
+
+    def _insert(self, task: Dict[str, Any]):
+        task_id = str(task["_id"])
+        title = normalize_title(task.get("title", ""))
+        stored = task.get("title_embedding")
+        if stored is not None and task.get("embedding_model") == get_embedder().name:
+            vector = unpack_vector(stored)
+        else:
+            vector = embed_title(title)
+        self.embeddings.add(task_id, vector)
+        if stored is not None or "embedding_model" in task:
+            task = {key: value for key, value in task.items() if key not in ("title_embedding", "embedding_model")}
+        self._tasks[task_id] = task
+        self._titles[task_id] = title
+        self._by_title[title].append(task_id)
+        self._tokens[task_id] = tokenize(title)
+        for token in self._tokens[task_id]:
+            self._token_postings[token].add(task_id)
+        if self.scorer is not None:
+            self.scorer.add(task_id, title)
+            return
+        self._trigrams[task_id] = trigrams(title)
+        for gram in self._trigrams[task_id]:
+            self._trigram_postings[gram].add(task_id)
+
+    def _delete(self, task_id: str):
+        if task_id not in self._tasks:
+            return
+        del self._tasks[task_id]
+        self.embeddings.remove(task_id)
+        title = self._titles.pop(task_id)
+        self._by_title[title].remove(task_id)
+        if not self._by_title[title]:
+            del self._by_title[title]
+        for token in self._tokens.pop(task_id):
+            self._discard(self._token_postings, token, task_id)
+        if self.scorer is not None:
+            self.scorer.remove(task_id)
+        for gram in self._trigrams.pop(task_id, ()):
+            self._discard(self._trigram_postings, gram, task_id)
+
+    @staticmethod
+    def _discard(postings: Dict[str, Set[str]], key: str, task_id: str):
+        ids = postings.get(key)
+        if ids is not None:
+            ids.discard(task_id)
+            if not ids:
+                del postings[key]
@@ -0,0 +1,100 @@
+"""Rolling compaction of the conversation history kept in the checkpoint.
+
+The workflow only reads the latest message, but the whole history is
+checkpointed and serialised every turn. At the end of a turn the history is
+cut to the last HISTORY_KEEP_MESSAGES messages; with HISTORY_POLICY=summary
+the older ones are folded into one system message (a few words per message,
+at most HISTORY_SUMMARY_MAX_CHARS, oldest lines dropped first), with "drop"
+they are discarded and "off" keeps everything.
+
+The frontend keeps the full chat and sends it every run, so the CopilotKit
+agent merges it with merge_copilotkit_state, which only takes the messages
+after the newest one the checkpoint still holds.
+"""
+
+import os
+from typing import Dict, Any, List, Optional
+
+from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage, AIMessage, RemoveMessage
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+from .metrics import get_metrics
+
+HISTORY_POLICY = os.getenv("HISTORY_POLICY", "summary").lower()
+HISTORY_KEEP_MESSAGES = max(1, int(os.getenv("HISTORY_KEEP_MESSAGES", "20")))
+HISTORY_SUMMARY_MAX_CHARS = int(os.getenv("HISTORY_SUMMARY_MAX_CHARS", "2000"))
+
+SUMMARY_MESSAGE_ID = "history-summary"
+# Longest excerpt of one folded message
+SUMMARY_LINE_CHARS = 160
+
+metrics = get_metrics("history")
+
+
+def _summary_line(message: BaseMessage) -> str:
+    role = "user" if isinstance(message, HumanMessage) else "assistant" if isinstance(message, AIMessage) else message.type
+    text = " ".join(str(message.content).split())
+    if len(text) > SUMMARY_LINE_CHARS:
+        text = text[:SUMMARY_LINE_CHARS - 3] + "..."
+    return f"- {role}: {text}"
+
+
+def fold_into_summary(summary: Optional[SystemMessage], folded: List[BaseMessage],
+                      max_chars: int = HISTORY_SUMMARY_MAX_CHARS) -> SystemMessage:
+    """The summary message with `folded` added after what it already covers."""
+    count = len(folded)
+    lines = []
+    if summary is not None:
+        count += summary.additional_kwargs.get("folded", 0)
+        lines = str(summary.content).split("\n")[1:]
+    lines += [_summary_line(message) for message in folded]
+
+    # Keep the most recent lines that fit
+    kept, size = [], 0
+    for line in reversed(lines):
+        size += len(line) + 1
+        if size > max_chars:
+            break
+        kept.append(line)
+    header = f"Summary of the {count} earlier messages of this conversation, oldest first:"
+    return SystemMessage(content="\n".join([header, *reversed(kept)]), id=SUMMARY_MESSAGE_ID,
+                         additional_kwargs={"folded": count})
+
+
+def compact_history(messages: List[BaseMessage], keep: int = HISTORY_KEEP_MESSAGES,
+                    policy: str = HISTORY_POLICY) -> Optional[List[BaseMessage]]:
+    """Replacement for state["messages"] when the history is over the limit, None when it is not."""
+    if policy == "off":
+        return None
+    summary = next((message for message in messages if message.id == SUMMARY_MESSAGE_ID), None)
+    history = [message for message in messages if message.id != SUMMARY_MESSAGE_ID]
+    if len(history) <= keep:
+        return None
+
+    folded, kept = history[:-keep], history[-keep:]
+    metrics.incr("compactions")
+    metrics.incr("folded" if policy == "summary" else "dropped", len(folded))
+    head = [fold_into_summary(summary, folded)] if policy == "summary" else []
+    # add_messages replaces the whole list after REMOVE_ALL_MESSAGES
+    return [RemoveMessage(id=REMOVE_ALL_MESSAGES), *head, *kept]
+
+
+def merge_copilotkit_state(*, state: Dict[str, Any], messages: List[BaseMessage],
+                           actions: List[Any], agent_name: str) -> Dict[str, Any]:
+    """CopilotKit merge_state that does not bring folded messages back into the checkpoint."""
+    if messages and isinstance(messages[0], SystemMessage):
+        # The frontend's own system message
+        messages = messages[1:]
+    known = {message.id for message in state.get("messages", [])}
+    newest_known = max((i for i, message in enumerate(messages) if message.id in known), default=None)
+    if newest_known is None:
+        new_messages = [message for message in messages if message.id not in known]
+    else:
+        new_messages = [message for message in messages[newest_known + 1:] if message.id not in known]
+    return {
+        **state,
+        "messages": new_messages,
+        "copilotkit": {
+            "actions": actions
+        }
+    }
@@ -0,0 +1,65 @@
+"""In-process counters and latency statistics reported on /metrics."""
+
+import threading
+from typing import Dict, Any
+
+
+class MetricGroup:
+    """Named counters and latency observations for one component."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._latencies: Dict[str, Dict[str, float]] = {}
+
+    def incr(self, counter: str, amount: int = 1):
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+
+    def observe(self, name: str, value_ms: float):
+        with self._lock:
+            stats = self._latencies.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            stats["count"] += 1
+            stats["total_ms"] += value_ms
+            stats["max_ms"] = max(stats["max_ms"], value_ms)
+
+    def count(self, counter: str) -> int:
+        with self._lock:
+            return self._counters.get(counter, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            result: Dict[str, Any] = dict(self._counters)
+            for name, stats in self._latencies.items():
+                result[name] = {
+                    "count": stats["count"],
+                    "avg_ms": round(stats["total_ms"] / stats["count"], 3) if stats["count"] else 0.0,
+                    "max_ms": round(stats["max_ms"], 3),
+                    "total_ms": round(stats["total_ms"], 3)
+                }
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._latencies.clear()
+
+
+_groups: Dict[str, MetricGroup] = {}
+_groups_lock = threading.Lock()
+
+
+def get_metrics(name: str) -> MetricGroup:
+    """Return the metric group for a component, creating it on first use."""
+    with _groups_lock:
+        if name not in _groups:
+            _groups[name] = MetricGroup(name)
+        return _groups[name]
+
+
+def snapshot_all() -> Dict[str, Any]:
+    """Snapshot of every metric group, keyed by group name."""
+    with _groups_lock:
+        groups = list(_groups.values())
+    return {group.name: group.snapshot() for group in groups}
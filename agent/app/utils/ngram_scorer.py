@@ -0,0 +1,158 @@
+"""NumPy batch scorer: character trigram count matrix over task titles.
+
+Every title is a column of hashed trigram counts. An identifier is scored against
+all rows at once (Dice overlap of the trigram multisets), which narrows the
+candidates that TaskMatcher then rescores exactly with SequenceMatcher. The
+rescored titles keep the 0.7/0.4/0.3 thresholds and the substring boost; a title
+the trigram ranking leaves out is not scored at all.
+
+NumPy is optional (`pip install agent[fast]`); without it HAS_NUMPY is False and
+callers keep their pure-Python paths.
+"""
+
+import zlib
+from typing import List, Dict, Tuple, Iterable, Optional
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+    HAS_NUMPY = False
+
+
+def trigram_counts(text: str, dim: int) -> Dict[int, int]:
+    """Hashed trigram -> count for the padded text."""
+    padded = f" {text} "
+    counts: Dict[int, int] = {}
+    for i in range(len(padded) - 2):
+        column = zlib.crc32(padded[i:i + 3].encode()) % dim
+        counts[column] = counts.get(column, 0) + 1
+    return counts
+
+
+class NgramScorer:
+    """
+    Per-task trigram count matrix kept current with add/remove.
+    Titles and identifiers are expected normalized (see matcher_index.normalize_title).
+    Hash collisions only ever raise the shared count, so the matrix never
+    misses a title that really shares trigrams with the identifier.
+    """
+
+    def __init__(self, dim: int = 1024, initial_capacity: int = 1024):
+        if not HAS_NUMPY:
+            raise RuntimeError("NgramScorer requires numpy")
+        self.dim = dim
+        initial_capacity = max(1, initial_capacity)
+        # Column-major (gram x task) so a query reads one contiguous row per trigram
+        self._matrix = np.zeros((dim, initial_capacity), dtype=np.uint8)
+        self._sizes = np.zeros(initial_capacity, dtype=np.int32)
+        self._ids: List[str] = []
+        self._titles: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def build(self, items: Iterable[Tuple[str, str]]):
+        """Rebuild from (task_id, title) pairs."""
+        self.clear()
+        for task_id, title in items:
+            self.add(task_id, title)
+
+    def clear(self):
+        self._matrix[:] = 0
+        self._sizes[:] = 0
+        self._ids.clear()
+        self._titles.clear()
+        self._rows.clear()
+
+    def add(self, task_id: str, title: str):
+        """Insert or replace the row for a task."""
+        task_id = str(task_id)
+        if task_id in self._rows:
+            self.remove(task_id)
+        row = len(self._ids)
+        if row == self._matrix.shape[1]:
+            self._grow()
+        counts = trigram_counts(title, self.dim)
+        for column, count in counts.items():
+            self._matrix[column, row] = min(count, 255)
+        self._sizes[row] = sum(counts.values())
+        self._ids.append(task_id)
+        self._titles.append(title)
+        self._rows[task_id] = row
+
+    def remove(self, task_id: str):
+        """Drop a task's row, moving the last row into the gap."""
+        row = self._rows.pop(str(task_id), None)
+        if row is None:
+            return
+        last = len(self._ids) - 1
+        if row != last:
+            self._matrix[:, row] = self._matrix[:, last]
+            self._sizes[row] = self._sizes[last]
+            self._ids[row] = self._ids[last]
+            self._titles[row] = self._titles[last]
+            self._rows[self._ids[row]] = row
+        self._matrix[:, last] = 0
+        self._sizes[last] = 0
+        self._ids.pop()
+        self._titles.pop()
+
+    def top(self, identifier: str, limit: int, task_ids: Optional[List[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Best (task_id, dice) pairs by trigram overlap, plus every title that
+        contains or is contained in the identifier (the substring boost cases).
+        `task_ids` restricts the ranking to those (indexed) tasks.
+        """
+        count = len(self._ids)
+        query = trigram_counts(identifier, self.dim)
+        if not count or not query:
+            return []
+
+        columns = np.fromiter(query.keys(), dtype=np.intp, count=len(query))
+        weights = np.fromiter(query.values(), dtype=np.uint8, count=len(query))
+        query_size = int(weights.sum(dtype=np.int32))
+        if task_ids is None:
+            rows = np.arange(count)
+            grams = self._matrix[columns, :count]
+        else:
+            rows = np.fromiter((self._rows[str(task_id)] for task_id in task_ids), dtype=np.intp, count=len(task_ids))
+            if not len(rows):
+                return []
+            grams = self._matrix[np.ix_(columns, rows)]
+        sizes = self._sizes[rows]
+
+        # Only the identifier's columns matter for min(query, title)
+        shared = np.minimum(grams, weights[:, None]).sum(axis=0, dtype=np.int32)
+        dice = 2.0 * shared / (query_size + sizes)
+
+        if len(rows) > limit:
+            order = np.argpartition(-dice, limit - 1)[:limit]
+            order = order[np.argsort(-dice[order], kind="stable")]
+        else:
+            order = np.argsort(-dice, kind="stable")
+        order = order[dice[order] > 0]
+
+        # A substring shares all but the two padded edge trigrams of the shorter side
+        possible = np.flatnonzero((shared >= query_size - 2) | (shared >= sizes - 2))
+        selected: Dict[int, None] = dict.fromkeys(order.tolist())
+        titles = self._titles
+        row_list = rows.tolist()
+        for position in possible.tolist():
+            title = titles[row_list[position]]
+            if title and (identifier in title or title in identifier):
+                selected[position] = None
+
+        ids = self._ids
+        return [(ids[row_list[position]], float(dice[position])) for position in selected]
+
+    def _grow(self):
+        capacity = self._matrix.shape[1] * 2
+        matrix = np.zeros((self.dim, capacity), dtype=np.uint8)
+        matrix[:, :len(self._ids)] = self._matrix[:, :len(self._ids)]
+        sizes = np.zeros(capacity, dtype=np.int32)
+        sizes[:len(self._ids)] = self._sizes[:len(self._ids)]
+        self._matrix = matrix
+        self._sizes = sizes
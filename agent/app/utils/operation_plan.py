@@ -0,0 +1,58 @@
+"""Ordering for multi-intent turns (MULTI_OPERATION).
+
+Operations in one message run in stages: every operation in a stage is
+independent of the others and runs concurrently; a stage starts after the
+previous one finished. An operation depends on an earlier one when
+
+- it reads (GET_TASKS / SUMMARIZE_TASKS) after a write, so the listing shows the change,
+- it writes after a read, so the user sees the list as it was before the change,
+- both write and their task references share a content word (they may
+  resolve to the same task).
+"""
+
+from typing import List, Dict, Any, Set
+
+from .matcher_index import tokenize
+from .embeddings import STOPWORDS
+
+READ_OPERATIONS = {"GET_TASKS", "SUMMARIZE_TASKS"}
+
+
+def operation_targets(operation: str, parameters: Dict[str, Any]) -> Set[str]:
+    """Content words of the task references (identifiers, titles) in a write operation."""
+    parameters = parameters or {}
+    if operation.startswith("BULK_"):
+        items = parameters.get("items") or []
+    else:
+        items = [parameters]
+    targets = set()
+    for item in items:
+        if isinstance(item, str):
+            item = {"task_identifier": item}
+        for field in ("task_identifier", "title"):
+            if item.get(field):
+                targets |= tokenize(str(item[field]))
+        new_title = (item.get("updates") or {}).get("title")
+        if new_title:
+            targets |= tokenize(str(new_title))
+    return targets - STOPWORDS
+
+
+def plan_stages(operations: List[Dict[str, Any]]) -> List[List[int]]:
+    """Positions of the operations grouped into stages, in message order within a stage."""
+    levels: List[int] = []
+    targets = [operation_targets(op.get("operation") or "", op.get("parameters")) for op in operations]
+    for position, op in enumerate(operations):
+        reads = op.get("operation") in READ_OPERATIONS
+        level = 0
+        for earlier in range(position):
+            earlier_reads = operations[earlier].get("operation") in READ_OPERATIONS
+            if reads and earlier_reads:
+                continue
+            if reads != earlier_reads or targets[position] & targets[earlier]:
+                level = max(level, levels[earlier] + 1)
+        levels.append(level)
+    return [
+        [position for position, level in enumerate(levels) if level == stage]
+        for stage in range(max(levels) + 1)
+    ] if levels else []
@@ -0,0 +1,105 @@
+"""Speculative prefetch of the task working set while the analysis LLM call runs.
+
+The analysis node starts a prefetch per conversation thread; it connects the
+pool and warms the matcher index (the lightweight INDEX_PROJECTION read). The
+analysis node cancels it when the operation turns out not to resolve task
+identifiers, and the database node claims it, waiting for whatever is still
+running. `saved_ms` is the prefetch work that overlapped the analysis instead
+of running on the critical path.
+"""
+
+import os
+import time
+import asyncio
+from typing import Dict, Any, Optional, Tuple
+
+from .metrics import get_metrics
+from .task_database import task_db
+
+PREFETCH_ENABLED = os.getenv("TASK_PREFETCH", "true").lower() == "true"
+
+# Operations that resolve task identifiers through the matcher
+MATCHING_OPERATIONS = {"UPDATE_TASK", "DELETE_TASK", "MARK_DONE", "PRIORITIZE", "BULK_UPDATE", "BULK_DELETE"}
+
+metrics = get_metrics("prefetch")
+
+
+def needs_working_set(operation: Optional[str], parameters: Optional[Dict[str, Any]]) -> bool:
+    """Whether the analyzed request will look tasks up by identifier."""
+    if operation == "MULTI_OPERATION":
+        return any(op.get("operation") in MATCHING_OPERATIONS for op in (parameters or {}).get("operations", []))
+    return operation in MATCHING_OPERATIONS
+
+
+async def warm_working_set():
+    """Connect and bring the matcher index up to the current collection version."""
+    await task_db.connect()
+    if task_db.match_source != "server":
+        await task_db.ensure_match_index()
+
+
+class Prefetcher:
+    """One in-flight prefetch per conversation thread."""
+
+    def __init__(self):
+        self._inflight: Dict[str, Tuple[asyncio.Task, Dict[str, float]]] = {}
+
+    def start(self, key: str):
+        """Start warming for a turn; a leftover prefetch of the same thread is cancelled first."""
+        if not PREFETCH_ENABLED:
+            return
+        self.cancel(key, count=False)
+        timing = {"started": time.perf_counter()}
+        task = asyncio.create_task(warm_working_set())
+        task.add_done_callback(lambda done: self._finished(done, timing))
+        self._inflight[key] = (task, timing)
+        metrics.incr("started")
+
+    def cancel(self, key: str, count: bool = True):
+        """Drop the prefetch for a turn that does not need it."""
+        entry = self._inflight.pop(key, None)
+        if not entry:
+            return
+        task, _ = entry
+        if not task.done():
+            task.cancel()
+        if count:
+            metrics.incr("cancelled")
+
+    async def claim(self, key: str) -> Optional[float]:
+        """Wait for the thread's prefetch; returns the critical-path ms it saved, None if there was none."""
+        entry = self._inflight.pop(key, None)
+        if not entry:
+            return None
+        task, timing = entry
+        claimed = time.perf_counter()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return None
+        except Exception as e:
+            # The database node repeats the work itself
+            metrics.incr("errors")
+            print(f"Prefetch failed: {str(e)}")
+            return None
+        finished = timing.get("finished", claimed)
+        saved_ms = (min(finished, claimed) - timing["started"]) * 1000
+        metrics.incr("used")
+        metrics.observe("saved_ms", saved_ms)
+        metrics.observe("wait_ms", max(0.0, finished - claimed) * 1000)
+        return saved_ms
+
+    @staticmethod
+    def _finished(task: asyncio.Task, timing: Dict[str, float]):
+        timing["finished"] = time.perf_counter()
+        if not task.cancelled() and task.exception() is None:
+            metrics.observe("prefetch_ms", (timing["finished"] - timing["started"]) * 1000)
+
+
+def thread_key(config: Optional[Dict[str, Any]]) -> str:
+    """Prefetches are keyed by the conversation thread of the run config."""
+    return str(((config or {}).get("configurable") or {}).get("thread_id", "default"))
+
+
+# Global prefetcher instance
+prefetcher = Prefetcher()
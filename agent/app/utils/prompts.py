@@ -11,6 +11,9 @@ Based on the user's message, classify the request into one of these categories:
 - SUMMARIZE_TASKS: User wants a summary of their tasks
 - MARK_DONE: User wants to mark a task as completed
 - PRIORITIZE: User wants to set/change task priority
+- BULK_ADD: User wants to create several tasks at once
+- BULK_UPDATE: User wants to change several existing tasks at once (including marking several done or reprioritizing several)
+- BULK_DELETE: User wants to remove several tasks at once
 
 For ADD_TASK requests, extract:
 - title (required)
@@ -40,6 +43,18 @@ For PRIORITIZE requests, extract:
 - task_identifier (title or description to find the task)
 - priority (high/medium/low)
 
+For BULK_ADD requests, extract:
+- items: a list with one entry per task, each with the ADD_TASK fields (title, date, priority, status)
+
+For BULK_UPDATE requests, extract:
+- items: a list with one entry per task, each with task_identifier and updates
+  (marking done is {"status": "completed"}, reprioritizing is {"priority": "high/medium/low"})
+
+For BULK_DELETE requests, extract:
+- items: a list with one entry per task, each with task_identifier
+
+Use the BULK_ operations whenever the message names more than one task, and list every task as its own item.
+
 Respond with a JSON object containing:
 {
   "operation": "OPERATION_TYPE",
@@ -47,6 +62,16 @@ Respond with a JSON object containing:
     // extracted parameters based on operation type
   }
 }
+
+If the message asks for several different operations (for example "mark the report done,
+delete the dentist appointment and show me tomorrow's tasks"), respond instead with one entry
+per operation, in the order the user asked for them:
+{
+  "operations": [
+    {"operation": "OPERATION_TYPE", "parameters": {...}},
+    {"operation": "OPERATION_TYPE", "parameters": {...}}
+  ]
+}
 """
 
 TASK_EXECUTOR_PROMPT = """
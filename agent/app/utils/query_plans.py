@@ -0,0 +1,137 @@
+"""explain() checks for the query shapes TaskDatabase sends.
+
+Shapes are built with TaskDatabase's own query helpers, so a new filter or sort
+that the declared TASK_INDEXES do not cover shows up here as a COLLSCAN. A shape
+whose explain() fails or shows no plan stages fails the check as well.
+Run with `python manage.py plans`.
+"""
+
+from datetime import datetime
+from typing import List, Dict, Any, Set
+
+from bson import ObjectId
+
+from .date_utils import build_date_filter
+from .task_database import (
+    TaskDatabase, LISTING_SORT, TASK_PROJECTION, listing_query_key, encode_page_token, decode_page_token
+)
+from .task_stats import STATS_PIPELINE
+
+
+# Listing filter combinations the analysis prompt and fast path can produce
+LISTING_FILTERS = [
+    (None, None, None),
+    ("today", None, None),
+    ("this week", None, None),
+    (None, "high", None),
+    (None, None, "pending"),
+    (None, "high", "pending"),
+    ("today", "high", None),
+    ("tomorrow", None, "completed"),
+    ("next week", "low", "pending"),
+]
+
+# Aggregation summaries only run with filters the stats cannot answer
+SUMMARY_FILTERS = [
+    {"priority": "high"},
+    {"status": "pending"},
+    {"priority": "high", "status": "pending"},
+    {"date_range": "today", "priority": "high"},
+]
+
+
+def query_shapes(db: TaskDatabase) -> List[Dict[str, Any]]:
+    """
+    Every query shape with its name; `full_scan` marks reads of the whole collection
+    by design and `collection: "meta"` shapes run on task_meta.
+    """
+    shapes: List[Dict[str, Any]] = []
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    for date_range, priority, status in LISTING_FILTERS:
+        label = ", ".join(part for part in (date_range, priority, status) if part) or "all"
+        query = db._listing_query(date_range, priority, status)
+        key = listing_query_key(date_range, priority, status)
+        after = decode_page_token(encode_page_token({"date": today, "_id": ObjectId()}, key), key)
+        shapes.append({"name": f"get_tasks [{label}]", "find": query, "sort": LISTING_SORT})
+        shapes.append({
+            "name": f"get_tasks [{label}] next page",
+            "find": {"$and": [query, after]} if query else after,
+            "sort": LISTING_SORT
+        })
+
+    for date_range in (None, "today", "this week"):
+        upcoming, sample = db._summary_queries(build_date_filter(date_range) if date_range else None, today)
+        label = date_range or "all"
+        shapes.append({"name": f"summary upcoming [{label}]", "find": upcoming, "sort": LISTING_SORT})
+        shapes.append({"name": f"summary sample [{label}]", "find": sample, "sort": LISTING_SORT})
+
+    for criteria in SUMMARY_FILTERS:
+        label = ", ".join(f"{key}={value}" for key, value in criteria.items())
+        shapes.append({"name": f"summary aggregate [{label}]", "pipeline": db._summary_pipeline(dict(criteria))})
+    shapes.append({"name": "summary aggregate [no stats]", "pipeline": db._summary_pipeline(None), "full_scan": True})
+
+    for identifier in ("buy milk", "quarterly report for the client"):
+        shapes.append({"name": f"match candidates [{identifier}]", "pipeline": db._candidate_pipeline(identifier)})
+
+    shapes.append({"name": "matcher index build", "find": {}, "full_scan": True})
+    # Connect: once per embedder, behind the task_meta search_fields marker
+    shapes.append({
+        "name": "search fields backfill", "find": db._search_backfill_query(), "projection": {"title": 1},
+        "full_scan": True
+    })
+    # stats rebuild and verify recount every task
+    shapes.append({"name": "stats rebuild", "pipeline": STATS_PIPELINE, "full_scan": True})
+
+    # task_meta {_id: "tasks"}: version, stats and marker reads, and the version-guarded stats write
+    for label, projection in (("version", {"version": 1}), ("stats", {"stats": 1}),
+                              ("search fields marker", {"search_fields": 1})):
+        shapes.append({"name": f"meta {label}", "collection": "meta", "find": {"_id": "tasks"}, "projection": projection})
+    shapes.append({"name": "meta stats rebuild guard", "collection": "meta", "find": {"_id": "tasks", "version": 0}})
+    return shapes
+
+
+def plan_stages(explain: Any, in_plan: bool = False) -> Set[str]:
+    """Stage names inside every winningPlan of an explain() result."""
+    stages: Set[str] = set()
+    if isinstance(explain, dict):
+        if in_plan and isinstance(explain.get("stage"), str):
+            stages.add(explain["stage"])
+        for key, value in explain.items():
+            stages |= plan_stages(value, in_plan or key == "winningPlan")
+    elif isinstance(explain, list):
+        for item in explain:
+            stages |= plan_stages(item, in_plan)
+    return stages
+
+
+async def explain_shape(db: TaskDatabase, shape: Dict[str, Any]) -> Dict[str, Any]:
+    collection = db.meta if shape.get("collection") == "meta" else db.collection
+    if "pipeline" in shape:
+        return await db.db.command("aggregate", collection.name, pipeline=shape["pipeline"], explain=True)
+    cursor = collection.find(shape["find"], shape.get("projection", TASK_PROJECTION))
+    if shape.get("sort"):
+        cursor = cursor.sort(shape["sort"])
+    return await cursor.explain()
+
+
+async def check_query_plans(db: TaskDatabase) -> List[Dict[str, Any]]:
+    """Explain every shape; `ok` is False for an unexpected COLLSCAN or a shape that cannot be explained."""
+    results = []
+    for shape in query_shapes(db):
+        error = None
+        try:
+            stages = plan_stages(await explain_shape(db, shape))
+        except Exception as e:
+            stages, error = set(), f"explain failed: {str(e)}"
+        if not stages and error is None:
+            error = "no plan stages in explain output"
+        collscan = "COLLSCAN" in stages
+        results.append({
+            "name": shape["name"],
+            "stages": sorted(stages),
+            "collscan": collscan,
+            "error": error,
+            "ok": error is None and (not collscan or shape.get("full_scan", False))
+        })
+    return results
@@ -1,19 +1,77 @@
 """Response generation helper functions."""
 
+import os
 import json
-from typing import Dict, Any
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Awaitable
 from langchain_core.runnables import RunnableConfig
 from langchain_core.messages import HumanMessage
 
 from utils.llm_model import get_llm_model
 from utils.prompts import TASK_SUMMARIZER_PROMPT, TASK_EXECUTOR_PROMPT
+from utils.metrics import get_metrics
 
+# "template": deterministic responses, LLM only for summaries; "llm": LLM-written responses
+RESPONSE_MODES = ("template", "llm")
+DEFAULT_RESPONSE_MODE = os.getenv("RESPONSE_MODE", "template").lower()
+TEMPLATE_TASK_LIMIT = int(os.getenv("TEMPLATE_TASK_LIMIT", "20"))
+# Stream LLM responses token by token (astream) instead of waiting for the full completion
+STREAM_RESPONSES = os.getenv("RESPONSE_STREAMING", "true").lower() == "true"
 
-async def generate_task_summary_response(summary_data: Dict[str, Any], config: RunnableConfig) -> str:
+metrics = get_metrics("response")
+
+PartialCallback = Callable[[str], Awaitable[None]]
+
+
+def resolve_response_mode(state: Dict[str, Any], config: Optional[RunnableConfig] = None) -> str:
+    """Per-request mode from the state or run config, else the deployment default"""
+    configurable = (config or {}).get("configurable", {}) or {}
+    for mode in (state.get("response_mode"), configurable.get("response_mode"), DEFAULT_RESPONSE_MODE):
+        if mode and mode.lower() in RESPONSE_MODES:
+            return mode.lower()
+    return "template"
+
+
+def _chunk_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(part if isinstance(part, str) else part.get("text", "") for part in content)
+    return ""
+
+
+async def _complete(prompt: str, config: RunnableConfig, on_partial: Optional[PartialCallback] = None) -> str:
+    """Run the response prompt, streaming partial text to `on_partial` when streaming is enabled"""
+    model = get_llm_model(temperature=0.3)
+    messages = [HumanMessage(content=prompt)]
+    start = time.perf_counter()
+    
+    if not STREAM_RESPONSES:
+        response = await model.ainvoke(messages, config)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        metrics.observe("ttft_ms", elapsed_ms)
+        metrics.observe("llm_ms", elapsed_ms)
+        return response.content.strip()
+    
+    text = ""
+    async for chunk in model.astream(messages, config):
+        piece = _chunk_text(chunk.content)
+        if not piece:
+            continue
+        if not text:
+            metrics.observe("ttft_ms", (time.perf_counter() - start) * 1000)
+        text += piece
+        if on_partial:
+            await on_partial(text)
+    metrics.observe("llm_ms", (time.perf_counter() - start) * 1000)
+    return text.strip()
+
+
+async def generate_task_summary_response(summary_data: Dict[str, Any], config: RunnableConfig,
+                                         on_partial: Optional[PartialCallback] = None) -> str:
     """Generate natural language summary of tasks"""
     try:
-        model = get_llm_model(temperature=0.3)
-        
         summary_prompt = f"""
         {TASK_SUMMARIZER_PROMPT}
         
@@ -23,8 +81,7 @@ async def generate_task_summary_response(summary_data: Dict[str, Any], config: R
         Generate a helpful summary response for the user.
         """
         
-        response = await model.ainvoke([HumanMessage(content=summary_prompt)], config)
-        return response.content.strip()
+        return await _complete(summary_prompt, config, on_partial)
         
     except Exception as e:
         print(f"Failed to generate task summary with LLM: {str(e)}")
@@ -32,11 +89,10 @@ async def generate_task_summary_response(summary_data: Dict[str, Any], config: R
         return _generate_fallback_summary(summary_data)
 
 
-async def generate_standard_response(operation: str, result: Dict[str, Any], config: RunnableConfig) -> str:
+async def generate_standard_response(operation: str, result: Dict[str, Any], config: RunnableConfig,
+                                     on_partial: Optional[PartialCallback] = None) -> str:
     """Generate standard response for non-summary operations"""
     try:
-        model = get_llm_model(temperature=0.3)
-        
         response_prompt = f"""
         {TASK_EXECUTOR_PROMPT}
         
@@ -46,8 +102,7 @@ async def generate_standard_response(operation: str, result: Dict[str, Any], con
         Generate a natural, helpful response for the user.
         """
         
-        response = await model.ainvoke([HumanMessage(content=response_prompt)], config)
-        return response.content.strip()
+        return await _complete(response_prompt, config, on_partial)
         
     except Exception as e:
         print(f"Failed to generate standard response with LLM: {str(e)}")
@@ -59,8 +114,9 @@ def _generate_fallback_summary(summary_data: Dict[str, Any]) -> str:
     """Generate a simple fallback summary when LLM fails"""
     total = summary_data.get("total_tasks", 0)
     pending = summary_data.get("pending_tasks", 0)
-    done = summary_data.get("done_tasks", 0)
+    done = summary_data.get("completed_tasks", summary_data.get("done_tasks", 0))
     high_priority = summary_data.get("high_priority", 0)
+    overdue = summary_data.get("overdue_tasks", 0)
     
     return f"""Here's your task summary:
 
@@ -68,6 +124,7 @@ def _generate_fallback_summary(summary_data: Dict[str, Any]) -> str:
 ✅ **Completed:** {done}
 ⏳ **Pending:** {pending}
 🚨 **High Priority:** {high_priority}
+{f"⚠️ **Overdue:** {overdue}" if overdue > 0 else ""}
 
 {f"You have {pending} pending tasks" if pending > 0 else "All caught up! 🎉"}
 {f" with {high_priority} marked as high priority." if high_priority > 0 else "."}"""
@@ -78,4 +135,92 @@ def _generate_fallback_response(result: Dict[str, Any]) -> str:
     if result.get("success"):
         return result.get("message", "Operation completed successfully!")
     else:
-        return f"Sorry, {result.get('message', 'the operation failed')}."
\ No newline at end of file
+        return f"Sorry, {result.get('message', 'the operation failed')}."
+
+
+def _format_date(value: Any) -> str:
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    if isinstance(value, datetime):
+        return value.strftime("%a %b %d")
+    return ""
+
+
+def _format_task(task: Dict[str, Any]) -> str:
+    details = []
+    date = _format_date(task.get("date"))
+    if date:
+        details.append(f"📅 {date}")
+    if task.get("priority"):
+        details.append(f"{task['priority']} priority")
+    if task.get("status"):
+        details.append(task["status"])
+    suffix = f" — {' · '.join(details)}" if details else ""
+    return f"- **{task.get('title', 'Untitled Task')}**{suffix}"
+
+
+def _format_task_list(tasks: List[Dict[str, Any]]) -> str:
+    lines = [_format_task(task) for task in tasks[:TEMPLATE_TASK_LIMIT]]
+    if len(tasks) > TEMPLATE_TASK_LIMIT:
+        lines.append(f"…and {len(tasks) - TEMPLATE_TASK_LIMIT} more")
+    return "\n".join(lines)
+
+
+def _format_bulk_outcomes(outcomes: List[Dict[str, Any]]) -> str:
+    lines = []
+    for outcome in outcomes[:TEMPLATE_TASK_LIMIT]:
+        if outcome.get("success") and outcome.get("task"):
+            lines.append(f"✅ {_format_task(outcome['task'])[2:]}")
+        else:
+            reason = outcome.get("message", "failed").split("\n")[0]
+            lines.append(f"❌ **{outcome.get('item') or 'Item ' + str(outcome.get('index', 0) + 1)}** — {reason}")
+    if len(outcomes) > TEMPLATE_TASK_LIMIT:
+        lines.append(f"…and {len(outcomes) - TEMPLATE_TASK_LIMIT} more")
+    return "\n".join(lines)
+
+
+def render_template_response(operation: str, result: Dict[str, Any]) -> str:
+    """Deterministic response for an operation result, no LLM call"""
+    if operation == "MULTI_OPERATION" and result.get("operations"):
+        # One section per operation, in the order the user asked for them
+        return "\n\n".join(
+            render_template_response(part.get("operation") or "UNKNOWN", part.get("result") or {})
+            for part in result["operations"]
+        )
+    
+    if not result.get("success"):
+        if result.get("error_type") == "analysis_failure":
+            return ("Sorry, I couldn't work out what you'd like to do. "
+                    "Try something like \"add a task to call mom tomorrow\" or \"show my pending tasks\".")
+        if result.get("results"):
+            return f"Sorry, {result.get('message', 'the operation failed')}:\n\n{_format_bulk_outcomes(result['results'])}"
+        return _generate_fallback_response(result)
+    
+    message = result.get("message", "Operation completed successfully!")
+    
+    if operation == "GET_TASKS":
+        tasks = result.get("tasks", [])
+        if not tasks:
+            return f"{message}."
+        return f"{message}:\n\n{_format_task_list(tasks)}"
+    
+    if operation == "SUMMARIZE_TASKS":
+        return _generate_fallback_summary(result.get("summary", {}))
+    
+    if operation in ["BULK_ADD", "BULK_UPDATE", "BULK_DELETE"]:
+        return f"{message}:\n\n{_format_bulk_outcomes(result.get('results', []))}"
+    
+    task = (result.get("change") or {}).get("task") or result.get("task")
+    if operation == "ADD_TASK" and task:
+        return f"✅ {message}.\n\n{_format_task(task)}"
+    
+    if operation in ["UPDATE_TASK", "MARK_DONE", "PRIORITIZE"] and task:
+        return f"✏️ {message}.\n\n{_format_task(task)}"
+    
+    if operation == "DELETE_TASK":
+        return f"🗑️ {message}."
+    
+    return f"{message}."
@@ -0,0 +1,99 @@
+"""Diff-based, throttled progress emits to CopilotKit.
+
+copilotkit_emit_state sends whatever dict it gets as the agent state, and the
+CopilotKit agent already syncs the full state (task lists included) when each
+node exits. Progress emits inside a node therefore only carry:
+
+- the fields that changed since this node's previous emit,
+- without the bulky task lists in db_result,
+- at most one emit per STATE_EMIT_INTERVAL seconds; a skipped emit's changes
+  go out with the next one (or with the node-exit sync).
+
+The frontend merges these partial states into the state it holds.
+"""
+
+import os
+import copy
+import json
+import time
+from typing import Dict, Any, Optional, Tuple
+
+from copilotkit.langgraph import copilotkit_emit_state
+
+from .metrics import get_metrics
+from .prefetch import thread_key
+
+STATE_EMIT_INTERVAL = float(os.getenv("STATE_EMIT_INTERVAL", "0.05"))
+
+# Never part of a progress emit: messages reach the chat separately
+EXCLUDED_FIELDS = ("messages",)
+# db_result fields left to the node-exit sync
+BULKY_RESULT_FIELDS = ("tasks",)
+
+metrics = get_metrics("emit")
+
+
+def progress_view(state: Dict[str, Any]) -> Dict[str, Any]:
+    """The state as a progress emit sees it: no messages, no task lists in db_result."""
+    view = {key: value for key, value in state.items() if key not in EXCLUDED_FIELDS}
+    result = view.get("db_result")
+    if isinstance(result, dict):
+        result = {key: value for key, value in result.items() if key not in BULKY_RESULT_FIELDS}
+        if result.get("operations"):
+            result["operations"] = [
+                {**part, "result": {key: value for key, value in (part.get("result") or {}).items()
+                                    if key not in BULKY_RESULT_FIELDS}}
+                for part in result["operations"]
+            ]
+        view["db_result"] = result
+    return view
+
+
+class StateEmitter:
+    """Remembers, per conversation thread, what the current node already emitted."""
+
+    def __init__(self, interval: float = STATE_EMIT_INTERVAL):
+        self.interval = interval
+        # thread -> (graph step, fields sent during that step, time of the last emit)
+        self._sent: Dict[str, Tuple[Any, Dict[str, Any], float]] = {}
+
+    async def emit(self, config: Dict[str, Any], state: Dict[str, Any], force: bool = False) -> bool:
+        """Emit the changed progress fields; returns False when nothing was sent."""
+        key = thread_key(config)
+        step = ((config or {}).get("metadata") or {}).get("langgraph_step")
+        sent_step, sent, last_emit = self._sent.get(key, (None, {}, 0.0))
+        if sent_step != step:
+            # New node: the node-exit sync in between may have sent other values
+            sent = {}
+
+        now = time.monotonic()
+        if not force and now - last_emit < self.interval:
+            metrics.incr("coalesced")
+            return False
+
+        view = progress_view(state)
+        changed = {key_: value for key_, value in view.items() if key_ not in sent or sent[key_] != value}
+        if not changed:
+            metrics.incr("unchanged")
+            return False
+
+        sent = {**sent, **copy.deepcopy(changed)}
+        self._sent[key] = (step, sent, now)
+        metrics.incr("emits")
+        metrics.incr("fields", len(changed))
+        metrics.incr("bytes", len(json.dumps(changed, default=str)))
+        await copilotkit_emit_state(config, changed)
+        return True
+
+    def forget(self, config: Optional[Dict[str, Any]]):
+        """Drop a thread's emit history at the end of a turn."""
+        self._sent.pop(thread_key(config), None)
+
+
+# Global state emitter instance
+state_emitter = StateEmitter()
+
+
+async def emit_state(config: Dict[str, Any], state: Dict[str, Any], force: bool = False) -> bool:
+    """Drop-in for copilotkit_emit_state in the workflow nodes."""
+    return await state_emitter.emit(config, state, force)
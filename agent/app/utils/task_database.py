@@ -1,59 +1,622 @@
 import os
-from datetime import datetime
-from typing import Dict, Any, Optional
+import re
+import json
+import time
+import base64
+import asyncio
+import hashlib
+import contextvars
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne, DeleteOne, ReturnDocument, IndexModel, ASCENDING
+from pymongo.errors import DuplicateKeyError, BulkWriteError
 from bson import ObjectId
 from .date_utils import parse_date, build_date_filter
 from .task_matcher import task_matcher
+from .matcher_index import normalize_title, tokenize
+from .embeddings import embed_title, get_embedder, pack_vector
+from .db_pool import PoolStatsListener, get_pool_options
+from .task_stats import (
+    compute_stats, diff_stats, stat_increments, summarize_stats, decremented_days, increment_stage,
+    PRUNE_EMPTY_DAYS, COMPLETED_STATUSES
+)
+from .metrics import get_metrics
+
+metrics = get_metrics("summary")
+index_metrics = get_metrics("match_index")
+
+# A writer that has not finished for this long is taken as crashed: rebuild_stats
+# stops waiting for it and resets the in-flight count
+WRITE_LEASE_SECONDS = 60
+
+# The task write in progress in this asyncio task (see TaskDatabase._task_write)
+_open_write: contextvars.ContextVar[Optional[Dict[str, bool]]] = contextvars.ContextVar("open_write", default=None)
+
+# Fields the matcher needs per task (index entries and server-side candidates)
+MATCH_PROJECTION = {
+    "title": 1,
+    "date": 1,
+    "priority": 1,
+    "status": 1,
+    "created_at": 1,
+    "updated_at": 1
+}
+
+# Index entries also load the stored title embedding instead of recomputing it
+INDEX_PROJECTION = {
+    **MATCH_PROJECTION,
+    "title_embedding": 1,
+    "embedding_model": 1
+}
+
+# Derived search fields stored on each task, hidden from task listings
+TASK_PROJECTION = {
+    "title_normalized": 0,
+    "title_tokens": 0,
+    "title_embedding": 0,
+    "embedding_model": 0
+}
+
+
+def title_search_fields(title: str) -> Dict[str, Any]:
+    """Normalized title and token list for server-side candidate retrieval, plus the title embedding"""
+    return {
+        "title_normalized": normalize_title(title),
+        "title_tokens": sorted(tokenize(title)),
+        "title_embedding": pack_vector(embed_title(title)),
+        "embedding_model": get_embedder().name
+    }
+
+
+# Declared index set, created idempotently at connect (see ensure_indexes).
+# `python manage.py plans` checks every query shape against it with explain().
+TASK_INDEXES = [
+    # listing sort and keyset pagination, date-range filters, summary reads
+    IndexModel([("date", ASCENDING), ("_id", ASCENDING)]),
+    # status (+ priority) filters, sorted or ranged by date
+    IndexModel([("status", ASCENDING), ("priority", ASCENDING), ("date", ASCENDING)]),
+    # priority-only filters
+    IndexModel([("priority", ASCENDING), ("date", ASCENDING)]),
+    # server-side matcher candidates
+    IndexModel([("title_tokens", ASCENDING)]),
+    IndexModel([("title_normalized", ASCENDING)])
+]
+
+# Listing order; keyset pagination continues after the last (date, _id) of a page
+LISTING_SORT = [("date", 1), ("_id", 1)]
+
+
+def listing_query_key(*filters: Optional[str]) -> str:
+    """Short fingerprint of the listing filters, so a token is only reused with its own query"""
+    return hashlib.sha1(repr(filters).encode()).hexdigest()[:10]
+
+
+def encode_page_token(task: Dict[str, Any], query_key: str) -> str:
+    """Opaque continuation token: the sort key of the last task on the page"""
+    date = task.get("date")
+    payload = {
+        "d": date.isoformat() if isinstance(date, datetime) else None,
+        "i": str(task["_id"]),
+        "q": query_key
+    }
+    encoded = base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode())
+    return encoded.decode().rstrip("=")
+
+
+def decode_page_token(token: str, query_key: str) -> Dict[str, Any]:
+    """Keyset condition for the page after the token; ValueError if it is malformed or from another query"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_date = datetime.fromisoformat(payload["d"]) if payload["d"] else None
+        last_id = ObjectId(payload["i"])
+    except Exception:
+        raise ValueError("Invalid page token")
+    if payload.get("q") != query_key:
+        raise ValueError("Page token belongs to a different query")
+    if last_date is None:
+        # Undated tasks sort first: finish them, then every dated task
+        return {"$or": [{"date": None, "_id": {"$gt": last_id}}, {"date": {"$ne": None}}]}
+    return {"$or": [{"date": {"$gt": last_date}}, {"date": last_date, "_id": {"$gt": last_id}}]}
+
 
 class TaskDatabase:
     def __init__(self):
         self.client = None
         self.db = None
         self.collection = None
+        self.meta = None
+        self.pool_listener = PoolStatsListener()
+        self._connect_lock = asyncio.Lock()
+        self._opening: Optional[asyncio.Future] = None
+        self._index_lock = asyncio.Lock()
+        # "index": in-memory matcher index, "server": bounded candidate query per lookup
+        self.match_source = os.getenv("TASK_MATCH_SOURCE", "index").lower()
+        self.candidate_limit = int(os.getenv("TASK_MATCH_CANDIDATES", "25"))
+        # Version bumps kept in the change log the matcher index catches up from
+        self.change_log_size = max(1, int(os.getenv("TASK_CHANGE_LOG_SIZE", "500")))
+        # "delta": mutations return only the change, "snapshot": they also re-read the task list
+        self.result_mode = os.getenv("TASK_RESULT_MODE", "delta").lower()
+        # Bounds on the task lists a summary carries (the counts always cover every match)
+        self.summary_upcoming_limit = int(os.getenv("SUMMARY_UPCOMING_LIMIT", "5"))
+        self.summary_sample_size = int(os.getenv("SUMMARY_SAMPLE_SIZE", "20"))
+        # get_tasks page size (default and upper bound)
+        self.page_size = int(os.getenv("TASK_PAGE_SIZE", "100"))
+        self.max_page_size = int(os.getenv("TASK_PAGE_SIZE_MAX", "1000"))
+        # Most items a single BULK_* operation accepts
+        self.bulk_max_items = int(os.getenv("BULK_MAX_ITEMS", "100"))
+        
+    @property
+    def is_connected(self) -> bool:
+        return self.client is not None
         
     async def connect(self):
-        """Connect to MongoDB"""
+        """
+        Open the shared MongoDB client. Safe to call concurrently; only the first call connects.
+        The setup runs as its own task: a caller cancelled meanwhile (a dropped prefetch)
+        stops waiting, but the setup finishes and the next call waits for the same one.
+        """
+        if self.client is not None:
+            return
+        async with self._connect_lock:
+            if self.client is not None:
+                return
+            if self._opening is None or self._opening.done():
+                self._opening = asyncio.ensure_future(self._open())
+            await asyncio.shield(self._opening)
+    
+    async def _open(self):
+        """Create the client and prepare the collection; the client is published last"""
         mongo_url = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
-        self.client = AsyncIOMotorClient(mongo_url)
-        self.db = self.client.task_manager
+        client = AsyncIOMotorClient(
+            mongo_url,
+            event_listeners=[self.pool_listener],
+            **get_pool_options()
+        )
+        self.db = client[os.getenv("MONGODB_DB", "task_manager")]
         self.collection = self.db.tasks
+        self.meta = self.db.task_meta
+        await self.ensure_indexes()
+        await self._ensure_search_fields()
+        await self._ensure_stats()
+        self.client = client
+    
+    async def ensure_indexes(self) -> List[str]:
+        """Create the declared TASK_INDEXES; existing ones are left as they are"""
+        try:
+            return await self.collection.create_indexes(TASK_INDEXES)
+        except Exception as e:
+            print(f"Failed to create task indexes: {str(e)}")
+            return []
+    
+    def _search_backfill_query(self) -> Dict[str, Any]:
+        """Tasks missing the title search fields, or embedded under a different embedder"""
+        return {"$or": [
+            {"title_tokens": {"$exists": False}},
+            {"embedding_model": {"$ne": get_embedder().name}}
+        ]}
+    
+    async def _ensure_search_fields(self):
+        """
+        Backfill the title search fields on tasks written before they existed.
+        Runs once per embedder: task_meta records the embedder the collection was
+        last backfilled for, so later connects skip the scan.
+        """
+        try:
+            embedder = get_embedder().name
+            meta = await self.meta.find_one({"_id": "tasks"}, {"search_fields": 1})
+            if (meta or {}).get("search_fields") == embedder:
+                return
+            cursor = self.collection.find(self._search_backfill_query(), {"title": 1})
+            operations = [
+                UpdateOne({"_id": task["_id"]}, {"$set": title_search_fields(task.get("title", ""))})
+                async for task in cursor
+            ]
+            if operations:
+                await self.collection.bulk_write(operations, ordered=False)
+                print(f"backfilled title search fields on {len(operations)} tasks")
+            # Every write since stores the fields itself
+            await self.meta.update_one(
+                {"_id": "tasks"},
+                {"$set": {"search_fields": embedder}, "$setOnInsert": {"version": 0}},
+                upsert=True
+            )
+        except Exception as e:
+            print(f"Failed to prepare title search fields: {str(e)}")
         
     async def disconnect(self):
-        """Disconnect from MongoDB"""
-        if self.client:
-            self.client.close()
+        """Close the shared MongoDB client (called once at shutdown)"""
+        async with self._connect_lock:
+            if self._opening is not None and not self._opening.done():
+                await asyncio.shield(self._opening)
+            if self.client:
+                self.client.close()
+            self.client = None
+            self.db = None
+            self.collection = None
+            self.meta = None
+            task_matcher.index.clear()
     
-    async def add_task(self, title: str, date: Optional[str] = None, 
-                      priority: str = "medium", status: str = "pending") -> Dict[str, Any]:
-        """Add a new task"""
+    async def ping(self) -> Dict[str, Any]:
+        """Readiness probe: round trip to the server through the pool"""
+        if self.client is None:
+            return {"ready": False, "message": "Database client not connected"}
         try:
-            if date:
-                task_date = parse_date(date)
-            else:
-                task_date = datetime.now()
-            
-            task = {
-                "title": title,
-                "date": task_date,
-                "priority": priority.lower(),
-                "status": status.lower(),
-                "created_at": datetime.now(),
-                "updated_at": datetime.now()
+            start = time.perf_counter()
+            await self.client.admin.command("ping")
+            return {
+                "ready": True,
+                "latency_ms": round((time.perf_counter() - start) * 1000, 2)
             }
-            
-            result = await self.collection.insert_one(task)
-            task["_id"] = str(result.inserted_id)
-            
-            # Get all tasks after adding to show updated list
+        except Exception as e:
+            return {"ready": False, "message": str(e)}
+    
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection pool counters and configured limits"""
+        return {
+            "connected": self.is_connected,
+            "options": get_pool_options(),
+            **self.pool_listener.snapshot()
+        }
+    
+    async def get_version(self) -> int:
+        """Current collection version; every task write increments it"""
+        meta = await self.meta.find_one({"_id": "tasks"}, {"version": 1})
+        return meta.get("version", 0) if meta else 0
+    
+    @asynccontextmanager
+    async def _task_write(self):
+        """
+        Mark a task write as in flight until its version bump (or until it fails).
+        A single write costs three round trips: this mark, the task write and
+        _bump_version. The last two are separate writes, so rebuild_stats does not
+        store a recount while any write is in flight: the recount could include the
+        task and then get its increments too.
+        """
+        await self.meta.update_one(
+            {"_id": "tasks"},
+            {"$inc": {"writes_in_flight": 1}, "$max": {"last_write_at": datetime.now()}},
+            upsert=True
+        )
+        state = {"ended": False}
+        token = _open_write.set(state)
+        try:
+            yield
+        finally:
+            _open_write.reset(token)
+            if not state["ended"]:
+                await self.meta.update_one({"_id": "tasks"}, {"$inc": {"writes_in_flight": -1}})
+    
+    async def _bump_version(self, increments: Optional[Dict[str, int]] = None,
+                            changed_ids: Optional[List[Any]] = None) -> int:
+        """
+        Bump the version in one atomic pipeline update that also applies the task
+        stats increments, ends the in-flight mark of the surrounding _task_write,
+        appends the written task ids to the change log (one entry per bump, so the
+        last entry is the current version's) and drops emptied day buckets.
+        """
+        increments = dict(increments or {})
+        state = _open_write.get()
+        if state is not None and not state["ended"]:
+            increments["writes_in_flight"] = -1
+            state["ended"] = True
+        entry = [str(task_id) for task_id in changed_ids or []]
+        pipeline = [{"$set": {
+            "version": {"$add": [{"$ifNull": ["$version", 0]}, 1]},
+            **increment_stage(increments),
+            "changes": {"$slice": [
+                {"$concatArrays": [{"$ifNull": ["$changes", []]}, {"$literal": [entry]}]},
+                -self.change_log_size
+            ]}
+        }}]
+        if decremented_days(increments):
+            pipeline.append(PRUNE_EMPTY_DAYS)
+        meta = await self.meta.find_one_and_update(
+            {"_id": "tasks"},
+            pipeline,
+            projection={"version": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return meta["version"]
+    
+    async def _ensure_stats(self):
+        """Build the materialized stats once for collections that predate them"""
+        try:
+            meta = await self.meta.find_one({"_id": "tasks"}, {"stats.built_at": 1})
+            if not ((meta or {}).get("stats") or {}).get("built_at"):
+                result = await self.rebuild_stats()
+                print(result["message"])
+        except Exception as e:
+            print(f"Failed to prepare task stats: {str(e)}")
+    
+    async def rebuild_stats(self, attempts: int = 5) -> Dict[str, Any]:
+        """
+        Recount the stats from the tasks and store them, but only if no write
+        moved the version while counting and no task write is waiting for its
+        version bump (retried otherwise). Writers idle past WRITE_LEASE_SECONDS
+        count as crashed and their in-flight marks are cleared.
+        """
+        for attempt in range(attempts):
+            if attempt:
+                await asyncio.sleep(0.05 * attempt)
+            version = await self.get_version()
+            stats = await compute_stats(self.collection)
+            stats["built_at"] = datetime.now()
+            lease_expired = datetime.now() - timedelta(seconds=WRITE_LEASE_SECONDS)
+            try:
+                result = await self.meta.update_one(
+                    {"_id": "tasks", "version": version, "$or": [
+                        {"writes_in_flight": {"$not": {"$gt": 0}}},
+                        {"last_write_at": {"$lt": lease_expired}}
+                    ]},
+                    {"$set": {"stats": stats, "version": version, "writes_in_flight": 0}},
+                    upsert=True
+                )
+            except DuplicateKeyError:
+                continue
+            if result.matched_count or result.upserted_id is not None:
+                return {
+                    "success": True,
+                    "message": f"Rebuilt task stats at version {version} ({stats['counts'].get('total_tasks', 0)} tasks)",
+                    "version": version
+                }
+        return {
+            "success": False,
+            "message": f"Task stats rebuild kept racing with writes after {attempts} attempts"
+        }
+    
+    async def verify_stats(self) -> Dict[str, Any]:
+        """Compare the stored stats with a fresh count; lists every drifted counter"""
+        version = await self.get_version()
+        meta = await self.meta.find_one({"_id": "tasks"}, {"stats": 1})
+        computed = await compute_stats(self.collection)
+        drift = diff_stats((meta or {}).get("stats"), computed)
+        if await self.get_version() != version:
+            return {"success": False, "message": "Tasks changed while verifying, run it again"}
+        return {
+            "success": not drift,
+            "message": f"{len(drift)} drifted counters at version {version}" if drift else f"Task stats match at version {version}",
+            "drift": [{"path": path, "stored": stored, "actual": actual} for path, stored, actual in drift]
+        }
+    
+    async def ensure_match_index(self):
+        """
+        Build the matcher index from the collection. When other writers moved the
+        version on, re-read only the tasks in the change log since the index's version;
+        the whole collection is reloaded only when the log no longer reaches back.
+        """
+        version = await self.get_version()
+        index = task_matcher.index
+        if index.ready and index.version is not None and index.version >= version:
+            return
+        async with self._index_lock:
+            if index.ready and index.version is not None:
+                if index.version >= version or await self._catch_up_index():
+                    return
+            cursor = self.collection.find({}, INDEX_PROJECTION)
+            tasks = await cursor.to_list(length=None)
+            for task in tasks:
+                task["_id"] = str(task["_id"])
+            index.build(tasks, version)
+            index_metrics.incr("rebuilds")
+            print(f"matcher index built with {len(tasks)} tasks at version {version}")
+    
+    async def _catch_up_index(self) -> bool:
+        """Apply the logged changes the index is missing; False when the log does not cover them"""
+        index = task_matcher.index
+        meta = await self.meta.find_one({"_id": "tasks"}, {"version": 1, "changes": 1}) or {}
+        version = meta.get("version", 0)
+        log = meta.get("changes") or []
+        behind = version - index.version
+        if behind <= 0:
+            return True
+        if behind > len(log):
+            return False
+        task_ids = {task_id for entry in log[len(log) - behind:] for task_id in entry}
+        object_ids = [ObjectId(task_id) for task_id in task_ids if ObjectId.is_valid(task_id)]
+        tasks = await self.collection.find({"_id": {"$in": object_ids}}, INDEX_PROJECTION).to_list(length=None)
+        found = set()
+        for task in tasks:
+            task["_id"] = str(task["_id"])
+            found.add(task["_id"])
+            index.update(task)
+        # Logged but gone: deleted since
+        for task_id in task_ids - found:
+            index.remove(task_id)
+        index.version = version
+        index_metrics.incr("catch_ups")
+        index_metrics.incr("catch_up_tasks", len(task_ids))
+        return True
+    
+    def _apply_index_changes(self, changes: List[Tuple[str, Dict[str, Any]]], version: int):
+        """
+        Apply our own (kind, task) writes to the matcher index. If other writes came
+        in between, leave it: the next ensure_match_index catches up from the change log.
+        """
+        index = task_matcher.index
+        if not index.ready or index.version != version - 1:
+            return
+        for kind, task in changes:
+            if kind == "added":
+                index.add(task)
+            elif kind == "updated":
+                index.update(task)
+            elif kind == "deleted":
+                index.remove(task["_id"])
+        index.version = version
+    
+    async def _mutation_result(self, message: str, kind: str, task: Dict[str, Any],
+                               snapshot_fields: Dict[str, Any],
+                               previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Bump the collection version and the task stats, and describe the change.
+        In delta mode the client applies `change` to its own list; snapshot mode
+        also returns the legacy fields and the re-read task list.
+        """
+        if kind == "added":
+            increments = stat_increments(None, task)
+        elif kind == "updated":
+            increments = stat_increments(previous, task)
+        else:
+            increments = stat_increments(task, None)
+        version = await self._bump_version(increments, [task["_id"]])
+        self._apply_index_changes([(kind, dict(task))], version)
+        
+        result = {
+            "success": True,
+            "message": message,
+            "change": {"kind": kind, "task": task, "version": version},
+            "version": version
+        }
+        if self.result_mode == "snapshot":
             all_tasks = await self.get_tasks()
-            
+            result.update(snapshot_fields)
+            result["tasks"] = all_tasks.get("tasks", [])
+        return result
+    
+    async def _bulk_result(self, verb: str, kind: str, outcomes: List[Dict[str, Any]],
+                           changes: List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]],
+                           consistent: bool = True) -> Dict[str, Any]:
+        """
+        One version bump and one stats update for a whole BULK_* write.
+        `changes` holds (task, previous) per written item; `consistent` is False
+        when the server applied fewer writes than acknowledged, which makes the
+        stats and matcher index recount instead of trusting the increments.
+        """
+        succeeded = sum(1 for outcome in outcomes if outcome["success"])
+        result = {
+            "success": succeeded > 0,
+            "message": f"{verb} {succeeded} of {len(outcomes)} tasks" if succeeded
+            else f"None of the {len(outcomes)} tasks could be {verb.lower()}",
+            "results": outcomes
+        }
+        if not changes:
+            return result
+        
+        increments: Dict[str, int] = {}
+        for task, previous in changes:
+            old, new = (None, task) if kind == "added" else (previous, task) if kind == "updated" else (task, None)
+            for path, value in stat_increments(old, new).items():
+                increments[path] = increments.get(path, 0) + value
+        version = await self._bump_version(
+            {path: value for path, value in increments.items() if value},
+            [task["_id"] for task, _ in changes]
+        )
+        if consistent:
+            self._apply_index_changes([(kind, dict(task)) for task, _ in changes], version)
+        else:
+            print(f"bulk {kind} applied fewer writes than acknowledged, recounting stats")
+            task_matcher.index.clear()
+            await self.rebuild_stats()
+        
+        result["changes"] = [{"kind": kind, "task": task, "version": version} for task, _ in changes]
+        result["version"] = version
+        if self.result_mode == "snapshot":
+            all_tasks = await self.get_tasks()
+            result["tasks"] = all_tasks.get("tasks", [])
+        return result
+    
+    async def fetch_candidates(self, task_identifier: str) -> List[Dict[str, Any]]:
+        """
+        Narrow the collection to at most `candidate_limit` tasks inside MongoDB:
+        titles sharing tokens with the identifier or containing it, ranked by
+        substring hit then token overlap, projected to the matcher fields.
+        """
+        pipeline = self._candidate_pipeline(task_identifier)
+        if not pipeline:
+            return []
+        candidates = await self.collection.aggregate(pipeline).to_list(length=self.candidate_limit)
+        for task in candidates:
+            task["_id"] = str(task["_id"])
+        return candidates
+    
+    def _candidate_pipeline(self, task_identifier: str) -> List[Dict[str, Any]]:
+        normalized = normalize_title(task_identifier)
+        if not normalized:
+            return []
+        tokens = sorted(tokenize(normalized))
+        
+        pattern = re.escape(normalized)
+        return [
+            {"$match": {"$or": [
+                {"title_tokens": {"$in": tokens}},
+                {"title_normalized": {"$regex": pattern}}
+            ]}},
+            {"$project": {
+                **MATCH_PROJECTION,
+                "contains": {"$regexMatch": {"input": "$title_normalized", "regex": pattern}},
+                "overlap": {"$size": {"$setIntersection": [{"$ifNull": ["$title_tokens", []]}, tokens]}}
+            }},
+            {"$sort": {"contains": -1, "overlap": -1, "_id": 1}},
+            {"$limit": self.candidate_limit},
+            {"$project": {"contains": 0, "overlap": 0}}
+        ]
+    
+    async def _resolve_task(self, task_identifier: str):
+        """Find the task an identifier refers to. Returns (task, None) or (None, error_result)."""
+        return (await self._resolve_tasks([task_identifier]))[0]
+    
+    async def _resolve_tasks(self, task_identifiers: List[str]) -> List[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+        """_resolve_task for several identifiers; ties across all of them share one LLM call"""
+        if self.match_source == "server":
+            # Re-rank a bounded candidate set fetched from MongoDB
+            match_lists = list(await asyncio.gather(*(self.fetch_candidates(identifier) for identifier in task_identifiers)))
+            has_tasks = any(match_lists) or await self.collection.estimated_document_count() > 0
+        else:
+            # Without an explicit list the matcher scores the indexed candidates
+            await self.ensure_match_index()
+            match_lists = None
+            has_tasks = len(task_matcher.index) > 0
+        
+        if not has_tasks:
+            return [(None, {
+                "success": False,
+                "message": "No tasks found in database"
+            }) for _ in task_identifiers]
+        
+        best_matches = await task_matcher.afind_best_matches(task_identifiers, match_lists)
+        resolved = []
+        for position, (task_identifier, best_match) in enumerate(zip(task_identifiers, best_matches)):
+            if best_match:
+                resolved.append((best_match, None))
+            else:
+                resolved.append((None, self._unresolved_result(task_identifier, match_lists[position] if match_lists else None)))
+        return resolved
+    
+    def _unresolved_result(self, task_identifier: str, match_tasks: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Error result for an identifier the matcher could not resolve"""
+        # Check for multiple potential matches
+        potential_matches = task_matcher.find_multiple_matches(task_identifier, match_tasks)
+        if potential_matches:
+            match_list = "\n".join([f"- {task['title']}" for task, _ in potential_matches[:3]])
             return {
-                "success": True,
-                "message": f"Task '{title}' added successfully",
-                "task": task,
-                "tasks": all_tasks.get("tasks", [])  # Include all tasks in response
+                "success": False,
+                "message": f"Multiple tasks found that could match '{task_identifier}'. Please be more specific.\nPotential matches:\n{match_list}",
+                "potential_matches": [task for task, _ in potential_matches[:3]]
             }
+        return {
+            "success": False,
+            "message": f"No task found matching '{task_identifier}'"
+        }
+    
+    async def add_task(self, title: str, date: Optional[str] = None, 
+                      priority: str = "medium", status: str = "pending") -> Dict[str, Any]:
+        """Add a new task"""
+        try:
+            task = self._new_task(title, date, priority, status)
+            async with self._task_write():
+                result = await self.collection.insert_one({**task, **title_search_fields(title)})
+                task["_id"] = str(result.inserted_id)
+                
+                return await self._mutation_result(
+                    f"Task '{title}' added successfully",
+                    "added",
+                    task,
+                    {"task": task}
+                )
         except Exception as e:
             print(f"Error adding task: {str(e)}")
             return {
@@ -61,29 +624,76 @@ class TaskDatabase:
                 "message": f"Failed to add task: {str(e)}"
             }
     
-    async def get_tasks(self, date_range: Optional[str] = None, 
+    def _new_task(self, title: str, date: Optional[str] = None,
+                  priority: str = "medium", status: str = "pending") -> Dict[str, Any]:
+        if date:
+            task_date = parse_date(date)
+        else:
+            task_date = datetime.now()
+        
+        return {
+            "title": title,
+            "date": task_date,
+            "priority": priority.lower(),
+            "status": status.lower(),
+            "created_at": datetime.now(),
+            "updated_at": datetime.now()
+        }
+    
+    def _listing_query(self, date_range: Optional[str] = None,
                        priority_filter: Optional[str] = None,
                        status_filter: Optional[str] = None) -> Dict[str, Any]:
-        """Get tasks based on filters"""
+        query = {}
+        
+        # Date filter
+        if date_range:
+            date_filter = build_date_filter(date_range)
+            if date_filter:
+                query["date"] = date_filter
+        
+        # Priority filter
+        if priority_filter:
+            query["priority"] = priority_filter.lower()
+        
+        # Status filter  
+        if status_filter:
+            query["status"] = status_filter.lower()
+        
+        return query
+    
+    async def get_tasks(self, date_range: Optional[str] = None, 
+                       priority_filter: Optional[str] = None,
+                       status_filter: Optional[str] = None,
+                       page_size: Optional[int] = None,
+                       page_token: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get one page of tasks based on filters, ordered by (date, _id).
+        Pass the returned next_page_token back to continue; it is None on the last page.
+        """
         try:
-            query = {}
-            
-            # Date filter
-            if date_range:
-                date_filter = build_date_filter(date_range)
-                if date_filter:
-                    query["date"] = date_filter
+            query = self._listing_query(date_range, priority_filter, status_filter)
+            query_key = listing_query_key(date_range, priority_filter, status_filter)
+            page_size = max(1, min(page_size or self.page_size, self.max_page_size))
             
-            # Priority filter
-            if priority_filter:
-                query["priority"] = priority_filter.lower()
+            if page_token:
+                try:
+                    after = decode_page_token(page_token, query_key)
+                except ValueError as e:
+                    return {
+                        "success": False,
+                        "message": str(e)
+                    }
+                query = {"$and": [query, after]} if query else after
             
-            # Status filter  
-            if status_filter:
-                query["status"] = status_filter.lower()
+            # Read the version first: a write racing the listing makes it look stale, never fresh
+            version = await self.get_version()
             
-            cursor = self.collection.find(query).sort("date", 1)
-            tasks = await cursor.to_list(length=100)
+            # One extra task tells whether another page follows
+            cursor = self.collection.find(query, TASK_PROJECTION).sort(LISTING_SORT).limit(page_size + 1)
+            tasks = await cursor.to_list(length=page_size + 1)
+            has_more = len(tasks) > page_size
+            tasks = tasks[:page_size]
+            next_page_token = encode_page_token(tasks[-1], query_key) if has_more else None
             
             # Convert ObjectId to string
             for task in tasks:
@@ -100,14 +710,22 @@ class TaskDatabase:
             
             if filter_desc:
                 message = f"Found {len(tasks)} tasks with {', '.join(filter_desc)}"
+            elif has_more or page_token:
+                message = f"Retrieved {len(tasks)} tasks"
             else:
                 message = f"Retrieved all {len(tasks)} tasks" if len(tasks) > 0 else "No tasks found"
+            if has_more:
+                message += " (more available)"
             
             return {
                 "success": True,
                 "message": message,
                 "tasks": tasks,
-                "count": len(tasks)
+                "count": len(tasks),
+                "next_page_token": next_page_token,
+                "version": version,
+                # Lets the client keep a filtered view filtered when later deltas arrive
+                "filter": {"date_range": date_range, "priority": priority_filter, "status": status_filter}
             }
         except Exception as e:
             print(f"Error getting tasks: {str(e)}")
@@ -116,67 +734,53 @@ class TaskDatabase:
                 "message": f"Failed to get tasks: {str(e)}"
             }
     
+    async def iter_tasks(self, date_range: Optional[str] = None,
+                         priority_filter: Optional[str] = None,
+                         status_filter: Optional[str] = None,
+                         batch_size: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every matching task in listing order as the cursor fetches batches, without buffering the listing"""
+        query = self._listing_query(date_range, priority_filter, status_filter)
+        cursor = self.collection.find(query, TASK_PROJECTION).sort(LISTING_SORT) \
+            .batch_size(batch_size or self.page_size)
+        async for task in cursor:
+            task["_id"] = str(task["_id"])
+            yield task
+    
     async def update_task(self, task_identifier: str, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update a task using smart matching"""
         try:
-            # Get all tasks for matching
-            cursor = self.collection.find({})
-            all_tasks = await cursor.to_list(length=None)
+            best_match, error_result = await self._resolve_task(task_identifier)
+            if error_result:
+                return error_result
             
-            if not all_tasks:
-                return {
-                    "success": False,
-                    "message": "No tasks found in database"
-                }
-            
-            # Convert ObjectId to string for matching
-            for task in all_tasks:
-                task["_id"] = str(task["_id"])
-            
-            # Find best match
-            best_match = task_matcher.find_best_match(task_identifier, all_tasks)
+            # Update the matched task
+            if isinstance(updates.get("date"), str):
+                updates["date"] = parse_date(updates["date"])
+            updates["updated_at"] = datetime.now()
+            stored_updates = dict(updates)
+            if "title" in updates:
+                stored_updates.update(title_search_fields(updates["title"]))
             
-            if not best_match:
-                # Check for multiple potential matches
-                potential_matches = task_matcher.find_multiple_matches(task_identifier, all_tasks)
-                if potential_matches:
-                    match_list = "\n".join([f"- {task['title']}" for task, _ in potential_matches[:3]])
-                    return {
-                        "success": False,
-                        "message": f"Multiple tasks found that could match '{task_identifier}'. Please be more specific.\nPotential matches:\n{match_list}",
-                        "potential_matches": [task for task, _ in potential_matches[:3]]
-                    }
+            async with self._task_write():
+                result = await self.collection.update_one(
+                    {"_id": ObjectId(best_match["_id"])},
+                    {"$set": stored_updates}
+                )
+                
+                if result.modified_count > 0:
+                    return await self._mutation_result(
+                        f"Task '{best_match['title']}' updated successfully",
+                        "updated",
+                        {**best_match, **updates},
+                        {"matched_task": best_match, "updates": updates},
+                        previous=best_match
+                    )
                 else:
                     return {
                         "success": False,
-                        "message": f"No task found matching '{task_identifier}'"
+                        "message": f"Failed to update task '{best_match['title']}'"
                     }
-            
-            # Update the matched task
-            updates["updated_at"] = datetime.now()
-            
-            result = await self.collection.update_one(
-                {"_id": ObjectId(best_match["_id"])},
-                {"$set": updates}
-            )
-            
-            if result.modified_count > 0:
-                # Get updated list of all tasks
-                updated_tasks = await self.get_tasks()
-                
-                return {
-                    "success": True,
-                    "message": f"Task '{best_match['title']}' updated successfully",
-                    "matched_task": best_match,
-                    "updates": updates,
-                    "tasks": updated_tasks.get("tasks", [])  # Include all tasks
-                }
-            else:
-                return {
-                    "success": False,
-                    "message": f"Failed to update task '{best_match['title']}'"
-                }
-                
+
         except Exception as e:
             print(f"Error updating task: {str(e)}")
             return {
@@ -187,57 +791,26 @@ class TaskDatabase:
     async def delete_task(self, task_identifier: str) -> Dict[str, Any]:
         """Delete a task using smart matching"""
         try:
-            # Get all tasks for matching
-            cursor = self.collection.find({})
-            all_tasks = await cursor.to_list(length=None)
+            best_match, error_result = await self._resolve_task(task_identifier)
+            if error_result:
+                return error_result
             
-            if not all_tasks:
-                return {
-                    "success": False,
-                    "message": "No tasks found in database"
-                }
-            
-            # Convert ObjectId to string for matching
-            for task in all_tasks:
-                task["_id"] = str(task["_id"])
-            
-            # Find best match
-            best_match = task_matcher.find_best_match(task_identifier, all_tasks)
-            
-            if not best_match:
-                # Check for multiple potential matches
-                potential_matches = task_matcher.find_multiple_matches(task_identifier, all_tasks)
-                if potential_matches:
-                    match_list = "\n".join([f"- {task['title']}" for task, _ in potential_matches[:3]])
-                    return {
-                        "success": False,
-                        "message": f"Multiple tasks found that could match '{task_identifier}'. Please be more specific.\nPotential matches:\n{match_list}",
-                        "potential_matches": [task for task, _ in potential_matches[:3]]
-                    }
+            # Delete the matched task
+            async with self._task_write():
+                result = await self.collection.delete_one({"_id": ObjectId(best_match["_id"])})
+                
+                if result.deleted_count > 0:
+                    return await self._mutation_result(
+                        f"Task '{best_match['title']}' deleted successfully",
+                        "deleted",
+                        best_match,
+                        {"deleted_task": best_match}
+                    )
                 else:
                     return {
                         "success": False,
-                        "message": f"No task found matching '{task_identifier}'"
+                        "message": f"Failed to delete task '{best_match['title']}'"
                     }
-            
-            # Delete the matched task
-            result = await self.collection.delete_one({"_id": ObjectId(best_match["_id"])})
-            
-            if result.deleted_count > 0:
-                # Get updated list of all tasks after deletion
-                updated_tasks = await self.get_tasks()
-                
-                return {
-                    "success": True,
-                    "message": f"Task '{best_match['title']}' deleted successfully",
-                    "deleted_task": best_match,
-                    "tasks": updated_tasks.get("tasks", [])  # Include remaining tasks
-                }
-            else:
-                return {
-                    "success": False,
-                    "message": f"Failed to delete task '{best_match['title']}'"
-                }
                 
         except Exception as e:
             print(f"Error deleting task: {str(e)}")
@@ -265,90 +838,348 @@ class TaskDatabase:
             result["message"] = f"Task priority updated to {priority}"
         return result
     
-    async def get_task_summary(self, filter_criteria: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Get task summary with statistics"""
+    def _bulk_items_error(self, items: List[Any]) -> Optional[Dict[str, Any]]:
+        if not items:
+            return {
+                "success": False,
+                "message": "No tasks given"
+            }
+        if len(items) > self.bulk_max_items:
+            return {
+                "success": False,
+                "message": f"Too many tasks in one request ({len(items)}), the limit is {self.bulk_max_items}"
+            }
+        return None
+    
+    @staticmethod
+    def _failed_writes(error: BulkWriteError) -> Dict[int, str]:
+        """Position of every failed operation in an unordered bulk write -> error message"""
+        return {failure["index"]: failure.get("errmsg", "write failed") for failure in error.details.get("writeErrors", [])}
+    
+    async def bulk_add(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Add several tasks with one unordered insert_many; `results` reports every item"""
+        try:
+            error_result = self._bulk_items_error(items)
+            if error_result:
+                return error_result
+            
+            outcomes: List[Dict[str, Any]] = []
+            tasks: List[Dict[str, Any]] = []
+            documents: List[Dict[str, Any]] = []
+            for position, item in enumerate(items):
+                title = str(item.get("title") or "").strip()
+                outcome = {"index": position, "item": title, "success": False}
+                outcomes.append(outcome)
+                if not title:
+                    outcome["message"] = "Missing title"
+                    continue
+                task = self._new_task(title, item.get("date"), item.get("priority") or "medium",
+                                      item.get("status") or "pending")
+                outcome["position"] = len(tasks)
+                tasks.append(task)
+                documents.append({**task, **title_search_fields(title)})
+            
+            async with self._task_write():
+                failed: Dict[int, str] = {}
+                if documents:
+                    try:
+                        await self.collection.insert_many(documents, ordered=False)
+                    except BulkWriteError as e:
+                        failed = self._failed_writes(e)
+                
+                changes = []
+                for outcome in outcomes:
+                    position = outcome.pop("position", None)
+                    if position is None:
+                        continue
+                    if position in failed:
+                        outcome["message"] = f"Failed to add task: {failed[position]}"
+                        continue
+                    # insert_many sets _id on each document before sending it
+                    task = tasks[position]
+                    task["_id"] = str(documents[position]["_id"])
+                    outcome.update({"success": True, "message": f"Task '{task['title']}' added", "task": task})
+                    changes.append((task, None))
+                
+                return await self._bulk_result("Added", "added", outcomes, changes)
+        except Exception as e:
+            print(f"Error adding tasks: {str(e)}")
+            return {
+                "success": False,
+                "message": f"Failed to add tasks: {str(e)}"
+            }
+    
+    async def bulk_update(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Apply {task_identifier, updates} items: identifiers are resolved in one
+        batch, then written with one unordered bulk_write.
+        """
         try:
-            pipeline = []
+            error_result = self._bulk_items_error(items)
+            if error_result:
+                return error_result
             
-            # Add match stage if filters provided
-            if filter_criteria:
-                # Handle date range filtering
-                if "date_range" in filter_criteria:
-                    date_filter = build_date_filter(filter_criteria["date_range"])
-                    if date_filter:
-                        filter_criteria["date"] = date_filter
-                    del filter_criteria["date_range"]
+            resolved = await self._resolve_items([item.get("task_identifier") for item in items])
+            outcomes: List[Dict[str, Any]] = []
+            operations = []
+            pending: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]] = []
+            for position, (item, (best_match, failure)) in enumerate(zip(items, resolved)):
+                outcome = {"index": position, "item": item.get("task_identifier") or "", "success": False}
+                outcomes.append(outcome)
+                updates = dict(item.get("updates") or {})
+                if not failure and not updates:
+                    failure = "No changes given"
+                if not failure and updates.get("priority") and str(updates["priority"]).lower() not in ("high", "medium", "low"):
+                    failure = "Priority must be high, medium, or low"
+                if failure:
+                    outcome["message"] = failure
+                    continue
                 
-                # Handle other filters (priority, status, etc.)
-                pipeline.append({"$match": filter_criteria})
+                if isinstance(updates.get("date"), str):
+                    updates["date"] = parse_date(updates["date"])
+                for field in ("priority", "status"):
+                    if isinstance(updates.get(field), str):
+                        updates[field] = updates[field].lower()
+                updates["updated_at"] = datetime.now()
+                stored_updates = dict(updates)
+                if "title" in updates:
+                    stored_updates.update(title_search_fields(updates["title"]))
+                operations.append(UpdateOne({"_id": ObjectId(best_match["_id"])}, {"$set": stored_updates}))
+                pending.append((outcome, best_match, updates))
             
-            # Aggregation pipeline for statistics
-            pipeline.extend([
-                {
-                    "$group": {
-                        "_id": None,
-                        "total_tasks": {"$sum": 1},
-                        "high_priority": {
-                            "$sum": {"$cond": [{"$eq": ["$priority", "high"]}, 1, 0]}
-                        },
-                        "medium_priority": {
-                            "$sum": {"$cond": [{"$eq": ["$priority", "medium"]}, 1, 0]}
-                        },
-                        "low_priority": {
-                            "$sum": {"$cond": [{"$eq": ["$priority", "low"]}, 1, 0]}
-                        },
-                        "pending_tasks": {
-                            "$sum": {"$cond": [{"$eq": ["$status", "pending"]}, 1, 0]}
-                        },
-                        "completed_tasks": {
-                            "$sum": {"$cond": [{"$in": ["$status", ["completed", "done"]]}, 1, 0]}
-                        },
-                        "tasks": {"$push": "$$ROOT"}
-                    }
-                }
-            ])
+            return await self._write_bulk("Updated", "updated", outcomes, operations, pending)
+        except Exception as e:
+            print(f"Error updating tasks: {str(e)}")
+            return {
+                "success": False,
+                "message": f"Failed to update tasks: {str(e)}"
+            }
+    
+    async def bulk_delete(self, items: List[Any]) -> Dict[str, Any]:
+        """Delete the tasks named by several identifiers (strings or {task_identifier} items) in one unordered bulk_write"""
+        try:
+            error_result = self._bulk_items_error(items)
+            if error_result:
+                return error_result
             
-            cursor = self.collection.aggregate(pipeline)
-            result = await cursor.to_list(length=1)
+            identifiers = [item.get("task_identifier") if isinstance(item, dict) else item for item in items]
+            resolved = await self._resolve_items(identifiers)
+            outcomes: List[Dict[str, Any]] = []
+            operations = []
+            pending: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]] = []
+            for position, (identifier, (best_match, failure)) in enumerate(zip(identifiers, resolved)):
+                outcome = {"index": position, "item": identifier or "", "success": False}
+                outcomes.append(outcome)
+                if failure:
+                    outcome["message"] = failure
+                    continue
+                operations.append(DeleteOne({"_id": ObjectId(best_match["_id"])}))
+                pending.append((outcome, best_match, {}))
             
-            if result:
-                summary = result[0]
-                # Convert ObjectIds to strings in tasks
-                for task in summary["tasks"]:
-                    task["_id"] = str(task["_id"])
-                
-                # Create descriptive message
-                total = summary["total_tasks"]
-                completed = summary["completed_tasks"]
-                pending = summary["pending_tasks"]
-                message = f"Found {total} tasks: {completed} completed, {pending} pending"
-                
-                return {
-                    "success": True,
-                    "message": message,
-                    "summary": summary,
-                    "tasks": summary["tasks"]  # Include tasks for frontend display
-                }
+            return await self._write_bulk("Deleted", "deleted", outcomes, operations, pending)
+        except Exception as e:
+            print(f"Error deleting tasks: {str(e)}")
+            return {
+                "success": False,
+                "message": f"Failed to delete tasks: {str(e)}"
+            }
+    
+    async def _resolve_items(self, identifiers: List[Optional[str]]) -> List[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+        """(task, None) or (None, reason) per identifier; a task claimed by an earlier item fails the later ones"""
+        lookups = [position for position, identifier in enumerate(identifiers) if identifier and str(identifier).strip()]
+        resolved: List[Tuple[Optional[Dict[str, Any]], Optional[str]]] = [(None, "Missing task identifier")] * len(identifiers)
+        matches = await self._resolve_tasks([str(identifiers[position]).strip() for position in lookups]) if lookups else []
+        
+        claimed: Dict[str, int] = {}
+        for position, (best_match, error_result) in zip(lookups, matches):
+            if error_result:
+                resolved[position] = (None, error_result["message"])
+            elif best_match["_id"] in claimed:
+                resolved[position] = (None, f"Same task as item {claimed[best_match['_id']] + 1} ('{best_match['title']}')")
             else:
-                return {
-                    "success": True,
-                    "message": "No tasks found",
-                    "summary": {
-                        "total_tasks": 0,
-                        "high_priority": 0,
-                        "medium_priority": 0,
-                        "low_priority": 0,
-                        "pending_tasks": 0,
-                        "completed_tasks": 0,
-                        "tasks": []
-                    },
-                    "tasks": []
-                }
+                claimed[best_match["_id"]] = position
+                resolved[position] = (best_match, None)
+        return resolved
+    
+    async def _write_bulk(self, verb: str, kind: str, outcomes: List[Dict[str, Any]], operations: List[Any],
+                          pending: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]]) -> Dict[str, Any]:
+        """Run the resolved operations as one unordered bulk_write and fill in their outcomes"""
+        if not operations:
+            return await self._bulk_result(verb, kind, outcomes, [])
+        async with self._task_write():
+            failed: Dict[int, str] = {}
+            try:
+                result = await self.collection.bulk_write(operations, ordered=False)
+                applied = result.deleted_count if kind == "deleted" else result.matched_count
+            except BulkWriteError as e:
+                failed = self._failed_writes(e)
+                applied = e.details.get("nRemoved" if kind == "deleted" else "nMatched", 0)
+            
+            changes = []
+            for position, (outcome, best_match, updates) in enumerate(pending):
+                if position in failed:
+                    outcome["message"] = f"Failed to {kind[:-1]} task '{best_match['title']}': {failed[position]}"
+                    continue
+                task = {**best_match, **updates}
+                outcome.update({"success": True, "message": f"Task '{best_match['title']}' {kind}", "task": task})
+                changes.append((task, best_match))
+            
+            # A task removed by another writer after matching is acknowledged but not applied
+            return await self._bulk_result(verb, kind, outcomes, changes, consistent=applied == len(changes))
+    
+    async def get_task_summary(self, filter_criteria: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Get task summary with statistics"""
+        try:
+            # Unfiltered and date-range summaries read the materialized stats
+            stats_summary = await self._summary_from_stats(filter_criteria)
+            if stats_summary:
+                metrics.incr("from_stats")
+                return stats_summary
+            metrics.incr("from_aggregate")
+            
+            cursor = self.collection.aggregate(self._summary_pipeline(filter_criteria))
+            result = await cursor.to_list(length=1)
+            facets = result[0] if result else {}
+            
+            counts = facets["counts"][0] if facets.get("counts") else {}
+            counts.pop("_id", None)
+            counts["overdue_tasks"] = facets["overdue"][0]["count"] if facets.get("overdue") else 0
+            return self._summary_result(counts, facets.get("upcoming", []), facets.get("sample", []))
         except Exception as e:
             print(f"Error getting task summary: {str(e)}")
             return {
                 "success": False,
                 "message": f"Failed to get task summary: {str(e)}"
             }
+    
+    def _summary_pipeline(self, filter_criteria: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        pipeline = []
+        
+        # Add match stage if filters provided
+        if filter_criteria:
+            # Handle date range filtering
+            if "date_range" in filter_criteria:
+                date_filter = build_date_filter(filter_criteria["date_range"])
+                if date_filter:
+                    filter_criteria["date"] = date_filter
+                del filter_criteria["date_range"]
+            
+            # Handle other filters (priority, status, etc.)
+            pipeline.append({"$match": filter_criteria})
+        
+        # One bounded result document: counts, overdue count, next deadlines and a task sample
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        open_status = {"$nin": ["completed", "done"]}
+        pipeline.append({
+            "$facet": {
+                "counts": [
+                    {
+                        "$group": {
+                            "_id": None,
+                            "total_tasks": {"$sum": 1},
+                            "high_priority": {
+                                "$sum": {"$cond": [{"$eq": ["$priority", "high"]}, 1, 0]}
+                            },
+                            "medium_priority": {
+                                "$sum": {"$cond": [{"$eq": ["$priority", "medium"]}, 1, 0]}
+                            },
+                            "low_priority": {
+                                "$sum": {"$cond": [{"$eq": ["$priority", "low"]}, 1, 0]}
+                            },
+                            "pending_tasks": {
+                                "$sum": {"$cond": [{"$eq": ["$status", "pending"]}, 1, 0]}
+                            },
+                            "completed_tasks": {
+                                "$sum": {"$cond": [{"$in": ["$status", ["completed", "done"]]}, 1, 0]}
+                            }
+                        }
+                    }
+                ],
+                "overdue": [
+                    {"$match": {"date": {"$lt": today}, "status": open_status}},
+                    {"$count": "count"}
+                ],
+                "upcoming": [
+                    {"$match": {"date": {"$gte": today}, "status": open_status}},
+                    {"$sort": {"date": 1, "_id": 1}},
+                    {"$limit": self.summary_upcoming_limit},
+                    {"$project": TASK_PROJECTION}
+                ],
+                "sample": [
+                    {"$sort": {"date": 1, "_id": 1}},
+                    {"$limit": self.summary_sample_size},
+                    {"$project": TASK_PROJECTION}
+                ]
+            }
+        })
+        return pipeline
+    
+    async def _summary_from_stats(self, filter_criteria: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Summary from the stats document plus two bounded, indexed task reads; None when not applicable"""
+        criteria = dict(filter_criteria or {})
+        date_range = criteria.pop("date_range", None)
+        if criteria or self.meta is None:
+            return None
+        date_filter = build_date_filter(date_range) if date_range else None
+        if date_range and not date_filter:
+            return None
+        
+        meta = await self.meta.find_one({"_id": "tasks"}, {"stats": 1})
+        stats = (meta or {}).get("stats")
+        if not stats or not stats.get("built_at"):
+            return None
+        
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        counts = summarize_stats(stats, date_filter, today)
+        upcoming_query, sample_query = self._summary_queries(date_filter, today)
+        upcoming = await self.collection.find(upcoming_query, TASK_PROJECTION).sort(LISTING_SORT) \
+            .limit(self.summary_upcoming_limit).to_list(length=self.summary_upcoming_limit)
+        sample = await self.collection.find(sample_query, TASK_PROJECTION).sort(LISTING_SORT) \
+            .limit(self.summary_sample_size).to_list(length=self.summary_sample_size)
+        return self._summary_result(counts, upcoming, sample)
+    
+    def _summary_queries(self, date_filter: Optional[Dict[str, datetime]], today: datetime):
+        """(upcoming deadlines, sample) filters for a stats-backed summary"""
+        query = {"date": date_filter} if date_filter else {}
+        upcoming_query = {
+            "$and": [query, {"date": {"$gte": today}}, {"status": {"$nin": list(COMPLETED_STATUSES)}}]
+        }
+        return upcoming_query, query
+    
+    def _summary_result(self, counts: Dict[str, Any], upcoming: List[Dict[str, Any]],
+                        sample: List[Dict[str, Any]]) -> Dict[str, Any]:
+        summary = {
+            "total_tasks": 0,
+            "high_priority": 0,
+            "medium_priority": 0,
+            "low_priority": 0,
+            "pending_tasks": 0,
+            "completed_tasks": 0,
+            "overdue_tasks": 0,
+            **counts
+        }
+        # Convert ObjectIds to strings in tasks
+        for task in upcoming + sample:
+            task["_id"] = str(task["_id"])
+        summary["upcoming_deadlines"] = upcoming
+        summary["tasks"] = sample
+        summary["tasks_truncated"] = summary["total_tasks"] > len(sample)
+        
+        if not summary["total_tasks"]:
+            message = "No tasks found"
+        else:
+            # Create descriptive message
+            total = summary["total_tasks"]
+            completed = summary["completed_tasks"]
+            pending = summary["pending_tasks"]
+            message = f"Found {total} tasks: {completed} completed, {pending} pending"
+        
+        return {
+            "success": True,
+            "message": message,
+            "summary": summary,
+            "tasks": summary["tasks"]  # Include tasks for frontend display
+        }
+
 # Global database instance
 task_db = TaskDatabase()
\ No newline at end of file
@@ -1,55 +1,197 @@
 """Smart task matching utilities using semantic similarity and fuzzy matching."""
 
+import os
 import re
+import time
+import asyncio
 from typing import List, Dict, Any, Optional, Tuple
 from difflib import SequenceMatcher
 from datetime import datetime
 from .llm_model import get_llm_model
+from .matcher_index import MatcherIndex, normalize_title
+from .ngram_scorer import HAS_NUMPY, NgramScorer
+from .embeddings import STOPWORDS, embed_title
+from .metrics import get_metrics
+
+metrics = get_metrics("matcher")
+
+# Explicit task lists at least this long are narrowed with the NumPy batch scorer
+# before the per-title SequenceMatcher pass; only the best BATCH_RESCORE_LIMIT
+# trigram overlaps (plus substring hits) are rescored exactly. The rescored titles
+# keep their exact scores, but the result only equals a full pass when the best
+# title is among those overlaps (benchmarks/fuzzy_scorer.py measures how often)
+BATCH_SCORING_MIN = int(os.getenv("MATCHER_BATCH_MIN", "500"))
+BATCH_RESCORE_LIMIT = int(os.getenv("MATCHER_BATCH_RESCORE", "50"))
+
+# Semantic tier: nearest title embedding wins on its own when it clears SEMANTIC_MIN_SCORE,
+# has no rival within SEMANTIC_TIE_MARGIN and its title covers every content word of the
+# identifier. Otherwise candidates from SEMANTIC_LLM_MIN_SCORE up go to the LLM, which
+# can still answer "none" (same verb, different object: "team meeting" vs "client meeting")
+SEMANTIC_MIN_SCORE = float(os.getenv("SEMANTIC_MIN_SCORE", "0.45"))
+SEMANTIC_TIE_MARGIN = float(os.getenv("SEMANTIC_TIE_MARGIN", "0.1"))
+SEMANTIC_LLM_MIN_SCORE = float(os.getenv("SEMANTIC_LLM_MIN_SCORE", "0.3"))
+# Most candidates one LLM tiebreak is shown
+LLM_MAX_CANDIDATES = 5
 
 
 class TaskMatcher:
     """Smart task matcher that uses multiple strategies to find the best matching task."""
     
     def __init__(self):
-        self.llm = get_llm_model()
+        self.index = MatcherIndex()
+        # (list contents, scorer) for the last explicit list not covered by the index
+        self._batch_scorer: Optional[Tuple[Tuple[Tuple[str, str], ...], NgramScorer]] = None
+        # Bounds for the async LLM tiebreak: per-call timeout (including the wait for a slot)
+        # and how many tiebreak calls may run at once across sessions
+        self.llm_timeout = float(os.getenv("LLM_MATCH_TIMEOUT_SECONDS", "8"))
+        self._llm_semaphore = asyncio.Semaphore(int(os.getenv("LLM_MATCH_CONCURRENCY", "4")))
     
-    def find_best_match(self, task_identifier: str, tasks: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    @property
+    def llm(self):
+        """The tiebreak model, from the LLM client registry (built on first use, not at import)."""
+        return get_llm_model()
+    
+    def find_best_match(self, task_identifier: str, 
+                        tasks: Optional[List[Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
         """
         Find the best matching task using multiple strategies.
+        When no task list is given, only the candidates from the matcher index are scored.
         Returns the best matching task or None if no good match is found.
+        Blocking: prefer afind_best_match on the event loop.
+        """
+        best_match, llm_candidates = self._rank_candidates(task_identifier, tasks)
+        if best_match or not llm_candidates:
+            return best_match
+        return self._llm_assisted_match(task_identifier, llm_candidates)
+    
+    async def afind_best_match(self, task_identifier: str, 
+                               tasks: Optional[List[Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Async variant of find_best_match. The LLM tiebreak awaits the model with a
+        timeout and a concurrency limit instead of blocking the event loop.
+        """
+        best_match, llm_candidates = self._rank_candidates(task_identifier, tasks)
+        if best_match or not llm_candidates:
+            return best_match
+        return await self._allm_assisted_match(task_identifier, llm_candidates)
+    
+    async def afind_best_matches(self, task_identifiers: List[str],
+                                 tasks: Optional[List[List[Dict[str, Any]]]] = None) -> List[Optional[Dict[str, Any]]]:
         """
+        Resolve several identifiers at once, one result per identifier (None when unmatched).
+        `tasks` optionally gives each identifier its own candidate list. Every
+        identifier that needs the LLM tiebreak shares a single batched call.
+        """
+        matches: List[Optional[Dict[str, Any]]] = []
+        ties: List[Tuple[int, str, List[Dict[str, Any]]]] = []
+        for position, identifier in enumerate(task_identifiers):
+            best_match, llm_candidates = self._rank_candidates(identifier, tasks[position] if tasks else None)
+            matches.append(best_match)
+            if not best_match and llm_candidates:
+                ties.append((position, identifier, llm_candidates))
+        
+        if len(ties) == 1:
+            position, identifier, candidates = ties[0]
+            matches[position] = await self._allm_assisted_match(identifier, candidates)
+        elif ties:
+            choices = await self._allm_assisted_batch([(identifier, candidates) for _, identifier, candidates in ties])
+            for (position, _, _), choice in zip(ties, choices):
+                matches[position] = choice
+        return matches
+    
+    def _rank_candidates(self, task_identifier: str, tasks: Optional[List[Dict[str, Any]]]
+                         ) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Run the deterministic strategies.
+        Returns (match, []) on a confident match, or (None, candidates) when only the LLM can decide.
+        The LLM is not limited to ties: it sees the top fuzzy titles whenever the best fuzzy
+        score is above 0.4 (the baseline rule), plus semantic ties, semantic hits whose title
+        misses a content word, and semantic scores from SEMANTIC_LLM_MIN_SCORE up. The
+        embedding tier only saves calls it resolves outright (benchmarks/llm_tiebreak_rate.py).
+        """
+        from_index = tasks is None
+        if from_index:
+            exact_match = self.index.exact_match(task_identifier)
+            if exact_match:
+                return exact_match, []
+            tasks = self.index.candidates(task_identifier)
+        
         if not tasks:
-            return None
+            return None, []
         
         # Strategy 1: Exact title match
         exact_match = self._find_exact_match(task_identifier, tasks)
         if exact_match:
-            return exact_match
+            return exact_match, []
         
         # Strategy 2: Fuzzy string matching
         fuzzy_matches = self._find_fuzzy_matches(task_identifier, tasks)
         if fuzzy_matches and fuzzy_matches[0][1] > 0.7:  # High confidence threshold
-            return fuzzy_matches[0][0]
+            return fuzzy_matches[0][0], []
         
         # Strategy 3: Semantic similarity using keywords
         keyword_matches = self._find_keyword_matches(task_identifier, tasks)
         if keyword_matches and keyword_matches[0][1] > 0.6:
-            return keyword_matches[0][0]
+            return keyword_matches[0][0], []
         
-        # Strategy 4: LLM-based semantic matching (for complex cases)
-        if fuzzy_matches and fuzzy_matches[0][1] > 0.4:  # Medium confidence
-            llm_match = self._llm_assisted_match(task_identifier, [match[0] for match in fuzzy_matches[:3]])
-            if llm_match:
-                return llm_match
+        # Strategy 4: Nearest title embeddings
+        semantic_matches = self._find_semantic_matches(task_identifier, None if from_index else tasks)
+        semantic_candidates = []
+        if semantic_matches and semantic_matches[0][1] >= SEMANTIC_LLM_MIN_SCORE:
+            best_score = semantic_matches[0][1]
+            semantic_candidates = [
+                task for task, score in semantic_matches[:3]
+                if score >= SEMANTIC_LLM_MIN_SCORE and best_score - score <= SEMANTIC_TIE_MARGIN
+            ]
+            if best_score >= SEMANTIC_MIN_SCORE:
+                if len(semantic_candidates) > 1:
+                    metrics.incr("semantic_ties")
+                elif self._covers_identifier(task_identifier, semantic_candidates[0].get("title", "")):
+                    metrics.incr("semantic_hits")
+                    return semantic_candidates[0], []
+                else:
+                    # Close in embedding space but a content word is missing from the title
+                    metrics.incr("semantic_unconfirmed")
         
-        return None
+        # Strategy 5: LLM-based matching over the semantic and medium-confidence fuzzy candidates
+        llm_candidates: Dict[str, Dict[str, Any]] = {}
+        for task in semantic_candidates:
+            llm_candidates.setdefault(str(task.get("_id", id(task))), task)
+        if fuzzy_matches and fuzzy_matches[0][1] > 0.4:  # Medium confidence
+            for task, _ in fuzzy_matches[:3]:
+                llm_candidates.setdefault(str(task.get("_id", id(task))), task)
+        return None, list(llm_candidates.values())[:LLM_MAX_CANDIDATES]
     
-    def find_multiple_matches(self, task_identifier: str, tasks: List[Dict[str, Any]], 
+    def _covers_identifier(self, identifier: str, title: str) -> bool:
+        """
+        Whether every content word of the identifier has a counterpart in the title:
+        the same word, a prefix of at least 3 letters either way ("tax"/"taxes"),
+        or a near spelling ("meting"/"meeting").
+        """
+        identifier_words = re.findall(r'\w+', identifier.lower())
+        identifier_words = [word for word in identifier_words if word not in STOPWORDS] or identifier_words
+        title_words = set(re.findall(r'\w+', title.lower()))
+        for word in identifier_words:
+            if word in title_words:
+                continue
+            if not any(
+                (min(len(word), len(other)) >= 3 and (word.startswith(other) or other.startswith(word)))
+                or SequenceMatcher(None, word, other).ratio() >= 0.8
+                for other in title_words
+            ):
+                return False
+        return True
+    
+    def find_multiple_matches(self, task_identifier: str, tasks: Optional[List[Dict[str, Any]]] = None, 
                             threshold: float = 0.4) -> List[Tuple[Dict[str, Any], float]]:
         """
         Find multiple potential matches for disambiguation.
+        When no task list is given, only the candidates from the matcher index are scored.
         Returns list of (task, confidence_score) tuples.
         """
+        if tasks is None:
+            tasks = self.index.candidates(task_identifier)
+        
         all_matches = []
         
         # Get fuzzy matches
@@ -85,6 +227,9 @@ class TaskMatcher:
         matches = []
         identifier_lower = identifier.lower().strip()
         
+        if HAS_NUMPY and len(tasks) >= BATCH_SCORING_MIN:
+            tasks = self._batch_prefilter(identifier, tasks)
+        
         for task in tasks:
             title = task.get("title", "").lower().strip()
             if not title:
@@ -102,6 +247,39 @@ class TaskMatcher:
         
         return sorted(matches, key=lambda x: x[1], reverse=True)
     
+    def _batch_prefilter(self, identifier: str, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Narrow a long task list to the titles worth a SequenceMatcher pass."""
+        normalized = normalize_title(identifier)
+        ids = self.index.indexed_ids(tasks) if self.index.scorer is not None else None
+        if ids is not None:
+            # Every task is in the matcher index: rank its rows, nothing to build
+            by_id = dict(zip(ids, tasks))
+            # The whole index needs no row gather
+            subset = ids if len(by_id) < len(self.index) else None
+            return [by_id[task_id] for task_id, _ in self.index.scorer.top(normalized, BATCH_RESCORE_LIMIT, subset)]
+        
+        # Otherwise build a scorer for the list once and reuse it while the list is unchanged
+        key = tuple((str(task.get("_id")), task.get("title", "")) for task in tasks)
+        cached = self._batch_scorer
+        if cached is None or cached[0] != key:
+            scorer = NgramScorer(initial_capacity=len(tasks))
+            scorer.build((str(i), normalize_title(title)) for i, (_, title) in enumerate(key))
+            cached = self._batch_scorer = (key, scorer)
+            metrics.incr("batch_scorer_builds")
+        return [tasks[int(row)] for row, _ in cached[1].top(normalized, BATCH_RESCORE_LIMIT)]
+    
+    def _find_semantic_matches(self, identifier: str, tasks: Optional[List[Dict[str, Any]]] = None,
+                               limit: int = 5) -> List[Tuple[Dict[str, Any], float]]:
+        """Nearest tasks by title embedding (cosine), from the index or the given list."""
+        query = embed_title(identifier)
+        if tasks is None:
+            return self.index.semantic_search(query, limit)
+        
+        # Indexed tasks reuse their stored vectors; only the others are embedded
+        scores = self.index.semantic_scores(query, tasks)
+        ranked = sorted(zip(tasks, scores), key=lambda x: x[1], reverse=True)
+        return ranked[:limit]
+    
     def _find_keyword_matches(self, identifier: str, tasks: List[Dict[str, Any]], 
                             threshold: float = 0.3) -> List[Tuple[Dict[str, Any], float]]:
         """Find matches based on keyword overlap."""
@@ -135,11 +313,7 @@ class TaskMatcher:
         
         return sorted(matches, key=lambda x: x[1], reverse=True)
     
-    def _llm_assisted_match(self, identifier: str, candidate_tasks: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        """Use LLM to determine the best match among candidates."""
-        if not candidate_tasks:
-            return None
-        
+    def _build_llm_prompt(self, identifier: str, candidate_tasks: List[Dict[str, Any]]) -> str:
         # Format candidates for LLM
         candidates_text = ""
         for i, task in enumerate(candidate_tasks, 1):
@@ -148,7 +322,7 @@ class TaskMatcher:
             candidates_text += f"   Status: {task.get('status', 'pending')}\n"
             candidates_text += f"   Created: {task.get('created_at', '')}\n\n"
         
-        prompt = f"""
+        return f"""
 Given the user's task identifier: "{identifier}"
 
 And these candidate tasks:
@@ -162,28 +336,111 @@ Which task is the user most likely referring to? Consider:
 
 Respond with only the number (1, 2, 3, etc.) of the best matching task, or "none" if no task is a good match.
 """
+    
+    def _build_llm_batch_prompt(self, ties: List[Tuple[str, List[Dict[str, Any]]]]) -> str:
+        sections = ""
+        for number, (identifier, candidate_tasks) in enumerate(ties, 1):
+            sections += f'Reference {number}: "{identifier}"\n'
+            for i, task in enumerate(candidate_tasks, 1):
+                sections += f"   {i}. '{task.get('title', '')}' ({task.get('priority', 'medium')} priority, "
+                sections += f"{task.get('status', 'pending')}, created {task.get('created_at', '')})\n"
+            sections += "\n"
+        
+        return f"""
+The user referred to several tasks at once. For each reference, pick the candidate task it most likely means:
+
+{sections}
+Consider semantic similarity, context, recent activity and priority/status.
+
+Respond with one line per reference in the form "<reference>: <candidate number>", or "<reference>: none" if no candidate is a good match.
+"""
+    
+    def _parse_llm_batch(self, content: str, ties: List[Tuple[str, List[Dict[str, Any]]]]
+                         ) -> List[Optional[Dict[str, Any]]]:
+        choices: List[Optional[Dict[str, Any]]] = [None] * len(ties)
+        for line in content.strip().lower().splitlines():
+            match = re.match(r'\D*(\d+)\s*[:\-=.)]\s*(\w+)', line)
+            if not match:
+                continue
+            reference = int(match.group(1))
+            if 1 <= reference <= len(ties):
+                choices[reference - 1] = self._parse_llm_choice(match.group(2), ties[reference - 1][1])
+        return choices
+    
+    def _parse_llm_choice(self, content: str, candidate_tasks: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        result = content.strip().lower()
+        
+        # Parse the response
+        if result == "none":
+            return None
+        
+        # Try to extract number
+        numbers = re.findall(r'\d+', result)
+        if numbers:
+            choice = int(numbers[0])
+            if 1 <= choice <= len(candidate_tasks):
+                return candidate_tasks[choice - 1]
+        return None
+    
+    def _llm_assisted_match(self, identifier: str, candidate_tasks: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Use LLM to determine the best match among candidates."""
+        if not candidate_tasks:
+            return None
         
         try:
-            response = self.llm.invoke(prompt)
-            result = response.content.strip().lower()
-            
-            # Parse the response
-            if result == "none":
-                return None
-            
-            # Try to extract number
-            import re
-            numbers = re.findall(r'\d+', result)
-            if numbers:
-                choice = int(numbers[0])
-                if 1 <= choice <= len(candidate_tasks):
-                    return candidate_tasks[choice - 1]
+            response = self.llm.invoke(self._build_llm_prompt(identifier, candidate_tasks))
+            return self._parse_llm_choice(response.content, candidate_tasks)
+        except Exception as e:
+            print(f"LLM matching error: {e}")
         
+        return None
+    
+    async def _ainvoke_bounded(self, prompt: str):
+        async with self._llm_semaphore:
+            start = time.perf_counter()
+            response = await self.llm.ainvoke(prompt)
+            metrics.observe("llm_ms", (time.perf_counter() - start) * 1000)
+            return response
+    
+    async def _allm_assisted_match(self, identifier: str, candidate_tasks: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Async LLM tiebreak, bounded by llm_timeout and the concurrency semaphore."""
+        if not candidate_tasks:
+            return None
+        
+        prompt = self._build_llm_prompt(identifier, candidate_tasks)
+        
+        metrics.incr("llm_calls")
+        try:
+            response = await asyncio.wait_for(self._ainvoke_bounded(prompt), timeout=self.llm_timeout)
+            return self._parse_llm_choice(response.content, candidate_tasks)
+        except asyncio.TimeoutError:
+            metrics.incr("llm_timeouts")
+            print(f"LLM matching timed out after {self.llm_timeout}s")
         except Exception as e:
+            metrics.incr("llm_errors")
             print(f"LLM matching error: {e}")
         
         return None
     
+    async def _allm_assisted_batch(self, ties: List[Tuple[str, List[Dict[str, Any]]]]
+                                   ) -> List[Optional[Dict[str, Any]]]:
+        """One bounded LLM call breaking the ties of several identifiers."""
+        prompt = self._build_llm_batch_prompt(ties)
+        
+        metrics.incr("llm_calls")
+        metrics.incr("llm_batched", len(ties))
+        try:
+            response = await asyncio.wait_for(self._ainvoke_bounded(prompt), timeout=self.llm_timeout)
+            return self._parse_llm_batch(response.content, ties)
+        except asyncio.TimeoutError:
+            metrics.incr("llm_timeouts")
+            print(f"LLM batch matching timed out after {self.llm_timeout}s")
+        except Exception as e:
+            metrics.incr("llm_errors")
+            print(f"LLM batch matching error: {e}")
+        
+        return [None] * len(ties)
+    
     def is_ambiguous_match(self, matches: List[Tuple[Dict[str, Any], float]]) -> bool:
         """Check if the matches are ambiguous (multiple similar confidence scores)."""
         if len(matches) < 2:
@@ -0,0 +1,148 @@
+"""Materialized task counters kept on the collection version document.
+
+Layout of the "stats" field of task_meta {_id: "tasks"}:
+
+    {"counts": {<key>: n}, "days": {"YYYY-MM-DD" | "undated": {<key>: n}}, "built_at": datetime}
+
+Writes apply `stat_increments` in the pipeline update that bumps the collection
+version (see `increment_stage`), so counters and version move together, and the
+same update drops the day buckets it leaves without tasks (`PRUNE_EMPTY_DAYS`),
+so the buckets summaries iterate stay limited to days that still hold tasks.
+That update is a separate write from the task write before it: a recount stored
+between the two would already include the task and then get its increments on
+top, so writers mark themselves in flight (task_meta "writes_in_flight") and a
+rebuild only stores its recount while none is. `compute_stats` recounts from the
+tasks for rebuild/verify.
+"""
+
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple
+
+
+# Summary keys maintained per bucket; open_tasks (not completed) feeds the overdue count
+STAT_KEYS = (
+    "total_tasks", "high_priority", "medium_priority", "low_priority",
+    "pending_tasks", "completed_tasks", "open_tasks"
+)
+COMPLETED_STATUSES = ("completed", "done")
+UNDATED = "undated"
+
+
+def day_bucket(value: Any) -> str:
+    return value.strftime("%Y-%m-%d") if isinstance(value, datetime) else UNDATED
+
+
+def task_counters(priority: Optional[str], status: Optional[str]) -> Dict[str, int]:
+    """Counters one task contributes to its buckets."""
+    counters = {"total_tasks": 1}
+    if priority in ("high", "medium", "low"):
+        counters[f"{priority}_priority"] = 1
+    if status == "pending":
+        counters["pending_tasks"] = 1
+    if status in COMPLETED_STATUSES:
+        counters["completed_tasks"] = 1
+    else:
+        counters["open_tasks"] = 1
+    return counters
+
+
+def stat_increments(old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """$inc paths moving a task from `old` to `new` (None for insert/delete)."""
+    increments: Dict[str, int] = {}
+    for task, sign in ((old, -1), (new, 1)):
+        if not task:
+            continue
+        day = day_bucket(task.get("date"))
+        for key, value in task_counters(task.get("priority"), task.get("status")).items():
+            for path in (f"stats.counts.{key}", f"stats.days.{day}.{key}"):
+                increments[path] = increments.get(path, 0) + sign * value
+    return {path: value for path, value in increments.items() if value}
+
+
+def decremented_days(increments: Dict[str, int]) -> List[str]:
+    """Day buckets whose task total an increment set lowers (candidates for pruning)."""
+    return [
+        path.split(".")[2] for path, value in increments.items()
+        if value < 0 and path.startswith("stats.days.") and path.endswith(".total_tasks")
+    ]
+
+
+def increment_stage(increments: Dict[str, int]) -> Dict[str, Any]:
+    """$set expressions of a pipeline update adding each increment to its path (missing paths count as 0)."""
+    return {path: {"$add": [{"$ifNull": [f"${path}", 0]}, value]} for path, value in increments.items()}
+
+
+# Pipeline update stage keeping only the day buckets that still hold tasks
+PRUNE_EMPTY_DAYS = {"$set": {"stats.days": {"$arrayToObject": {"$filter": {
+    "input": {"$objectToArray": {"$ifNull": ["$stats.days", {}]}},
+    "cond": {"$gt": ["$$this.v.total_tasks", 0]}
+}}}}}
+
+
+# Task counts by day, priority and status (a full scan; only rebuild and verify run it)
+STATS_PIPELINE = [
+    {
+        "$group": {
+            "_id": {
+                "day": {"$dateToString": {"format": "%Y-%m-%d", "date": "$date", "onNull": UNDATED}},
+                "priority": "$priority",
+                "status": "$status"
+            },
+            "count": {"$sum": 1}
+        }
+    }
+]
+
+
+async def compute_stats(collection) -> Dict[str, Any]:
+    """Recount every task, grouped server-side by day, priority and status."""
+    counts: Dict[str, int] = {}
+    days: Dict[str, Dict[str, int]] = {}
+    async for group in collection.aggregate(STATS_PIPELINE):
+        bucket = days.setdefault(group["_id"]["day"], {})
+        for key, value in task_counters(group["_id"].get("priority"), group["_id"].get("status")).items():
+            counts[key] = counts.get(key, 0) + value * group["count"]
+            bucket[key] = bucket.get(key, 0) + value * group["count"]
+    return {"counts": counts, "days": days}
+
+
+def summarize_stats(stats: Dict[str, Any], date_filter: Optional[Dict[str, datetime]],
+                    today: datetime) -> Dict[str, int]:
+    """Summary counters for all tasks, or for the day buckets inside a build_date_filter range."""
+    summary = {key: 0 for key in STAT_KEYS}
+    summary["overdue_tasks"] = 0
+    today_key = day_bucket(today)
+    start = day_bucket(date_filter["$gte"]) if date_filter else None
+    end = day_bucket(date_filter["$lt"]) if date_filter else None
+
+    for day, counters in (stats.get("days") or {}).items():
+        if date_filter and (day == UNDATED or not start <= day < end):
+            continue
+        if day != UNDATED and day < today_key:
+            summary["overdue_tasks"] += counters.get("open_tasks", 0)
+        if date_filter:
+            for key in STAT_KEYS:
+                summary[key] += counters.get(key, 0)
+
+    if not date_filter:
+        for key in STAT_KEYS:
+            summary[key] = (stats.get("counts") or {}).get(key, 0)
+    summary.pop("open_tasks")
+    return summary
+
+
+def diff_stats(stored: Dict[str, Any], computed: Dict[str, Any]) -> List[Tuple[str, int, int]]:
+    """(path, stored, computed) for every counter that drifted; zero and missing are equal."""
+    def flatten(stats: Dict[str, Any]) -> Dict[str, int]:
+        flat = {f"counts.{key}": value for key, value in (stats.get("counts") or {}).items()}
+        for day, counters in (stats.get("days") or {}).items():
+            flat.update({f"days.{day}.{key}": value for key, value in counters.items()})
+        return flat
+
+    stored_flat = flatten(stored or {})
+    computed_flat = flatten(computed)
+    return [
+        (path, stored_flat.get(path, 0), computed_flat.get(path, 0))
+        for path in sorted(set(stored_flat) | set(computed_flat))
+        if stored_flat.get(path, 0) != computed_flat.get(path, 0)
+    ]
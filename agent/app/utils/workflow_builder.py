@@ -1,7 +1,6 @@
 """Workflow builder utilities."""
 
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import MemorySaver
 from nodes import (
     task_analysis_node,
     database_operation_node,
@@ -9,6 +8,7 @@ from nodes import (
     end_node,
     TaskManagerState
 )
+from utils.checkpointer import create_checkpointer
 
 
 def decide_after_analysis(state: TaskManagerState) -> str:
@@ -18,7 +18,7 @@ def decide_after_analysis(state: TaskManagerState) -> str:
     if not operation or operation == "UNKNOWN":
         return "response_generation_node"
     
-    if operation in ["BULK_ADD", "BULK_UPDATE", "BULK_DELETE"]:
+    if operation in ["BULK_ADD", "BULK_UPDATE", "BULK_DELETE", "MULTI_OPERATION"]:
         return "database_operation_node"
     
     return "database_operation_node"
@@ -109,5 +109,5 @@ def create_task_manager_workflow() -> StateGraph:
 
 
 def create_compiled_workflow():
-    """Create and compile the workflow with memory"""
-    return create_task_manager_workflow().compile(checkpointer=MemorySaver())
\ No newline at end of file
+    """Create and compile the workflow with memory (bounded, see utils/checkpointer.py)"""
+    return create_task_manager_workflow().compile(checkpointer=create_checkpointer())
\ No newline at end of file
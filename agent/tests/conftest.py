@@ -0,0 +1,7 @@
+import os
+
+# The app modules read these at import time; no test talks to a real model
+os.environ.setdefault("GOOGLE_API_KEY", "unused")
+os.environ.setdefault("LLM_BACKEND", "fake")
+# Short history, so a few turns already go through the end node's compaction
+os.environ.setdefault("HISTORY_KEEP_MESSAGES", "6")
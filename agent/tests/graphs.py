@@ -0,0 +1,51 @@
+"""
+Graphs for the checkpointer tests: the workflow's state and end node (with its
+history compaction) behind stand-ins for the database and response nodes, so
+turns need neither MongoDB nor an LLM. Run them with ainvoke, like the service.
+"""
+
+import uuid
+from typing import Any, Dict, List
+
+from langchain_core.messages import AIMessage, BaseMessage
+from langgraph.graph import StateGraph
+
+from nodes.state import TaskManagerState
+from nodes.end_node import end_node
+from utils.message_history import SUMMARY_MESSAGE_ID
+
+TASKS = [
+    {"_id": f"{i:024d}", "title": f"Task {i}", "priority": "medium", "status": "pending"}
+    for i in range(20)
+]
+
+
+async def database_stand_in(state: TaskManagerState) -> Dict[str, Any]:
+    return {
+        "operation": "GET_TASKS",
+        "db_result": {"success": True, "message": f"Retrieved all {len(TASKS)} tasks", "tasks": TASKS},
+        "tool_logs": [{"id": str(uuid.uuid4()), "message": "Operation completed successfully", "status": "completed"}]
+    }
+
+
+async def response_stand_in(state: TaskManagerState) -> Dict[str, Any]:
+    reply = f"Here are your {len(state['db_result']['tasks'])} tasks"
+    return {"final_response": reply, "messages": [AIMessage(content=reply, id=str(uuid.uuid4()))]}
+
+
+def build_graph(checkpointer):
+    graph = StateGraph(TaskManagerState)
+    graph.add_node("database_operation_node", database_stand_in)
+    graph.add_node("response_generation_node", response_stand_in)
+    graph.add_node("end_node", end_node)
+    graph.set_entry_point("database_operation_node")
+    graph.add_edge("database_operation_node", "response_generation_node")
+    graph.add_edge("response_generation_node", "end_node")
+    return graph.compile(checkpointer=checkpointer)
+
+
+def represented_messages(messages: List[BaseMessage]) -> int:
+    """Messages the history stands for: the ones kept plus the ones folded into the summary."""
+    summary = next((message for message in messages if message.id == SUMMARY_MESSAGE_ID), None)
+    folded = summary.additional_kwargs.get("folded", 0) if summary else 0
+    return folded + sum(1 for message in messages if message.id != SUMMARY_MESSAGE_ID)
@@ -0,0 +1,51 @@
+"""BoundedMemorySaver stays within its limits over many turns of the workflow's state."""
+
+import random
+import asyncio
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from graphs import build_graph, represented_messages
+from utils.checkpointer import BoundedMemorySaver
+from utils.message_history import HISTORY_KEEP_MESSAGES
+
+TURNS = 120
+THREADS = 12
+MAX_THREADS = 5
+KEEP = 3
+
+
+@pytest.mark.parametrize("spill", [False, True], ids=["memory", "spill"])
+def test_soak_stays_within_limits(tmp_path, spill):
+    checkpointer = BoundedMemorySaver(
+        max_threads=MAX_THREADS, keep_checkpoints=KEEP, compact_every=25,
+        spill_path=str(tmp_path / "spill.sqlite") if spill else None
+    )
+    graph = build_graph(checkpointer)
+    rng = random.Random(7)
+    turns = {}
+
+    async def main():
+        for _ in range(TURNS):
+            thread_id = f"thread-{rng.randrange(THREADS)}"
+            state = await graph.ainvoke({"messages": [HumanMessage(content="show my tasks")]},
+                                        {"configurable": {"thread_id": thread_id}})
+            turns[thread_id] = turns.get(thread_id, 0) + 1
+
+            stats = checkpointer.stats()
+            assert stats["threads"] <= MAX_THREADS
+            assert stats["checkpoints"] <= MAX_THREADS * KEEP
+            # The end node compacts the history: the kept messages plus the summary
+            assert len(state["messages"]) <= HISTORY_KEEP_MESSAGES + 1
+            if spill:
+                # Evicted threads come back from the spill store with their whole history
+                assert represented_messages(state["messages"]) == 2 * turns[thread_id]
+
+    asyncio.run(main())
+
+    stats = checkpointer.stats()
+    assert stats["threads"] == MAX_THREADS
+    assert stats["checkpoints"] == MAX_THREADS * KEEP
+    if spill:
+        assert stats["spill"]["threads"] == len(turns) - MAX_THREADS
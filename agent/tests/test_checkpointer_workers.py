@@ -0,0 +1,67 @@
+"""Conversations continue when consecutive turns run in different worker processes."""
+
+import asyncio
+import multiprocessing
+
+from langchain_core.messages import HumanMessage
+
+from graphs import build_graph, represented_messages
+
+WORKERS = 2
+THREADS = 4
+TURNS = 5
+
+
+def serve_turns(path: str, inbox, outbox):
+    """Worker process: its own SharedSqliteSaver on the shared file, turns run concurrently with ainvoke."""
+    from utils.checkpointer import SharedSqliteSaver
+
+    graph = build_graph(SharedSqliteSaver(path))
+
+    async def turn(thread_id: str, number: int):
+        try:
+            state = await graph.ainvoke({"messages": [HumanMessage(content=f"turn {number}")]},
+                                        {"configurable": {"thread_id": thread_id}})
+            outbox.put((thread_id, number, represented_messages(state["messages"]), None))
+        except Exception as e:
+            outbox.put((thread_id, number, None, f"{type(e).__name__}: {e}"))
+
+    async def serve():
+        running = set()
+        while (job := await asyncio.to_thread(inbox.get)) is not None:
+            task = asyncio.create_task(turn(*job))
+            running.add(task)
+            task.add_done_callback(running.discard)
+        await asyncio.gather(*running)
+
+    asyncio.run(serve())
+
+
+def test_turns_continue_across_workers(tmp_path):
+    context = multiprocessing.get_context("spawn")
+    path = str(tmp_path / "checkpoints.sqlite")
+    outbox = context.Queue()
+    inboxes = [context.Queue() for _ in range(WORKERS)]
+    processes = [context.Process(target=serve_turns, args=(path, inbox, outbox), daemon=True) for inbox in inboxes]
+    for process in processes:
+        process.start()
+
+    discontinuous = []
+    try:
+        for number in range(1, TURNS + 1):
+            # Thread t's turn n goes to worker (t + n) % WORKERS: never the worker of its previous turn
+            for t in range(THREADS):
+                inboxes[(t + number) % WORKERS].put((f"thread-{t}", number))
+            for _ in range(THREADS):
+                thread_id, done, messages, error = outbox.get(timeout=60)
+                # One user and one assistant message per turn, folded into the summary or kept
+                if error or messages != 2 * done:
+                    discontinuous.append((thread_id, done, error or f"{messages} messages"))
+    finally:
+        for inbox in inboxes:
+            inbox.put(None)
+        for process in processes:
+            process.join(timeout=30)
+
+    assert discontinuous == []
+    assert all(process.exitcode == 0 for process in processes)
@@ -0,0 +1,108 @@
+"""The async LLM tiebreak of TaskMatcher against a slow fake model."""
+
+import time
+import importlib
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from utils.task_matcher import TaskMatcher
+
+# The submodule: utils.task_matcher itself is the matcher instance
+matcher_module = importlib.import_module("utils.task_matcher")
+
+TASKS = [
+    {"_id": "1", "title": "Prepare quarterly budget review", "priority": "high", "status": "pending"},
+    {"_id": "2", "title": "Prepare quarterly sales review", "priority": "medium", "status": "pending"},
+    {"_id": "3", "title": "Book flight to Berlin", "priority": "low", "status": "pending"},
+]
+
+# Between the fuzzy thresholds, so only the LLM can pick
+AMBIGUOUS_IDENTIFIER = "quarterly review prep"
+
+
+class SlowFakeLLM:
+    """Answers "1" after `delay` seconds; the sync interface blocks like a real client."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        time.sleep(self.delay)
+        return SimpleNamespace(content="1")
+
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(content="1")
+
+
+@pytest.fixture
+def slow_llm(monkeypatch):
+    def install(delay: float) -> SlowFakeLLM:
+        llm = SlowFakeLLM(delay)
+        monkeypatch.setattr(matcher_module, "get_llm_model", lambda *args, **kwargs: llm)
+        return llm
+    return install
+
+
+async def resolve_with_heartbeat(coroutines):
+    """Results of the coroutines and the longest gap (s) between 10 ms heartbeat ticks meanwhile."""
+    ticks = [time.perf_counter()]
+    stop = asyncio.Event()
+
+    async def heartbeat():
+        while not stop.is_set():
+            await asyncio.sleep(0.01)
+            ticks.append(time.perf_counter())
+
+    beat = asyncio.create_task(heartbeat())
+    results = await asyncio.gather(*coroutines)
+    stop.set()
+    await beat
+    return results, max(b - a for a, b in zip(ticks, ticks[1:]))
+
+
+def test_ambiguous_identifier_needs_the_llm():
+    best_match, candidates = TaskMatcher()._rank_candidates(AMBIGUOUS_IDENTIFIER, TASKS)
+    assert best_match is None
+    assert candidates
+
+
+def test_tiebreak_keeps_the_event_loop_running(slow_llm):
+    llm = slow_llm(0.3)
+    matcher = TaskMatcher()
+    matcher.llm_timeout = 5
+
+    async def main():
+        start = time.perf_counter()
+        results, longest_gap = await resolve_with_heartbeat(
+            [matcher.afind_best_match(AMBIGUOUS_IDENTIFIER, TASKS) for _ in range(3)]
+        )
+        return results, longest_gap, time.perf_counter() - start
+
+    results, longest_gap, elapsed = asyncio.run(main())
+    assert llm.calls == 3
+    assert all(result and result["_id"] == "1" for result in results)
+    # The loop ticked through the 0.3 s calls, and the calls overlapped
+    assert longest_gap < 0.15
+    assert elapsed < 0.6
+
+
+def test_tiebreak_gives_up_after_the_timeout(slow_llm):
+    slow_llm(2.0)
+    matcher = TaskMatcher()
+    matcher.llm_timeout = 0.2
+
+    async def main():
+        start = time.perf_counter()
+        results, longest_gap = await resolve_with_heartbeat([matcher.afind_best_match(AMBIGUOUS_IDENTIFIER, TASKS)])
+        return results[0], longest_gap, time.perf_counter() - start
+
+    result, longest_gap, elapsed = asyncio.run(main())
+    assert result is None
+    assert elapsed < 1.0
+    assert longest_gap < 0.15
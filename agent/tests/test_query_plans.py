@@ -0,0 +1,41 @@
+"""
+Every query shape of utils/query_plans.py is served by an index (or is a declared
+full scan), the check `python manage.py plans` runs. Needs a real mongod at
+MONGODB_URL: mongomock has no query planner. Skipped when none answers.
+"""
+
+import os
+import asyncio
+
+import pytest
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+
+
+def mongod_available() -> bool:
+    try:
+        with MongoClient(MONGODB_URL, serverSelectionTimeoutMS=500) as client:
+            client.admin.command("ping")
+        return True
+    except PyMongoError:
+        return False
+
+
+pytestmark = [
+    pytest.mark.mongod,
+    pytest.mark.skipif(not mongod_available(), reason=f"no mongod at {MONGODB_URL}")
+]
+
+
+def test_query_shapes_use_indexes():
+    from manage import scratch_query_plans
+
+    results = asyncio.run(scratch_query_plans("task_manager_plans_test", keep=False, seed=500))
+    failures = [
+        f"{result['name']}: {result['error'] or ', '.join(result['stages'])}"
+        for result in results if not result["ok"]
+    ]
+    assert results
+    assert failures == []
@@ -0,0 +1,31 @@
+"""The lazy utils package keeps the exports it always had."""
+
+import importlib
+import subprocess
+import sys
+import types
+from unittest import mock
+
+from utils.task_matcher import TaskMatcher
+
+
+def test_task_matcher_export_is_the_instance():
+    from utils import task_matcher
+    import utils.task_matcher as imported
+
+    assert isinstance(task_matcher, TaskMatcher)
+    assert imported is task_matcher
+
+
+def test_task_matcher_module_stays_reachable():
+    module = importlib.import_module("utils.task_matcher")
+    assert isinstance(module, types.ModuleType)
+    with mock.patch("utils.task_matcher.get_llm_model") as get_llm_model:
+        assert module.get_llm_model is get_llm_model
+
+
+def test_submodule_import_does_not_load_the_exports():
+    code = "import sys, utils.metrics; print('motor' in sys.modules, 'utils.task_matcher' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=importlib.import_module("utils").__path__[0] + "/..")
+    assert result.stdout.split() == ["False", "False"]
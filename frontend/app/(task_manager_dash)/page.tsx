@@ -5,6 +5,7 @@ import { useCopilotChatSuggestions } from "@copilotkit/react-ui";
 import { useState } from "react";
 import { suggestionPrompt, welcomePrompt } from "@/utils/prompts";
 import { AgentState } from "@/types/agent";
+import { mergeAgentState } from "@/utils/agent-state";
 import DashboardContent from "@/components/dashboard/dashboard-content";
 import ChatPanel from "@/components/dashboard/chat-panel";
 
@@ -21,7 +22,7 @@ export default function Home() {
   useCoAgentStateRender<AgentState>({
     name: "task_manager_agent",
     render: ({ state }) => {
-      setCurrentAgentState(state);
+      setCurrentAgentState((previous) => mergeAgentState(previous, state));
       return null; // We don't return JSX from here
     },
   });
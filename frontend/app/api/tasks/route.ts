@@ -0,0 +1,11 @@
+import { NextResponse } from "next/server";
+
+const agentUrl = process.env.AGENT_URL || "http://127.0.0.1:8000";
+
+// Proxies the agent's paged task snapshot, used when a delta arrives out of order
+export const GET = async (request: Request) => {
+  const { search } = new URL(request.url);
+  const response = await fetch(`${agentUrl}/tasks${search}`, { cache: "no-store" });
+  const body = await response.json();
+  return NextResponse.json(body, { status: response.status });
+};
@@ -4,14 +4,16 @@ import OperationStatus from "./operation-status";
 import OperationLogs from "./operation-logs";
 import ResultStatus from "./result-status";
 import TaskList from "./task-list";
+import ResponsePreview from "./response-preview";
 import TaskExamples from "@/components/dashboard/task-examples";
+import { useTaskList } from "@/hooks/use-task-list";
 
 interface DashboardContentProps {
   state?: AgentState;
 }
 
 export default function DashboardContent({ state }: DashboardContentProps) {
-  const tasks = state?.db_result?.tasks || [];
+  const tasks = useTaskList(state?.db_result);
   const currentOperation = state?.operation;
   const toolLogs = state?.tool_logs || [];
   const dbResult = state?.db_result;
@@ -37,6 +39,9 @@ export default function DashboardContent({ state }: DashboardContentProps) {
       {/* Operation Logs */}
       <OperationLogs logs={toolLogs} />
 
+      {/* Streamed response text */}
+      <ResponsePreview text={state?.partial_response} />
+
       {/* Database Result Status */}
       <ResultStatus result={dbResult} />
 
@@ -0,0 +1,16 @@
+interface ResponsePreviewProps {
+  text?: string | null;
+}
+
+export default function ResponsePreview({ text }: ResponsePreviewProps) {
+  if (!text) return null;
+
+  return (
+    <div className="bg-white border border-gray-200 rounded-lg p-4 mb-6">
+      <h2 className="text-lg font-semibold text-gray-900 mb-2">
+        Responding...
+      </h2>
+      <p className="text-sm text-gray-700 whitespace-pre-wrap">{text}</p>
+    </div>
+  );
+}
@@ -0,0 +1,116 @@
+import { useEffect, useRef, useState } from "react";
+import { AgentState, Task, TaskChange, TaskFilter } from "@/types/agent";
+
+function applyChange(tasks: Task[], change: TaskChange): Task[] {
+  const rest = tasks.filter((task) => task._id !== change.task._id);
+  if (change.kind === "deleted") return rest;
+  // An update can bring a task into a filtered view it was not in
+  if (change.kind === "added" || rest.length === tasks.length) return [...rest, change.task];
+  return tasks.map((task) =>
+    task._id === change.task._id ? { ...task, ...change.task } : task
+  );
+}
+
+// The listing's filter when it has one set, else null
+function activeFilter(filter: TaskFilter | null | undefined): TaskFilter | null {
+  if (!filter || !(filter.date_range || filter.priority || filter.status)) return null;
+  return filter;
+}
+
+// Priority and status compare like the agent's query (case-insensitive)
+function matchesFilter(task: Task, filter: TaskFilter): boolean {
+  if (filter.priority && task.priority?.toLowerCase() !== filter.priority.toLowerCase()) return false;
+  if (filter.status && task.status?.toLowerCase() !== filter.status.toLowerCase()) return false;
+  return true;
+}
+
+type TaskPage = {
+  success: boolean;
+  tasks?: Task[];
+  version?: number;
+  next_page_token?: string | null;
+};
+
+// Follows next_page_token until the last page; the version is the first page's
+async function fetchSnapshot(
+  filter: TaskFilter | null = null
+): Promise<{ tasks: Task[]; version?: number } | null> {
+  const tasks: Task[] = [];
+  let version: number | undefined;
+  let pageToken: string | null | undefined;
+  do {
+    const params = new URLSearchParams();
+    for (const [key, value] of Object.entries(filter ?? {})) {
+      if (value) params.set(key, value);
+    }
+    if (pageToken) params.set("page_token", pageToken);
+    const search = params.toString();
+    const query = search ? `?${search}` : "";
+    const response = await fetch(`/api/tasks${query}`, { cache: "no-store" });
+    const page: TaskPage = await response.json();
+    if (!page.success) return null;
+    version ??= page.version;
+    tasks.push(...(page.tasks || []));
+    pageToken = page.next_page_token;
+  } while (pageToken);
+  return { tasks, version };
+}
+
+/**
+ * Keeps a local task list in sync with the agent's results.
+ * Listings replace the list; mutations arrive as versioned deltas and are
+ * applied in place. A gap in versions triggers one full snapshot fetch.
+ * A filtered listing keeps its filter: deltas are filtered by priority and
+ * status locally, and a date-range view (dates are resolved by the agent)
+ * is refetched with the same filter instead.
+ */
+export function useTaskList(dbResult: AgentState["db_result"]): Task[] {
+  const [tasks, setTasks] = useState<Task[]>([]);
+  const versionRef = useRef<number | null>(null);
+  const filterRef = useRef<TaskFilter | null>(null);
+
+  useEffect(() => {
+    if (!dbResult?.success) return;
+
+    if (dbResult.tasks) {
+      setTasks(dbResult.tasks);
+      versionRef.current = dbResult.version ?? null;
+      filterRef.current = activeFilter(dbResult.filter);
+      return;
+    }
+
+    // Bulk operations carry several changes under one version, multi-operation
+    // turns several versions in order
+    const changes = dbResult.changes ?? (dbResult.change ? [dbResult.change] : []);
+    if (changes.length === 0) return;
+    const version = changes[changes.length - 1].version;
+    const contiguous = changes.every(
+      (change, i) => i === 0 || change.version - changes[i - 1].version <= 1
+    );
+
+    const current = versionRef.current;
+    if (current !== null && version <= current) return; // already applied
+
+    const filter = filterRef.current;
+    if (current !== null && contiguous && changes[0].version === current + 1 && !filter?.date_range) {
+      setTasks((previous) => {
+        const next = changes.reduce(applyChange, previous);
+        return filter ? next.filter((task) => matchesFilter(task, filter)) : next;
+      });
+      versionRef.current = version;
+      return;
+    }
+
+    // Local list is stale (or empty), or its filter can't be checked here: fetch a snapshot
+    versionRef.current = version;
+    fetchSnapshot(filter)
+      .then((snapshot) => {
+        if (!snapshot) return;
+        setTasks(snapshot.tasks);
+        versionRef.current = snapshot.version ?? version;
+      })
+      .catch((error) => console.error("Failed to fetch task snapshot", error));
+  }, [dbResult]);
+
+  return tasks;
+}
@@ -8,6 +8,27 @@ export interface Task {
   updated_at: string;
 }
 
+export interface TaskChange {
+  kind: "added" | "updated" | "deleted";
+  task: Task;
+  version: number;
+}
+
+// Filter of a GET_TASKS listing; null values are unfiltered
+export interface TaskFilter {
+  date_range?: string | null;
+  priority?: string | null;
+  status?: string | null;
+}
+
+export interface BulkOutcome {
+  index: number;
+  item: string;
+  success: boolean;
+  message?: string;
+  task?: Task;
+}
+
 export interface ToolLog {
   id: string;
   message: string;
@@ -32,9 +53,17 @@ export interface AgentState {
     message?: string;
     tasks?: Task[];
     task?: Task;
+    change?: TaskChange;
+    changes?: TaskChange[];
+    results?: BulkOutcome[];
+    version?: number;
+    next_page_token?: string | null;
+    filter?: TaskFilter | null;
     error?: string;
     error_type?: string;
   };
   final_response?: string;
+  partial_response?: string | null;
+  response_mode?: "template" | "llm";
   retry_count?: number;
 }
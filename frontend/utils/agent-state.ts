@@ -0,0 +1,18 @@
+import { AgentState } from "@/types/agent";
+
+/**
+ * The agent's progress emits carry only the fields that changed (and leave
+ * db_result.tasks to the full sync at the end of each step), so every state
+ * update is merged into the one already held. Returns `previous` itself when
+ * nothing changed, so re-renders with the same state don't loop.
+ */
+export function mergeAgentState(
+  previous: AgentState | undefined,
+  update: Partial<AgentState> | undefined
+): AgentState | undefined {
+  if (!update) return previous;
+  if (!previous) return update as AgentState;
+  const keys = Object.keys(update) as (keyof AgentState)[];
+  if (keys.every((key) => previous[key] === update[key])) return previous;
+  return { ...previous, ...update };
+}